@@ -0,0 +1,227 @@
+# Local OpenAI-compatible stand-in for the model server, so the pipeline can be benchmarked offline
+# Usage: python benchmarks/mock_server.py --port 18000 --latency 0.2 --tokens-per-second 400
+import argparse
+import ast
+import csv
+import io
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+_SINGLE_FILE = re.compile(r"for the file (?P<filename>.+?)\. The file metadata is as follow: (?P<metadata>.*)\.$", re.DOTALL)
+_CLASSIFIED_FILE = re.compile(r"for the file (?P<filename>.+?)\. Unclassified columns: (?P<unclassified>.*)\. Classified columns: (?P<classified>.*)\.$", re.DOTALL)
+_BATCH_ENTRY = re.compile(r"^- (?P<filename>[^\n]+?):[ \n]", re.MULTILINE)
+_COLUMN_KEY = re.compile(r"'((?:[^'\\]|\\.)*)': \[")
+
+
+def _column_names(metadata: str) -> List[str]:
+    """Column names of encoded metadata: a dict repr or JSON, a markdown table or CSV rows (first cell per row)."""
+    metadata = metadata.strip()
+    if metadata.startswith("|"):
+        rows = [line for line in metadata.splitlines() if line.startswith("|")][2:]
+        return [re.split(r"(?<!\\)\|", row)[1].strip().replace("\\|", "|") for row in rows]
+    if not metadata.startswith("{"):
+        return [row[0] for row in list(csv.reader(io.StringIO(metadata)))[1:] if row]
+    for parse in (ast.literal_eval, json.loads):
+        try:
+            parsed = parse(metadata)
+            if isinstance(parsed, dict):
+                return [str(column) for column in parsed]
+        except (ValueError, SyntaxError):
+            pass
+    # Reprs with non-literal values (nan, Timestamp)
+    return _COLUMN_KEY.findall(metadata)
+
+
+def _batch_entries(content: str) -> List[tuple]:
+    """(filename, metadata) pairs of a packed request, one "- filename: ..." block per file."""
+    matches = list(_BATCH_ENTRY.finditer(content))
+    return [(match.group("filename"), content[match.end():matches[index + 1].start() if index + 1 < len(matches) else len(content)])
+            for index, match in enumerate(matches)]
+
+
+def _data_dict(filename: str, metadata: str) -> Dict[str, Any]:
+    return {
+        "filename": filename,
+        "columns": [
+            {"Column": column, "Description": f"Synthetic description of {column}.", "Format": "Text",
+             "Nullable": False, "Sample Values": ["a", "b", "c"]}
+            for column in _column_names(metadata)
+        ],
+    }
+
+
+def _use_cases(count: int = 3) -> Dict[str, Any]:
+    return {"use_cases": [
+        {"use_case_id": f"C{index}", "title": f"Use case {index}", "description": "Synthetic use case.",
+         "data_sources": [], "columns_utilized": [], "relationships_leveraged": "None"}
+        for index in range(1, count + 1)
+    ]}
+
+
+def answer_for(messages: List[Dict[str, Any]]) -> str:
+    """Build a plausible answer for the pipeline's prompts from the last user message."""
+    content = ""
+    for message in messages:
+        if message.get("role") == "user":
+            content = message.get("content") or ""
+            if isinstance(content, list):
+                content = " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+
+    classified = _CLASSIFIED_FILE.search(content)
+    if classified:
+        answer = _data_dict(classified.group("filename"), classified.group("unclassified"))
+        for column in answer["columns"]:
+            del column["Sample Values"]
+        answer["descriptions"] = {column: f"Synthetic description of {column}." for column in _column_names(classified.group("classified"))}
+        return json.dumps(answer)
+
+    single = _SINGLE_FILE.search(content)
+    if single:
+        return json.dumps(_data_dict(single.group("filename"), single.group("metadata")))
+
+    batch = _batch_entries(content)
+    if batch:
+        return json.dumps({"data_dictionaries": [_data_dict(filename, metadata) for filename, metadata in batch]})
+
+    # Summarizer and merger prompts
+    return json.dumps(_use_cases())
+
+
+class MockModelServer:
+    """
+    Threaded OpenAI-compatible server answering `/v1/models` and `/v1/chat/completions`.
+
+    Every completion sleeps `latency` seconds plus the time it would take to stream the
+    answer at `tokens_per_second` (estimated as characters/4), which is enough to make
+    scheduling and concurrency effects show up in benchmarks.
+
+    Args:
+        host: Interface to bind
+        port: Port to bind, 0 picks a free one
+        latency: Fixed seconds added to every completion
+        tokens_per_second: Simulated generation speed, 0 disables it
+        fail_status: Answer every request with this HTTP status instead (None: serve
+                     normally); can be changed while running to simulate an outage
+        api_key: Bearer token every request must carry, 401 otherwise (None: no auth)
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0, tokens_per_second: float = 0.0,
+                 fail_status: Optional[int] = None, api_key: Optional[str] = None):
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.fail_status = fail_status
+        self.api_key = api_key
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, body: Dict[str, Any]):
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _authorized(self) -> bool:
+                if server.api_key is None or self.headers.get("Authorization") == f"Bearer {server.api_key}":
+                    return True
+                self._send(401, {"error": {"message": "Invalid API key"}})
+                return False
+
+            def do_GET(self):
+                if not self._authorized():
+                    return
+                if server.fail_status is not None:
+                    self._send(server.fail_status, {"error": {"message": "Simulated failure"}})
+                elif self.path.rstrip("/").endswith("/models"):
+                    self._send(200, {"object": "list", "data": [{"id": "mock", "object": "model", "owned_by": "benchmark"}]})
+                else:
+                    self._send(404, {"error": {"message": f"Unknown path {self.path}"}})
+
+            def do_POST(self):
+                if not self.path.rstrip("/").endswith("/chat/completions"):
+                    self._send(404, {"error": {"message": f"Unknown path {self.path}"}})
+                    return
+                request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                with server._lock:
+                    server.requests += 1
+                if not self._authorized():
+                    return
+                if server.fail_status is not None:
+                    self._send(server.fail_status, {"error": {"message": "Simulated failure"}})
+                    return
+
+                content = answer_for(request.get("messages", []))
+                prompt_tokens = sum(len(str(message.get("content", ""))) for message in request.get("messages", [])) // 4
+                completion_tokens = max(1, len(content) // 4)
+                delay = server.latency
+                if server.tokens_per_second:
+                    delay += completion_tokens / server.tokens_per_second
+                time.sleep(delay)
+
+                self._send(200, {
+                    "id": f"chatcmpl-mock-{server.requests}",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": request.get("model", "mock"),
+                    "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+                    "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                              "total_tokens": prompt_tokens + completion_tokens},
+                })
+
+        return Handler
+
+    def start(self) -> "MockModelServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "MockModelServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Run a mock OpenAI-compatible model server.')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to bind (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=18000, help='Port to bind (default: 18000)')
+    parser.add_argument('--latency', type=float, default=0.2, help='Fixed seconds added to every completion (default: 0.2)')
+    parser.add_argument('--tokens-per-second', type=float, default=400.0,
+                        help='Simulated generation speed, 0 disables it (default: 400)')
+    args = parser.parse_args()
+
+    server = MockModelServer(args.host, args.port, latency=args.latency, tokens_per_second=args.tokens_per_second)
+    print(f"Mock model server listening on {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
@@ -0,0 +1,87 @@
+# Compare the batched profiler against the original per-column loop
+# Usage: python benchmarks/profile_benchmark.py --rows 200000 --columns 500
+import os
+import sys
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+import argparse
+import math
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.profile_engine import profile_dataframe, profile_dataframe_loop
+
+
+def make_wide_frame(rows: int, columns: int, seed: int = 42) -> pd.DataFrame:
+    """Build a frame cycling through int, float (with nulls), string and datetime columns."""
+    rng = np.random.default_rng(seed)
+    data = {}
+    for index in range(columns):
+        kind = index % 4
+        if kind == 0:
+            data[f"int_{index}"] = rng.integers(0, 10_000, size=rows)
+        elif kind == 1:
+            values = rng.normal(100, 15, size=rows)
+            values[rng.random(rows) < 0.05] = np.nan
+            data[f"float_{index}"] = values
+        elif kind == 2:
+            choices = np.array(['alpha', 'beta', 'gamma', 'NULL', 'delta'], dtype=object)
+            data[f"str_{index}"] = choices[rng.integers(0, len(choices), size=rows)]
+        else:
+            data[f"date_{index}"] = pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 365, size=rows), unit='D')
+    return pd.DataFrame(data)
+
+
+def _same(left, right) -> bool:
+    if isinstance(left, float) and isinstance(right, float):
+        return (math.isnan(left) and math.isnan(right)) or math.isclose(left, right, rel_tol=1e-9, abs_tol=0.011)
+    return left == right
+
+
+def compare_profiles(expected: dict, actual: dict) -> list:
+    """Return a list of (column, stat, expected, actual) mismatches."""
+    mismatches = []
+    for col, stats in expected.items():
+        if list(stats) != list(actual.get(col, {})):
+            mismatches.append((col, 'keys', list(stats), list(actual.get(col, {}))))
+            continue
+        for stat, value in stats.items():
+            if not _same(value, actual[col][stat]):
+                mismatches.append((col, stat, value, actual[col][stat]))
+    return mismatches
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark the batched profiler against the per-column loop.')
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--columns', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    df = make_wide_frame(args.rows, args.columns)
+    print(f"Frame: {args.rows} rows x {args.columns} columns, {df.memory_usage(deep=True).sum() / 1e6:.1f} MB")
+
+    timings = {}
+    for name, func in [('loop', lambda: profile_dataframe_loop(df, 'benchmark')), ('batched', lambda: profile_dataframe(df))]:
+        runs = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            result = func()
+            runs.append(time.perf_counter() - start)
+        timings[name] = (min(runs), result)
+        print(f"{name:<8} best of {args.repeat}: {min(runs):.3f}s")
+
+    print(f"Speed-up: {timings['loop'][0] / timings['batched'][0]:.1f}x")
+
+    mismatches = compare_profiles(timings['loop'][1], timings['batched'][1])
+    if mismatches:
+        print(f"{len(mismatches)} mismatching stats, first few:")
+        for mismatch in mismatches[:10]:
+            print("  ", mismatch)
+        sys.exit(1)
+    print("Profiles match.")
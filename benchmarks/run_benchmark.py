@@ -0,0 +1,133 @@
+# End-to-end pipeline benchmark against the mock model server on synthetic datasets
+# Usage: python benchmarks/run_benchmark.py --rows 1000 100000 --columns 10 100 --formats csv parquet --latency 0.2
+import os
+import sys
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import platform
+import resource
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+
+from benchmarks.mock_server import MockModelServer
+from benchmarks.synthetic_data import FORMATS, generate_datasets
+
+RESULTS_DIR = os.path.join(project_root, "benchmarks", "results")
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=project_root, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _peak_rss_mb() -> dict:
+    # ru_maxrss is kilobytes on Linux and bytes on macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return {
+        "self": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale,
+        "children": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale,
+    }
+
+
+def run_pipeline(data_dir: str, base_url: str, pipeline_args: list, quiet: bool = True) -> dict:
+    """Run `main.run()` once on `data_dir` and return its wall time and per-stage timings."""
+    import main as pipeline
+
+    args = pipeline.build_parser().parse_args([data_dir, '--base-url', base_url, '--no-cache', '--no-llm-cache', *pipeline_args])
+    pipeline.configure(args)
+    output = io.StringIO()
+    state = pipeline.RunState()
+    started_at = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(output) if quiet else contextlib.nullcontext():
+            generated_data_dict, _, _ = asyncio.run(pipeline.run(args, state=state))
+    finally:
+        with contextlib.redirect_stdout(output) if quiet else contextlib.nullcontext():
+            pipeline.shutdown()
+    wall_time = time.perf_counter() - started_at
+    return {
+        "wall_time": wall_time,
+        "stages": dict(state.stage_timings),
+        "dictionaries": len(generated_data_dict),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark the pipeline offline on synthetic datasets.',
+                                     epilog='Arguments after "--" are passed to main.py, e.g. -- --pack-small-files --max-in-flight 8')
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000, 50_000], help='Row counts (default: 1000 50000)')
+    parser.add_argument('--columns', type=int, nargs='+', default=[10, 100], help='Column counts (default: 10 100)')
+    parser.add_argument('--formats', nargs='+', choices=FORMATS, default=['csv', 'parquet'], help='File formats (default: csv parquet)')
+    parser.add_argument('--copies', type=int, default=1, help='Datasets per combination (default: 1)')
+    parser.add_argument('--repeat', type=int, default=1, help='Pipeline runs on the same datasets (default: 1)')
+    parser.add_argument('--latency', type=float, default=0.2, help='Mock server seconds per completion (default: 0.2)')
+    parser.add_argument('--tokens-per-second', type=float, default=400.0, help='Mock server generation speed (default: 400)')
+    parser.add_argument('--data-dir', help='Reuse (or keep) datasets in this directory instead of a temporary one')
+    parser.add_argument('--output', help=f'Result file (default: {os.path.relpath(RESULTS_DIR, project_root)}/<timestamp>_<commit>.json)')
+    parser.add_argument('--verbose', action='store_true', help='Show the pipeline output')
+    args, pipeline_args = parser.parse_known_args()
+    pipeline_args = [arg for arg in pipeline_args if arg != '--']
+
+    with tempfile.TemporaryDirectory() as workspace:
+        data_dir = args.data_dir or os.path.join(workspace, "data")
+        if not os.path.isdir(data_dir) or not os.listdir(data_dir):
+            started_at = time.perf_counter()
+            generate_datasets(data_dir, args.rows, args.columns, args.formats, args.copies)
+            print(f"Generated datasets in {time.perf_counter() - started_at:.1f}s")
+        files = sorted(os.listdir(data_dir))
+        data_bytes = sum(os.path.getsize(os.path.join(data_dir, file)) for file in files)
+
+        # Run from a scratch directory so generation_log/ and .cache/ stay out of the repo
+        previous_cwd = os.getcwd()
+        os.chdir(workspace)
+        runs = []
+        try:
+            with MockModelServer(latency=args.latency, tokens_per_second=args.tokens_per_second) as server:
+                for attempt in range(args.repeat):
+                    run = run_pipeline(os.path.join(os.path.abspath(data_dir), ''), server.base_url, pipeline_args, quiet=not args.verbose)
+                    run["files_per_second"] = len(files) / run["wall_time"] if run["wall_time"] else None
+                    runs.append(run)
+                    stages = ", ".join(f"{stage} {seconds:.2f}s" for stage, seconds in run["stages"].items())
+                    print(f"Run {attempt + 1}/{args.repeat}: {len(files)} files in {run['wall_time']:.2f}s "
+                          f"({run['files_per_second']:.2f} files/s; {stages})")
+                model_requests = server.requests
+        finally:
+            os.chdir(previous_cwd)
+
+    revision = _git_revision()
+    result = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git_revision": revision,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "config": {
+            "rows": args.rows, "columns": args.columns, "formats": args.formats, "copies": args.copies,
+            "latency": args.latency, "tokens_per_second": args.tokens_per_second, "pipeline_args": pipeline_args,
+        },
+        "files": len(files),
+        "data_bytes": data_bytes,
+        "model_requests": model_requests,
+        "runs": runs,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d%H%M%S')}_{revision}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(result, f, indent=2)
+    print(f"Peak RSS: {result['peak_rss_mb']['self']:.0f} MB (children {result['peak_rss_mb']['children']:.0f} MB)")
+    print(f"Results written to {output}")
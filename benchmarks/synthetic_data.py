@@ -0,0 +1,97 @@
+# Generate synthetic datasets of several sizes, widths and formats for benchmarking
+# Usage: python benchmarks/synthetic_data.py out_dir --rows 1000 100000 --columns 10 200 --formats csv parquet
+import argparse
+import os
+from typing import Iterable, List
+
+import numpy as np
+import pandas as pd
+
+FORMATS = ("csv", "parquet", "feather", "xlsx", "json")
+# Excel caps sheets at 1,048,576 rows and writing is slow, so large xlsx files are capped
+MAX_XLSX_ROWS = 50_000
+
+
+def make_frame(rows: int, columns: int, seed: int = 0) -> pd.DataFrame:
+    """Mixed-type frame cycling through ids, ints, floats, categories, text, dates, bools and sparse columns."""
+    rng = np.random.default_rng(seed)
+    data = {}
+    for index in range(columns):
+        kind = index % 8
+        if kind == 0:
+            data[f"recordId_{index}"] = np.arange(rows)
+        elif kind == 1:
+            data[f"quantity_{index}"] = rng.integers(0, 1000, rows)
+        elif kind == 2:
+            data[f"amount_{index}"] = rng.normal(100, 25, rows).round(2)
+        elif kind == 3:
+            data[f"status_{index}"] = rng.choice(["Shipped", "Pending", "Cancelled", "On Hold"], rows)
+        elif kind == 4:
+            data[f"comment_{index}"] = [f"note {value}" for value in rng.integers(0, rows or 1, rows)]
+        elif kind == 5:
+            data[f"orderDate_{index}"] = (pd.Timestamp("2020-01-01") + pd.to_timedelta(rng.integers(0, 1500, rows), unit="D")).strftime("%Y-%m-%d")
+        elif kind == 6:
+            data[f"active_{index}"] = rng.random(rows) > 0.5
+        else:
+            sparse = rng.normal(0, 1, rows)
+            sparse[rng.random(rows) < 0.3] = np.nan
+            data[f"score_{index}"] = sparse
+    return pd.DataFrame(data)
+
+
+def write_frame(df: pd.DataFrame, path: str, file_format: str):
+    if file_format == "csv":
+        df.to_csv(path, index=False)
+    elif file_format == "parquet":
+        df.to_parquet(path, index=False)
+    elif file_format == "feather":
+        df.to_feather(path)
+    elif file_format == "xlsx":
+        df.head(MAX_XLSX_ROWS).to_excel(path, index=False)
+    elif file_format == "json":
+        df.to_json(path, orient="records", lines=True)
+    else:
+        raise ValueError(f"Unknown format {file_format}; expected one of {FORMATS}")
+
+
+def generate_datasets(out_dir: str, rows: Iterable[int] = (1_000,), columns: Iterable[int] = (10,),
+                      formats: Iterable[str] = ("csv",), copies: int = 1, seed: int = 0) -> List[str]:
+    """
+    Write one dataset per combination of rows, columns, format and copy into `out_dir`.
+
+    Args:
+        out_dir: Directory the datasets are written to (created if missing)
+        rows: Row counts to generate
+        columns: Column counts to generate
+        formats: File formats, any of csv, parquet, feather, xlsx, json (JSON Lines)
+        copies: Datasets per combination, each with its own seed
+        seed: Base random seed
+
+    Returns:
+        List[str]: Paths of the written files.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for row_count in rows:
+        for column_count in columns:
+            for copy in range(copies):
+                df = make_frame(row_count, column_count, seed=seed + copy)
+                for file_format in formats:
+                    path = os.path.join(out_dir, f"synthetic_{row_count}r_{column_count}c_{copy}.{file_format}")
+                    write_frame(df, path, file_format)
+                    paths.append(path)
+    return paths
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Generate synthetic datasets for benchmarking.')
+    parser.add_argument('out_dir', help='Directory to write the datasets to')
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000], help='Row counts (default: 1000)')
+    parser.add_argument('--columns', type=int, nargs='+', default=[10], help='Column counts (default: 10)')
+    parser.add_argument('--formats', nargs='+', choices=FORMATS, default=['csv'], help='File formats (default: csv)')
+    parser.add_argument('--copies', type=int, default=1, help='Datasets per combination (default: 1)')
+    parser.add_argument('--seed', type=int, default=0, help='Base random seed (default: 0)')
+    args = parser.parse_args()
+
+    paths = generate_datasets(args.out_dir, args.rows, args.columns, args.formats, args.copies, args.seed)
+    print(f"Wrote {len(paths)} datasets to {args.out_dir}")
@@ -11,18 +11,32 @@ if project_root not in sys.path:
 
 # Python lib
 import asyncio
+import contextvars
 import os
 import argparse
+import json
+import time
 
 # Autogen-0.4
 from autogen_agentchat.agents import AssistantAgent
+from autogen_agentchat.base import Response
 
 from autogen_agentchat.messages import TextMessage
 from autogen_ext.models.openai import OpenAIChatCompletionClient
 
 # Local
-from utils import get_columns_sample, initialize_individual_chat, jsonify_prompt, Spinner
-from prompts import data_dict_summarizer_prompt
+from utils import get_columns_sample, initialize_batched_chat, jsonify_prompt, Spinner, configure_executor, configure_cache
+from utils import LLMResponseCache, CachedChatCompletionClient, is_json_result, BoundedScheduler, EndpointPool, pack_small_files
+from utils import summarize_hierarchical, needs_hierarchical_summary, StreamingSummarizer, Cassette, CassetteChatCompletionClient
+from utils import TracedChatCompletionClient, configure_telemetry, shutdown_telemetry, stage_span, metrics, serve_metrics
+from utils import GenerationCheckpoint, input_key, write_generation_log
+from utils import group_by_fingerprint, fan_out_data_dict, summarizer_view
+from utils import configure_serializer, get_serializer_format, measure_serializers, configure_prompt_layout, get_prompt_layout, warm_up_models, JobServer
+from utils import expand_archives, source_size, DatasetDiscovery, with_partition_columns, partitioned_fingerprint, skipped_report
+from utils import configure_excel, expand_workbooks
+from utils.client_wrapper import sampling_config
+from utils.dataset_stream import SUPPORTED_EXTENSIONS, UnsupportedFileTypeError
+from prompts import data_dict_summarizer_prompt, data_dict_generator_prompt, data_dict_classified_generator_prompt, data_dict_batch_generator_prompt
 
 # Only edit here AND filepath under if __name__ == "__main__":
 data_dict_summarizer = "qwen2.5:32b-instruct-q8_0-32768"
@@ -40,23 +54,23 @@ model_info =  {
 
 # Create reasoning config
 # Need to be more creative
-data_dict_summarizer_client = OpenAIChatCompletionClient(
+data_dict_summarizer_config = dict(
     frequency_penalty=0.2, 
     logit_bias=None, 
-    max_tokens=128000,
+    # Answer budget: with summary_token_budget of data and the system prompt it fits summarizer_context_tokens
+    max_tokens=8192,
     presence_penalty=0.5, 
     response_format={"type": "json_object"}, 
     seed=42, 
     temperature=0.8, 
     top_p=0.95, 
     model=data_dict_summarizer,
-    api_key='none',  
-    model_info=model_info, 
-    base_url='http://34.204.63.234:11434/v1'
+    api_key=api_key,  
+    model_info=model_info
     )
 
 # Just generate the data dict based on obervered facts
-data_dict_generator_client = OpenAIChatCompletionClient(
+data_dict_generator_config = dict(
     frequency_penalty=0.4, 
     logit_bias=None, 
     max_tokens=2048, 
@@ -66,86 +80,770 @@ data_dict_generator_client = OpenAIChatCompletionClient(
     temperature=0.2, 
     top_p=0.7, 
     model=data_dict_generator,
-    api_key='none', 
-    model_info=model_info, 
-    base_url='http://34.204.63.234:11434/v1')
+    api_key=api_key, 
+    model_info=model_info)
 
+data_dict_summarizer_client = OpenAIChatCompletionClient(**data_dict_summarizer_config, base_url=llm_base_url)
+data_dict_generator_client = OpenAIChatCompletionClient(**data_dict_generator_config, base_url=llm_base_url)
+
+# Caps requests in flight to the model server, retries transient HTTP errors
+scheduler = BoundedScheduler(max_in_flight=4, max_retries=3)
+
+# 'single' sends every dictionary in one prompt, 'hierarchical' maps over table groups then merges,
+# 'auto' switches to hierarchical once the dictionaries exceed the token budget
+summary_mode = "auto"
+# Context window of the summarizer model
+summarizer_context_tokens = 32768
+# Leaves room in the summarizer's context for the system prompt and the answer (its max_tokens)
+summary_token_budget = 16000
 
 
 #######################################################################
 #   !!! DONT EDIT BELOW EXCEPT FOR if __name__ == "__main__":   !!!   #
 #######################################################################
-async def main(results: list):
+async def generate_group(filenames: list, metadatas: list, keys: list):
+    """Generate the dictionaries of one request and checkpoint every file as soon as it is in."""
+    # The first request waits for the models to be loaded rather than racing the warm-up
+    if warm_up_task is not None:
+        await warm_up_task
+    column_classes = _run_state.get().column_classes
+    # Format/Nullable of trivial columns come from the rule-based classifier, packed files included
+    group_response = await initialize_batched_chat(filenames=filenames, metadatas=metadatas, data_dict_generator_client=data_dict_generator_client,
+                                                   column_classes=[column_classes.get(filename) for filename in filenames])
+    # Checkpoint every file as soon as its dictionary is in, so an interrupted run can resume
+    if checkpoint is not None:
+        for filename, key, response in zip(filenames, keys, group_response):
+            try:
+                checkpoint.add(key, filename, json.loads(response.chat_message.content))
+            except ValueError:
+                pass  # Not valid JSON: never checkpointed, keep_valid reports it and leaves it out
+    return group_response
+
+
+def keep_valid(filenames: list, responses: list, schema_groups: list):
+    """
+    Leave out the responses that aren't valid JSON, so they never reach the log or the summarizer.
+
+    Each one is reported and recorded on the run, to be listed in the generation log.
+    Schema groups follow the new positions; files fanned out from an invalid
+    representative are left out with it.
+    """
+    invalid = _run_state.get().invalid
+    kept = []
+    for index, (filename, response) in enumerate(zip(filenames, responses)):
+        try:
+            json.loads(response.chat_message.content)
+        except ValueError as e:
+            print(f"\nInvalid JSON from the generator for {filename}, left out of the log: {e}")
+            invalid.append((filename, str(e)))
+            continue
+        kept.append(index)
+    position = {index: kept_index for kept_index, index in enumerate(kept)}
+    schema_groups = [[position[index] for index in group if index in position] for group in schema_groups]
+    return [responses[index] for index in kept], [group for group in schema_groups if group]
+
+
+def prompt_options(filename: str) -> dict:
+    """Settings besides sampling that change a file's generator prompt, part of its checkpoint key."""
+    return {
+        "metadata_format": get_serializer_format(),
+        "prompt_layout": get_prompt_layout(),
+        "classifier": bool(_run_state.get().column_classes.get(filename)),
+    }
+
+
+def from_checkpoint(key: str):
+    """Response for a file finished by an earlier run with the same inputs, or None."""
+    data_dict = checkpoint.get(key) if checkpoint is not None else None
+    if data_dict is None:
+        return None
+    return Response(chat_message=TextMessage(content=json.dumps(data_dict), source="checkpoint"))
+
+
+def fan_out(representative, filename: str, metadata: dict):
+    """Response for a file sharing its schema with `representative`'s file, without a model call."""
     try:
-        # Create spinner instance
-        spinner = Spinner(f"Populating {len(results)} data dictionaries...")
-        spinner.start()
+        data_dict = json.loads(representative.chat_message.content)
+    except ValueError:
+        return representative
+    return Response(chat_message=TextMessage(content=json.dumps(fan_out_data_dict(data_dict, filename, metadata)), source="schema_group"))
 
-        # assign each file (task) for each agent
-        tasks = [initialize_individual_chat(filename=results[index][0], metadata=results[index][1], data_dict_generator_client=data_dict_generator_client) for index in range(len(results))]
 
-        # Execute all agent chat tasks concurrently, depends on ollama queue
-        responses = await asyncio.gather(*tasks)
+async def main(results: list, priorities: list = None, groups: list = None, schema_groups: list = None):
+    # Files sharing a schema are generated once, for the first file of their group
+    schema_groups = schema_groups or [[index] for index in range(len(results))]
+    # One request per representative unless small files were packed into shared requests
+    groups = groups or [[group[0]] for group in schema_groups]
+    state = _run_state.get()
+    stage_timings = state.stage_timings
+    started_at = time.perf_counter()
 
-    finally:
-        spinner.stop()
+    # Files finished by an earlier run with the same inputs come straight from the checkpoint
+    generator_config = sampling_config(data_dict_generator_client)
+    keys = [input_key(filename, metadata, generator_config, prompt_options(filename)) for filename, metadata in results]
+    responses = [from_checkpoint(key) for key in keys]
+    groups = [group for group in ([index for index in group if responses[index] is None] for group in groups) if group]
+    # Counted per run, the checkpoint's own counter spans every daemon job
+    reused = sum(response is not None for response in responses)
+    if reused:
+        print(f"Resuming: {reused} of {len(results)} data dictionaries taken from {checkpoint.path}")
+
+    with stage_span("generation", files=len(results), requests=len(groups)):
+        try:
+            # Create spinner instance
+            spinner = Spinner(f"Populating {len(results)} data dictionaries in {len(groups)} requests...")
+            spinner.start()
+
+            # assign each group of files (task) for each agent, as factories so failed calls can be retried
+            tasks = [
+                (lambda group=group: generate_group([results[index][0] for index in group], [results[index][1] for index in group], [keys[index] for index in group]))
+                for group in groups
+            ]
+            group_priorities = [sum(priorities[index] for index in group) for group in groups] if priorities else None
+            group_labels = [", ".join(results[index][0] for index in group) for group in groups]
+
+            # Bounded fan-out instead of flooding the ollama queue
+            group_responses = await scheduler.run(tasks, priorities=group_priorities, labels=group_labels,
+                                                  metrics=state.scheduler_metrics)
+
+            # Put the per-file responses back in the order of results
+            for group, group_response in zip(groups, group_responses):
+                for index, response in zip(group, group_response):
+                    responses[index] = response
+
+            # Fan each representative's dictionary out to the other files of its schema group
+            for schema_group in schema_groups:
+                for index in schema_group[1:]:
+                    responses[index] = fan_out(responses[schema_group[0]], *results[index])
+
+        finally:
+            spinner.stop()
+        print(f"\n{scheduler.report(state.scheduler_metrics)}")
+
+    stage_timings['generation'] = time.perf_counter() - started_at
 
     # Convert the responses to list of json responses
-    generated_data_dict, log_file_name = await jsonify_prompt(responses)
+    started_at = time.perf_counter()
+    responses, schema_groups = keep_valid([filename for filename, _ in results], responses, schema_groups)
+    with stage_span("jsonify_prompt", responses=len(responses)):
+        generated_data_dict, log_file_name = await jsonify_prompt(responses, invalid=_run_state.get().invalid)
+    stage_timings['jsonify'] = time.perf_counter() - started_at
+
+    started_at = time.perf_counter()
+    generated_use_cases = await summarize(generated_data_dict, log_file_name, schema_groups=schema_groups)
+    stage_timings['summarization'] = time.perf_counter() - started_at
+    return generated_data_dict, generated_use_cases, log_file_name
+
+
+async def main_streaming(root: str, files, priorities: list = None, dedupe_schemas: bool = True, use_classifier: bool = True,
+                         partitions: dict = None, max_pending: int = 1000):
+    """
+    Run sampling, generation, JSON validation and summarization as overlapping stages.
+
+    Every file goes to the generator as soon as its sample is ready, every answer is
+    parsed as it arrives, and once the dictionaries outgrow one summarizer prompt,
+    groups of them are summarized while later files are still being generated.
+    With `dedupe_schemas`, the first file of each schema is generated and later files
+    with the same schema wait for it and reuse its dictionary. With `use_classifier`,
+    columns the rules can classify only get a description from the model.
+    `files` is a list or an async iterator of names still being discovered; at most
+    `max_pending` files are in progress at once. Files that can't be read are skipped
+    and reported at the end of the run.
+    """
+    state = _run_state.get()
+    stage_timings = state.stage_timings
+    started_at = time.perf_counter()
+    generator_config = sampling_config(data_dict_generator_client)
+    partitions = partitions if partitions is not None else {}
+    names = []
+    # File index -> response, skipped files never get one
+    responses = {}
+    streaming_summarizer = None
+    if summary_mode != 'single':
+        streaming_summarizer = StreamingSummarizer(data_dict_summarizer_client, token_budget=summary_token_budget,
+                                                   scheduler=scheduler, metrics=state.scheduler_metrics)
+
+    # Schema fingerprint -> future of its representative's response, and the indices sharing it
+    representatives = {}
+    schema_members = {}
+    # Counted per run, the checkpoint's own counter spans every daemon job
+    reused = 0
+
+    async def generate(filename: str, metadata: dict):
+        nonlocal reused
+        key = input_key(filename, metadata, generator_config, prompt_options(filename))
+        response = from_checkpoint(key)
+        if response is not None:
+            reused += 1
+        else:
+            [response] = await scheduler.submit(lambda: generate_group([filename], [metadata], [key]), label=filename,
+                                                metrics=state.scheduler_metrics)
+        return response
+
+    async def process(index: int):
+        data_dict = None
+        try:
+            data_dict = await generate_file(index)
+        finally:
+            # Reported for every file, so partial summaries group files in discovery order
+            if streaming_summarizer is not None:
+                streaming_summarizer.add(index, data_dict)
+
+    async def generate_file(index: int):
+        """Sample and generate one file, returning its dictionary if the summarizer should see it."""
+        filename = names[index]
+        try:
+            metadata, fingerprint, classes = await get_columns_sample(root, filename, with_fingerprint=True, with_classes=True)
+        except (OSError, UnsupportedFileTypeError) as e:
+            state.skipped.append((filename, f"{type(e).__name__}: {e}"))
+            return
+        if not metadata:
+            state.skipped.append((filename, "no columns could be read"))
+            return
+        metadata = with_partition_columns(metadata, partitions.get(filename))
+        fingerprint = partitioned_fingerprint(fingerprint, partitions.get(filename))
+        state.sampled_metadata[filename] = metadata
+        if use_classifier:
+            state.column_classes[filename] = classes
+        if not dedupe_schemas or fingerprint is None:
+            fingerprint = ('unique', index)
+        schema_members.setdefault(fingerprint, []).append(index)
+
+        representative = representatives.get(fingerprint)
+        if representative is not None:
+            # Same schema as a file already on its way: reuse that dictionary
+            responses[index] = fan_out(await representative, filename, metadata)
+            return
+
+        representatives[fingerprint] = asyncio.ensure_future(generate(filename, metadata))
+        response = responses[index] = await representatives[fingerprint]
+
+        # Validate as it arrives; the summarizer only sees dictionaries that parsed, once per schema
+        try:
+            data_dict = json.loads(response.chat_message.content)
+        except ValueError:
+            return None  # Reported and left out by keep_valid
+        return data_dict
+
+    async def source():
+        if isinstance(files, list):
+            # Largest files first, so their generation overlaps with sampling the rest
+            order = sorted(range(len(files)), key=lambda index: priorities[index], reverse=True) if priorities else range(len(files))
+            for index in order:
+                yield files[index]
+        else:
+            async for name in files:
+                yield name
+
+    with stage_span("generation", streaming=True) as span:
+        pending = set()
+        try:
+            # Create spinner instance
+            spinner = Spinner("Discovering, sampling and populating data dictionaries...")
+            spinner.start()
+            async for filename in source():
+                # Bounded, so a huge tree doesn't turn into a huge number of waiting tasks
+                while len(pending) >= max_pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        task.result()
+                names.append(filename)
+                pending.add(asyncio.ensure_future(process(len(names) - 1)))
+            await asyncio.gather(*pending)
+        except BaseException:
+            for task in pending:
+                task.cancel()
+            if streaming_summarizer is not None:
+                await streaming_summarizer.aclose()
+            raise
+        finally:
+            spinner.stop()
+        span.set_attribute("files", len(names))
+        print(f"\n{scheduler.report(state.scheduler_metrics)}")
+        if reused:
+            print(f"Resumed: {reused} of {len(names)} data dictionaries taken from {checkpoint.path}")
+
+    stage_timings['sampling_and_generation'] = time.perf_counter() - started_at
+
+    # Back to discovery order without the skipped files, schema groups follow the new positions
+    kept = sorted(responses)
+    position = {index: kept_index for kept_index, index in enumerate(kept)}
+    # Sorted, groups were created in whatever order sampling finished (the representative stays first)
+    schema_groups = sorted(([position[group[0]]] + sorted(position[index] for index in group[1:])
+                            for group in schema_members.values()), key=min)
+
+    started_at = time.perf_counter()
+    responses, schema_groups = keep_valid([names[index] for index in kept], [responses[index] for index in kept], schema_groups)
+    with stage_span("jsonify_prompt", responses=len(responses)):
+        generated_data_dict, log_file_name = await jsonify_prompt(responses, invalid=state.invalid)
+    stage_timings['jsonify'] = time.perf_counter() - started_at
+
+    # Only the summaries of the last arrivals and the merge are left at this point
+    started_at = time.perf_counter()
+    generated_use_cases = await summarize(generated_data_dict, log_file_name, streaming_summarizer, schema_groups=schema_groups)
+    stage_timings['summarization'] = time.perf_counter() - started_at
+    return generated_data_dict, generated_use_cases, log_file_name
+
+
+async def summarize(generated_data_dict: list, log_file_name: str, streaming_summarizer=None, schema_groups: list = None) -> str:
+    # The summarizer sees every schema once, with the list of files sharing it
+    summary_input = summarizer_view(generated_data_dict, schema_groups) if schema_groups else generated_data_dict
 
     # Combine json responses with an initial task message
     # initial_task = [TextMessage(content=f"Review the data dictionary generated by the file handling agents.",source="user")]
     # generated_data_dict.extend(initial_task)
 
-    try:
-        # Create spinner instance
-        spinner = Spinner(f"Generating analytics use cases...")
-        spinner.start()
-
-    # Initialize summarizer agent
-        final_agent = AssistantAgent(name="Data_Dictionary_Analytics_Suggester",
-                                     model_client=data_dict_summarizer_client,
-                                     system_message=data_dict_summarizer_prompt()
-        )
-
-        generated_use_cases = await final_agent.on_messages(
-                [TextMessage(content=f"{generated_data_dict}\n\nReview the above data dictionary.",source="user")], None
-            )
+    with stage_span("summarizer", mode=summary_mode, streaming=streaming_summarizer is not None and streaming_summarizer.started):
+        try:
+            # Create spinner instance
+            spinner = Spinner(f"Generating analytics use cases...")
+            spinner.start()
+
+            # Partial summaries already started while generating: summarize the rest and merge
+            if streaming_summarizer is not None and streaming_summarizer.started:
+                generated_use_cases = await streaming_summarizer.finish(summary_input)
+            # Too many tables for one prompt: summarize groups of related tables, then merge
+            elif summary_mode == 'hierarchical' or (summary_mode == 'auto' and needs_hierarchical_summary(summary_input, summary_token_budget)):
+                generated_use_cases = await summarize_hierarchical(summary_input, data_dict_summarizer_client,
+                                                                   token_budget=summary_token_budget, scheduler=scheduler,
+                                                                   metrics=_run_state.get().scheduler_metrics)
+            else:
+                # Initialize summarizer agent
+                final_agent = AssistantAgent(name="Data_Dictionary_Analytics_Suggester",
+                                             model_client=data_dict_summarizer_client,
+                                             system_message=data_dict_summarizer_prompt()
+                )
+
+                response = await final_agent.on_messages(
+                        [TextMessage(content=f"{summary_input}\n\nReview the above data dictionary.",source="user")], None
+                    )
+                generated_use_cases = response.chat_message.content
         
-        # Append suggestions into the created log file
-        # To-do: remove the first "{" after generating use cases, or just add the json obj to the dict in log
-        with open(log_file_name, "a") as f:
-            f.write("\n\n"+generated_use_cases.chat_message.content)
-            f.write('}')
+            # Rewrite the log as one JSON document holding the dictionaries and the use cases
+            write_generation_log(log_file_name, generated_data_dict, generated_use_cases, invalid=_run_state.get().invalid)
 
-        print("\nOperation completed.")
-        print(f"Analytics use cases appended to {log_file_name}.")
+            print("\nOperation completed.")
+            print(f"Analytics use cases added to {log_file_name}.")
 
-    finally:
-        spinner.stop()
-    return generated_data_dict, generated_use_cases.chat_message.content, log_file_name
+        finally:
+            spinner.stop()
+    return generated_use_cases
 
 
-if __name__ == "__main__":
-    # Set up command line argument parsing
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description='Process files from a specified directory.')
     parser.add_argument('root_path', nargs='?', default='sheets/mysql/', 
                        help='Root path for processing files (default: sheets/mysql/)')
-    args = parser.parse_args()
+    parser.add_argument('--base-url', default=llm_base_url,
+                       help=f'OpenAI-compatible base URL of the model server (default: {llm_base_url})')
+    parser.add_argument('--executor', choices=['auto', 'thread', 'process'], default='auto',
+                       help='Pool used for file parsing: threads, processes, or auto by file type (default: auto)')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Worker count per pool (default: number of CPUs)')
+    parser.add_argument('--max-concurrency', type=int, default=None,
+                       help='Max files parsed at once (default: same as --workers)')
+    parser.add_argument('--show-timings', action='store_true',
+                       help='Print per-file parsing times after sampling')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Bypass the on-disk sample/profile cache for this run')
+    parser.add_argument('--clear-cache', action='store_true',
+                       help='Delete every cached sample/profile before running')
+    parser.add_argument('--cache-dir', default='.cache/data_catalog',
+                       help='Directory for the sample/profile cache (default: .cache/data_catalog)')
+    parser.add_argument('--cache-max-mb', type=int, default=512,
+                       help='Cache size above which least recently used entries are evicted (default: 512)')
+    parser.add_argument('--cache-content-hash', action='store_true',
+                       help='Key the cache on file content instead of size and mtime')
+    parser.add_argument('--no-llm-cache', action='store_true',
+                       help='Always call the model instead of reusing cached responses')
+    parser.add_argument('--llm-cache-path', default='.cache/llm_cache.sqlite',
+                       help='SQLite file for cached model responses (default: .cache/llm_cache.sqlite)')
+    parser.add_argument('--llm-cache-ttl-hours', type=float, default=168,
+                       help='Hours before a cached model response expires (default: 168)')
+    parser.add_argument('--llm-cache-max-entries', type=int, default=10000,
+                       help='Cached responses kept before least recently used ones are evicted (default: 10000)')
+    cassette_group = parser.add_mutually_exclusive_group()
+    cassette_group.add_argument('--record-cassette', metavar='PATH',
+                       help='Record every model request/response and its latency to a cassette file (bypasses the LLM cache)')
+    cassette_group.add_argument('--replay-cassette', metavar='PATH',
+                       help='Answer model requests from a recorded cassette instead of the model server (bypasses the LLM cache)')
+    parser.add_argument('--replay-latency', choices=['original', 'zero'], default='original',
+                       help='Replay each response after its recorded latency, or at once (default: original)')
+    parser.add_argument('--trace-exporter', choices=['none', 'console', 'otlp'], default='none',
+                       help='Export stage spans to the console or an OTLP collector; needs opentelemetry-sdk (default: none)')
+    parser.add_argument('--otlp-endpoint', default=None,
+                       help='OTLP collector address for --trace-exporter otlp (default: localhost:4317)')
+    parser.add_argument('--metrics-file', metavar='PATH', default=None,
+                       help='Write stage durations and token counts in Prometheus text format when the run ends')
+    parser.add_argument('--metrics-port', type=int, default=None,
+                       help='Serve the same metrics at http://127.0.0.1:PORT/metrics while running')
+    parser.add_argument('--checkpoint', metavar='PATH', default='generation_log/checkpoint.jsonl',
+                       help='JSONL file every finished data dictionary is appended to (default: generation_log/checkpoint.jsonl)')
+    parser.add_argument('--resume', action='store_true',
+                       help='Skip files already completed in the checkpoint by a previous run with the same inputs')
+    parser.add_argument('--pipeline', choices=['streaming', 'staged'], default='streaming',
+                       help='Overlap sampling, generation and summarization, or run them one after another; '
+                            '--pack-small-files and --priority most-columns always run staged (default: streaming)')
+    parser.add_argument('--no-classifier', action='store_true',
+                       help='Let the model fill Format and Nullable of every column instead of using the rule-based classifier')
+    parser.add_argument('--no-schema-dedupe', action='store_true',
+                       help='Generate a dictionary for every file, even when several files share the same schema')
+    parser.add_argument('--max-in-flight', type=int, default=4,
+                       help='Max data dictionary requests sent to the model server at once (default: 4)')
+    parser.add_argument('--max-retries', type=int, default=3,
+                       help='Retries with exponential backoff for transient HTTP errors (default: 3)')
+    parser.add_argument('--priority', choices=['none', 'largest', 'most-columns'], default='largest',
+                       help='Which files are sent to the model first (default: largest)')
+    parser.add_argument('--endpoints', nargs='+', default=None, metavar='URL',
+                       help='OpenAI-compatible base URLs to spread model calls across (default: the configured llm_base_url)')
+    parser.add_argument('--routing', choices=['least-outstanding', 'round-robin'], default='least-outstanding',
+                       help='How calls are assigned to --endpoints (default: least-outstanding)')
+    parser.add_argument('--health-interval', type=float, default=15.0,
+                       help='Seconds between endpoint health checks, 0 disables them (default: 15)')
+    parser.add_argument('--pack-small-files', action='store_true',
+                       help='Send several small files to the generator in one request')
+    parser.add_argument('--pack-token-budget', type=int, default=3000,
+                       help='Max metadata tokens in one packed request (default: 3000)')
+    parser.add_argument('--small-file-tokens', type=int, default=500,
+                       help='Files with more metadata tokens than this are never packed (default: 500)')
+    parser.add_argument('--summary-mode', choices=['auto', 'single', 'hierarchical'], default='auto',
+                       help='Summarize all dictionaries in one prompt, or map-reduce over table groups (default: auto)')
+    parser.add_argument('--summary-token-budget', type=int, default=16000,
+                       help='Max dictionary tokens per summarizer prompt before going hierarchical (default: 16000)')
+    parser.add_argument('--metadata-format', choices=['repr', 'json', 'markdown', 'csv', 'auto'], default='repr',
+                       help='How column samples are encoded in generator prompts, auto picks the fewest tokens per file (default: repr)')
+    parser.add_argument('--max-value-chars', type=int, default=200,
+                       help='Sample values longer than this are truncated in prompts, 0 disables it (default: 200)')
+    parser.add_argument('--show-metadata-tokens', action='store_true',
+                       help='Print the prompt tokens each metadata encoding would spend on the sampled files')
+    parser.add_argument('--prompt-layout', choices=['per-file', 'shared-prefix'], default='per-file',
+                       help='Name the file in the generator system prompt, or keep one static system prompt '
+                            'so the server can reuse its prefix cache (default: per-file)')
+    parser.add_argument('--no-warm-up', action='store_true',
+                       help='Skip loading the models before the first request')
+    parser.add_argument('--keep-alive', default='30m',
+                       help='How long the server keeps the models loaded after the warm-up, Ollama duration, -1 for ever (default: 30m)')
+    parser.add_argument('--include', action='append', metavar='GLOB',
+                       help='Only process files whose path relative to root_path matches, repeatable (e.g. "*.parquet")')
+    parser.add_argument('--exclude', action='append', metavar='GLOB',
+                       help='Skip files and folders whose path relative to root_path matches, repeatable (e.g. "tmp/*")')
+    parser.add_argument('--no-recursive', action='store_true',
+                       help='Only look at the files directly in root_path')
+    parser.add_argument('--max-depth', type=int, default=None,
+                       help='Deepest subfolder level searched, 0 is root_path itself (default: no limit)')
+    parser.add_argument('--discovery-workers', type=int, default=8,
+                       help='Folders listed concurrently while discovering files (default: 8)')
+    parser.add_argument('--discovery-queue', type=int, default=1000,
+                       help='Files discovered or in progress ahead of the samplers before discovery waits (default: 1000)')
+    parser.add_argument('--no-partition-columns', action='store_true',
+                       help='Do not add Hive partition keys (key=value folders) as columns of the files below them')
+    parser.add_argument('--excel-engine', choices=['auto', 'calamine', 'openpyxl'], default='auto',
+                       help='Workbook parser: calamine is much faster but needs `pip install python-calamine` (default: auto, calamine when installed)')
+    parser.add_argument('--serve', action='store_true',
+                       help='Run as a daemon with an HTTP API for submitting jobs instead of processing root_path once')
+    parser.add_argument('--host', default='127.0.0.1',
+                       help='Interface the daemon listens on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8080,
+                       help='Port the daemon listens on (default: 8080)')
+    parser.add_argument('--max-jobs', type=int, default=2,
+                       help='Daemon jobs running at once; their model calls share --max-in-flight (default: 2)')
+    return parser
 
-    async def run():
-        root = args.root_path
-        # Get all filenames that should be processed in the directory
-        files: list[str] = os.listdir(path=root)
-        
-        # Create and run a list of tasks to process each file
-        tasks = [get_columns_sample(root, file) for file in files]
-        results = await asyncio.gather(*tasks)
+
+# Set by configure(), kept at module level so main() and run() can be driven from scripts
+executor = None
+cache = None
+llm_cache = None
+cassette = None
+metrics_server = None
+metrics_file = None
+checkpoint = None
+endpoint_pools = []
+# Loads the models while the files are sampled, awaited by the first generation request
+warm_up_task = None
+
+
+class RunState:
+    """Bookkeeping of one pipeline run; concurrent daemon jobs each get their own."""
+
+    def __init__(self):
+        # Rule-based Format/Nullable per file name, filled in after sampling
+        self.column_classes = {}
+        # Column samples per file name, for --show-metadata-tokens
+        self.sampled_metadata = {}
+        self.stage_timings = {}
+        # (path, reason) of every file left out of the run
+        self.skipped = []
+        # (path, error) of every file whose generated dictionary wasn't valid JSON
+        self.invalid = []
+        # Latency and retries of this run's model calls, the scheduler itself is shared
+        self.scheduler_metrics = []
+
+
+# Set by every run in its own context, the default serves main() driven directly from scripts
+_run_state = contextvars.ContextVar('run_state', default=RunState())
+
+
+def configure(args):
+    """Build the model clients, scheduler, executor and caches from parsed arguments."""
+    global data_dict_generator_client, data_dict_summarizer_client, scheduler, summary_mode, summary_token_budget
+    global executor, cache, llm_cache, cassette, metrics_server, metrics_file, checkpoint, endpoint_pools
+
+    summary_mode = args.summary_mode
+    summary_token_budget = args.summary_token_budget
+    if summary_token_budget + data_dict_summarizer_config['max_tokens'] > summarizer_context_tokens:
+        raise ValueError(f"--summary-token-budget {summary_token_budget} plus the summarizer's max_tokens "
+                         f"({data_dict_summarizer_config['max_tokens']}) exceed its {summarizer_context_tokens} token context.")
+    configure_serializer(args.metadata_format, max_value_chars=args.max_value_chars or None)
+    configure_prompt_layout(args.prompt_layout)
+    configure_excel(args.excel_engine)
+
+    data_dict_generator_client = OpenAIChatCompletionClient(**data_dict_generator_config, base_url=args.base_url)
+    data_dict_summarizer_client = OpenAIChatCompletionClient(**data_dict_summarizer_config, base_url=args.base_url)
+
+    # Several model servers: route every call through a pool per model
+    endpoint_pools = []
+    if args.endpoints:
+        data_dict_generator_client = EndpointPool.from_urls(args.endpoints, routing=args.routing, health_interval=args.health_interval, **data_dict_generator_config)
+        data_dict_summarizer_client = EndpointPool.from_urls(args.endpoints, routing=args.routing, health_interval=args.health_interval, **data_dict_summarizer_config)
+        endpoint_pools = [data_dict_generator_client, data_dict_summarizer_client]
+
+    scheduler = BoundedScheduler(max_in_flight=args.max_in_flight, max_retries=args.max_retries)
+    checkpoint = GenerationCheckpoint(args.checkpoint, resume=args.resume)
+
+    # Worker processes apply the Excel engine themselves, spawned ones don't inherit it
+    executor = configure_executor(max_workers=args.workers, mode=args.executor, max_concurrency=args.max_concurrency,
+                                  initializer=configure_excel, initargs=(args.excel_engine,))
+    cache = configure_cache(cache_dir=args.cache_dir, max_bytes=args.cache_max_mb * 1024 * 1024,
+                            enabled=not args.no_cache, content_hash=args.cache_content_hash)
+    if args.clear_cache:
+        print(f"Cleared {cache.clear()} cached entries from {args.cache_dir}.")
+
+    # Record or replay model traffic so runs are repeatable offline
+    cassette = None
+    if args.record_cassette or args.replay_cassette:
+        cassette = Cassette(args.record_cassette or args.replay_cassette, mode='record' if args.record_cassette else 'replay')
+        data_dict_generator_client = CassetteChatCompletionClient(data_dict_generator_client, cassette, replay_latency=args.replay_latency)
+        data_dict_summarizer_client = CassetteChatCompletionClient(data_dict_summarizer_client, cassette, replay_latency=args.replay_latency)
+
+    # Identical prompts with the same seed and sampling settings are answered from disk
+    llm_cache = None
+    if not args.no_llm_cache and cassette is None:
+        llm_cache = LLMResponseCache(path=args.llm_cache_path, ttl_seconds=args.llm_cache_ttl_hours * 3600,
+                                     max_entries=args.llm_cache_max_entries)
+        # Answers that don't parse are asked again rather than replayed, resuming included
+        data_dict_generator_client = CachedChatCompletionClient(data_dict_generator_client, llm_cache, validate=is_json_result)
+        data_dict_summarizer_client = CachedChatCompletionClient(data_dict_summarizer_client, llm_cache)
+
+    # Outermost, so cache hits and replays show up as model calls too
+    data_dict_generator_client = TracedChatCompletionClient(data_dict_generator_client)
+    data_dict_summarizer_client = TracedChatCompletionClient(data_dict_summarizer_client)
+    configure_telemetry(args.trace_exporter, otlp_endpoint=args.otlp_endpoint)
+    metrics.reset()
+    metrics_server = serve_metrics(args.metrics_port) if args.metrics_port else None
+    metrics_file = args.metrics_file
+
+
+async def run(args, state: RunState = None):
+    """Run the pipeline once; `state` (default: a new one) collects the run's timings and skipped files."""
+    with stage_span("pipeline", root=args.root_path):
+        return await _run(args, state or RunState())
+
+
+def start_warm_up(args):
+    """Start loading both models in the background, priming the prompts that never change."""
+    global warm_up_task
+    # Daemon jobs share the warm-up of the first one
+    if warm_up_task is not None and warm_up_task.get_loop() is asyncio.get_running_loop():
+        return
+    warm_up_task = None
+    # Replays never reach a server
+    if args.no_warm_up or args.replay_cassette:
+        return
+
+    generator_prompts = []
+    if args.prompt_layout == 'shared-prefix':
+        generator_prompts.append(data_dict_generator_prompt())
+        if not args.no_classifier:
+            generator_prompts.append(data_dict_classified_generator_prompt())
+        if args.pack_small_files:
+            generator_prompts.append(data_dict_batch_generator_prompt())
+    models = {data_dict_generator: generator_prompts}
+    models.setdefault(data_dict_summarizer, []).append(data_dict_summarizer_prompt())
+
+    async def warm_up():
+        with stage_span("warm_up", models=len(models)):
+            seconds = await warm_up_models(args.endpoints or [args.base_url], models, keep_alive=args.keep_alive, api_key=api_key)
+        _run_state.get().stage_timings['warm_up'] = seconds
+
+    warm_up_task = asyncio.ensure_future(warm_up())
+
+
+async def _run(args, state: RunState):
+    _run_state.set(state)
+    # Endpoint counters at the start, so the report shows this job's share
+    pool_snapshots = [pool.snapshot() for pool in endpoint_pools]
+    root = args.root_path
+    started_at = time.perf_counter()
+    start_warm_up(args)
+
+    # The one file given, or every dataset below the folder (zip archives are read in place,
+    # every dataset inside becomes "<archive>::<member>", every sheet of a workbook "<workbook>#<sheet>")
+    discovery = None
+    if os.path.isfile(root):
+        root, file = os.path.split(root)
+        files = expand_workbooks(root, expand_archives(root, [file], extensions=SUPPORTED_EXTENSIONS))
+    else:
+        discovery = DatasetDiscovery(root, include=args.include, exclude=args.exclude, recursive=not args.no_recursive,
+                                     max_depth=args.max_depth, workers=args.discovery_workers)
+    partitions = {} if discovery is None or args.no_partition_columns else discovery.partitions
+
+    try:
+        # Packing and most-columns priority need every sample before the first request
+        if args.pipeline == 'streaming' and not args.pack_small_files and args.priority != 'most-columns':
+            priorities = None
+            if discovery is not None and args.priority == 'largest':
+                with stage_span("directory_listing", root=root):
+                    files = list(discovery.walk())
+                priorities = [discovery.sizes[file] for file in files]
+            elif discovery is not None:
+                # Files reach the samplers while the tree is still being walked
+                files = discovery.stream(max_queued=args.discovery_queue)
+            return await main_streaming(root, files, priorities=priorities, dedupe_schemas=not args.no_schema_dedupe,
+                                        use_classifier=not args.no_classifier, partitions=partitions, max_pending=args.discovery_queue)
+
+        if discovery is not None:
+            with stage_span("directory_listing", root=root):
+                files = sorted(discovery.walk())
+
+        # Create and run a list of tasks to process each file, parsing runs on the executor pool
+        with stage_span("sampling", files=len(files)):
+            tasks = [get_columns_sample(root, file, with_fingerprint=True, with_classes=True) for file in files]
+            samples = await asyncio.gather(*tasks, return_exceptions=True)
+        state.stage_timings['sampling'] = time.perf_counter() - started_at
+        if args.show_timings:
+            print(executor.report())
+            print(f"Cache: {cache.hits} hits, {cache.misses} misses")
+
+        # Leave out the files that couldn't be read, they are reported at the end
+        readable = []
+        for file, sample in zip(files, samples):
+            if isinstance(sample, (OSError, UnsupportedFileTypeError)):
+                state.skipped.append((file, f"{type(sample).__name__}: {sample}"))
+            elif isinstance(sample, BaseException):
+                raise sample
+            elif not sample[0]:
+                state.skipped.append((file, "no columns could be read"))
+            else:
+                readable.append((file, sample))
+        files = [file for file, _ in readable]
+        samples = [sample for _, sample in readable]
 
         # Combine the results with the filenames
-        results = list(zip(files, results))
+        results = [(file, with_partition_columns(metadata, partitions.get(file))) for file, (metadata, _, _) in zip(files, samples)]
+        state.sampled_metadata.update(results)
+        if not args.no_classifier:
+            state.column_classes.update((file, classes) for file, (_, _, classes) in zip(files, samples))
+
+        # Files with the same columns and dtypes share one generated dictionary
+        schema_groups = None
+        if not args.no_schema_dedupe:
+            schema_groups = group_by_fingerprint([partitioned_fingerprint(fingerprint, partitions.get(file)) for file, (_, fingerprint, _) in zip(files, samples)])
+            if len(schema_groups) < len(files):
+                print(f"{len(files)} files share {len(schema_groups)} distinct schemas")
+
+        # Start the slowest generations first so they don't become stragglers
+        priorities = None
+        if args.priority == 'largest':
+            priorities = [discovery.sizes[file] if discovery is not None else source_size(os.path.join(root, file)) for file in files]
+        elif args.priority == 'most-columns':
+            priorities = [len(metadata) for _, metadata in results]
+        
+        # Pack small files into shared requests, bounded by the generator's max_tokens
+        groups = None
+        if args.pack_small_files:
+            representatives = [group[0] for group in schema_groups] if schema_groups else list(range(len(results)))
+            packed = pack_small_files([results[index] for index in representatives], token_budget=args.pack_token_budget,
+                                      small_file_tokens=args.small_file_tokens, completion_budget=data_dict_generator_config['max_tokens'])
+            groups = [[representatives[index] for index in group] for group in packed]
         
         # Run the main function
-        return await main(results)
+        return await main(results, priorities=priorities, groups=groups, schema_groups=schema_groups)
+    finally:
+        if args.show_timings and args.pipeline == 'streaming':
+            print(executor.report())
+        if discovery is not None:
+            state.skipped[:0] = discovery.skipped
+        if state.skipped:
+            print(skipped_report(state.skipped))
+        if discovery is not None and discovery.partitions:
+            keys = sorted({key for partitions in discovery.partitions.values() for key in partitions})
+            print(f"{len(discovery.partitions)} files in Hive-style partitions, by {', '.join(keys)}")
+        if args.show_metadata_tokens and state.sampled_metadata:
+            sizes = measure_serializers(list(state.sampled_metadata.values()))
+            print(f"Metadata tokens for {len(state.sampled_metadata)} files: " + ", ".join(f"{name} {tokens}" for name, tokens in sizes.items()))
+        # Left open, health checks keep running for other daemon jobs; serve() and shutdown() close them
+        for pool, snapshot in zip(endpoint_pools, pool_snapshots):
+            print(pool.report(since=snapshot))
+
+
+async def serve(args):
+    """
+    Run as a daemon: keep the clients, connection pools and caches built by `configure(args)`
+    and run the folders or files submitted over HTTP as jobs, with the options of `args`.
+    """
+    async def run_job(path: str) -> dict:
+        job_args = argparse.Namespace(**{**vars(args), 'root_path': path})
+        generated_data_dict, generated_use_cases, log_file_name = await run(job_args)
+        try:
+            generated_use_cases = json.loads(generated_use_cases)
+        except (TypeError, ValueError):
+            pass  # Returned as the model wrote it
+        return {"data_dictionaries": generated_data_dict, "use_cases": generated_use_cases, "log_file": log_file_name}
+
+    start_warm_up(args)
+    server = JobServer(run_job, max_jobs=args.max_jobs)
+    print(f"Serving on http://{args.host}:{args.port}, {args.max_jobs} jobs and {args.max_in_flight} model calls at a time")
+    try:
+        await server.serve_forever(args.host, args.port)
+    finally:
+        await server.close()
+        for pool in endpoint_pools:
+            await pool.aclose()
+
+
+def shutdown():
+    """Release the executor pools, endpoint pools, the LLM cache and the cassette, and flush traces and metrics."""
+    executor.shutdown()
+    for pool in endpoint_pools:
+        pool.close()
+    if llm_cache is not None:
+        stats = llm_cache.stats()
+        print(f"LLM cache: {stats['hits']} hits, {stats['misses']} misses, {stats['entries']} entries")
+        llm_cache.close()
+    if cassette is not None:
+        stats = cassette.stats()
+        print(f"Cassette {cassette.path}: {stats['recorded']} recorded, {stats['replayed']} replayed")
+        cassette.close()
+    if metrics_file:
+        metrics.write(metrics_file)
+        print(f"Metrics written to {metrics_file}")
+    if metrics_server is not None:
+        metrics_server.shutdown()
+    shutdown_telemetry()
+
+
+if __name__ == "__main__":
+    args = build_parser().parse_args()
+    configure(args)
     
-    generated_data_dict, generated_use_cases, log_file_name = asyncio.run(run())
+    try:
+        if args.serve:
+            asyncio.run(serve(args))
+        else:
+            generated_data_dict, generated_use_cases, log_file_name = asyncio.run(run(args))
+    except KeyboardInterrupt:
+        if not args.serve:
+            raise
+    finally:
+        shutdown()
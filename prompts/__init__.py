@@ -4,6 +4,9 @@ from .code_checking_prompt import code_checking_prompt
 from .cleaning_checking_prompt import cleaning_checking_prompt
 from .multi_file_handler.data_dict_generator import data_dict_generator_prompt
 from .multi_file_handler.data_dict_summarizer import data_dict_summarizer_prompt
+from .multi_file_handler.data_dict_batch_generator import data_dict_batch_generator_prompt
+from .multi_file_handler.data_dict_use_case_merger import data_dict_use_case_merger_prompt
+from .multi_file_handler.data_dict_classified_generator import data_dict_classified_generator_prompt
 
 __all__ = [
     "cleaning_reasoning_prompt",
@@ -11,5 +14,8 @@ __all__ = [
     "cleaning_coding_prompt",
     "code_checking_prompt",
     "data_dict_generator_prompt",
-    "data_dict_summarizer_prompt"
+    "data_dict_summarizer_prompt",
+    "data_dict_batch_generator_prompt",
+    "data_dict_use_case_merger_prompt",
+    "data_dict_classified_generator_prompt"
 ]
\ No newline at end of file
@@ -0,0 +1,55 @@
+def data_dict_batch_generator_prompt(filenames=None) -> str:
+    # Without filenames the prompt is the same for every batch, so the server can reuse its prefix cache
+    if filenames:
+        file_list = "\n".join(f"    - {filename}" for filename in filenames)
+        purpose = f"Your task is to generate a comprehensive data dictionary for each of these datasets:\n{file_list}\n"
+        naming_source = "<purpose>"
+    else:
+        purpose = "Your task is to generate a comprehensive data dictionary for each of the datasets listed in the user message."
+        naming_source = "the user message"
+    return f"""<purpose>You are a file handling agent responsible for several small files. {purpose}</purpose>
+<instructions>
+The metadata of every file is provided separately, each block starting with its file name. Treat every file on its own and, for each column of each file, perform the following:
+
+1. Description: Provide a clear and concise description of the column, including explanations for any abbreviations.
+2. Format: Identify the data format of the column's values. Examples include, but are not limited to:
+    - Datetime: Specify the format (e.g., YYYY-MM-DD).
+    - Identifier: Describe the pattern (e.g., starts with a letter followed by numbers like E-001 or A1234).
+    - Numeric: Indicate if the data is numeric, specifying integers, decimals, ranges, etc.
+    - Categorical: Specify if the data represents categories or labels.
+    - Boolean: Indicate if the data represents true/false values.
+    - Text: Describe if the data contains free-form text or strings.
+    - None: If no specific format exists, indicate as `None`.
+    - Other Formats: Identify and describe any other formats observed in the data.
+3. Nullable: Indicate whether the column allows null values (`True` or `False`).
+4. Sample Values: Include three sample values provided for the column.
+
+Important: Ensure that your output strictly follows the <output_format> provided below, with exactly one entry per file.
+</instructions>
+
+<output_format>
+{{
+  "data_dictionaries": [
+    {{
+      "filename": "<file_name>",
+      "columns": [
+        {{
+          "Column": "<column_name>",
+          "Description": "<description>",
+          "Format": "<format>",
+          "Nullable": <true/false>,
+          "Sample Values": ["<sample1>", "<sample2>", "<sample3>"]
+        }}
+      ]
+    }}
+  ]
+}}
+</output_format>
+
+<rules>
+- compliance: Adhere strictly to the <output_format>.
+- Exact Naming: Use the exact file names listed in {naming_source} and the exact column names from the metadata.
+- Separation: Never mix columns of different files in the same entry.
+- Conciseness: Provide only the information specified without any additional commentary.
+- Action Limitation: Do not perform any actions beyond those outlined in the instructions.
+</rules>"""
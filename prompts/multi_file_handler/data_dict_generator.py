@@ -1,5 +1,8 @@
-def data_dict_generator_prompt(filename) -> str:
-    return f"""<purpose>You are a file handling agent responsible for the file named {filename}. Your task is to generate a comprehensive data dictionary for this dataset.</purpose>
+def data_dict_generator_prompt(filename=None) -> str:
+    # Without a filename the prompt is the same for every file, so the server can reuse its prefix cache
+    subject = f"the file named {filename}" if filename else "the file named in the user message"
+    output_filename = filename or "<file_name>"
+    return f"""<purpose>You are a file handling agent responsible for {subject}. Your task is to generate a comprehensive data dictionary for this dataset.</purpose>
 <instructions>
 Analyze the provided data metadata in JSON string format and perform the following for each column:
 
@@ -21,7 +24,7 @@ Important: Ensure that your output strictly follows the <output_format> provided
 
 <output_format>
 {{
-  "filename": "{filename}",
+  "filename": "{output_filename}",
   "columns": [
     {{
       "Column": "<column_name>",
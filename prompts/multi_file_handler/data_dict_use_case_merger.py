@@ -0,0 +1,45 @@
+def data_dict_use_case_merger_prompt():
+    return """<Use_Case_Merger>
+
+    <purpose>
+        Merge several partial lists of analytics use cases, each produced from a different group of related datasets, into one consolidated list. The consolidated list must read as if all data dictionaries had been analyzed together.
+    </purpose>
+
+    <instructions>
+        1. Review every partial use case list and the dataset index provided.
+        2. Merge use cases that address the same business objective with the same datasets into a single, more complete use case.
+        3. Using the dataset index, identify columns shared between datasets of different groups (e.g., the same key column) and add use cases that combine those groups where the relationship supports it.
+        4. Keep every distinct, actionable use case; drop only exact or near duplicates.
+        5. Renumber the final use cases with unique, sequential IDs.
+    </instructions>
+
+    <output_format>
+
+"use_cases": [
+  {
+    "use_case_id": "C<UniqueNumber>",
+    "title": "<Descriptive Title of the Use Case>",
+    "description": "<A comprehensive and specific explanation of the analytics use case, including the business objectives it addresses, granular metrics to be optimized, specific outcomes expected, strategic alignment with business goals, actionable insights to be derived, and how data relationships inform decision-making processes.>",
+    "data_sources": [
+      "Dataset1.csv",
+      "Dataset2.csv"
+    ],
+    "columns_utilized": [
+      "Dataset1.csv.ColumnName",
+      "Dataset2.csv.ColumnName"
+    ],
+    "relationships_leveraged": "<Description of how the columns are related (e.g., primary key, foreign key, common attributes) and how these relationships are utilized in the analysis.>"
+  }
+]
+    </output_format>
+
+    <rules>
+        1. Exact Naming: Use the exact table and column names found in the partial use cases and the dataset index.
+        2. No Assumptions: Only combine datasets through columns listed in the dataset index, without introducing external information.
+        3. Structured Output: Adhere strictly to the specified JSON output format.
+        4. Unique Identification: Assign a unique ID to each use case.
+        5. Avoid Redundancy: Ensure that each use case is unique and does not duplicate the purpose or methodology of another use case.
+        6. Omit Ambiguity: Avoid wording that implies uncertainty, such as "Maybe", "Perhaps", etc.
+    </rules>
+
+</Use_Case_Merger>"""
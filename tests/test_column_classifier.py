@@ -0,0 +1,64 @@
+import pandas as pd
+import pytest
+
+from utils.column_classifier import CLASSIFIER_ROWS, KEY_COLUMN, classify_column, classify_columns
+
+
+@pytest.mark.parametrize('name', ['id', 'ID', 'customer_id', 'customerNumber', 'orderID', 'productCode', 'Order No', 'zip_code', 'api-key'])
+def test_key_columns(name):
+    assert KEY_COLUMN.search(name)
+
+
+@pytest.mark.parametrize('name', ['paid', 'valid', 'casino', 'zipcode', 'monkey', 'amount', 'phone'])
+def test_words_ending_like_keys_are_not_key_columns(name):
+    assert not KEY_COLUMN.search(name)
+
+
+def test_integer_identifiers_need_a_key_like_name():
+    df = pd.DataFrame({'orderNumber': [1, 2, 3], 'paid': [10, 20, 30]})
+    classes = classify_columns(df, complete=True)
+    assert classes['orderNumber']['Format'] == 'Identifier (integer)'
+    assert classes['paid']['Format'] == 'Numeric (integer)'
+
+
+def test_non_nullable_is_exact_only_for_complete_samples():
+    df = pd.DataFrame({'amount': [1.5, 2.5, 3.5], 'note': ['a@b.io', None, 'c@d.io']})
+    complete = classify_columns(df, complete=True)
+    assert complete['amount'] == {'Format': 'Numeric (decimal)', 'Nullable': False}
+    assert complete['note']['Nullable'] is True
+
+    sampled = classify_columns(df)
+    assert sampled['amount']['Nullable'] is False
+    assert sampled['amount']['Nullable Basis'] == 'no nulls in the first 3 rows'
+    assert 'Nullable Basis' not in sampled['note']
+
+
+def test_nulls_past_the_format_rows_still_count():
+    amounts = [1.5] * (CLASSIFIER_ROWS * 3)
+    amounts[CLASSIFIER_ROWS] = None
+    classes = classify_columns(pd.DataFrame({'amount': amounts}))
+    assert classes['amount'] == {'Format': 'Numeric (decimal)', 'Nullable': True}
+
+
+@pytest.mark.parametrize('values', [
+    ['+1 555 123 4567', '+44 20 7946 0958'],
+    ['(555) 123-4567', '555-123-4567', '555.123.4567', '020 7946 0958'],
+])
+def test_phone_numbers(values):
+    assert classify_column('contact', pd.Series(values, dtype=object))['Format'] == 'Text (phone number)'
+
+
+@pytest.mark.parametrize('values', [
+    ['31.12.2020', '01.01.2021'],
+    ['2020.12.31', '2021.01.01'],
+    ['192.168.100.200', '10.0.0.1'],
+])
+def test_dotted_dates_and_ip_addresses_are_not_phone_numbers(values):
+    classified = classify_column('value', pd.Series(values, dtype=object))
+    assert classified is None or classified['Format'] != 'Text (phone number)'
+
+
+def test_zero_padded_codes_are_not_integers():
+    classified = classify_column('zip', pd.Series(['02134', '000123', '12345'], dtype=object))
+    assert classified['Format'] == 'Identifier (zero-padded digits, keep as text)'
+    assert classify_column('count', pd.Series(['0', '10', '12345'], dtype=object))['Format'] == 'Numeric (integer)'
@@ -0,0 +1,9 @@
+from utils.dataset_stream import sample_columns
+
+
+def test_jsonl_keys_missing_from_later_records(tmp_path):
+    path = tmp_path / 'records.jsonl'
+    path.write_text('{"a": 1, "b": null}\n{"a": 2}\n{"a": 3, "c": "x"}\n')
+
+    samples = sample_columns(path, n_samples=2, chunksize=1)
+    assert samples == {'a': ['1', '2'], 'b': [None, None], 'c': ['x', None]}
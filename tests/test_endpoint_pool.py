@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+from autogen_core.models import UserMessage
+
+from benchmarks.mock_server import MockModelServer
+from utils.endpoint_pool import EndpointPool
+
+MODEL_INFO = {"vision": False, "function_calling": False, "json_output": True, "family": "unknown"}
+MESSAGES = [UserMessage(content="Hello", source="user")]
+
+
+def make_pool(*servers, health_interval=0, api_key="none"):
+    return EndpointPool.from_urls([server.base_url for server in servers], health_interval=health_interval, model="mock",
+                                  api_key=api_key, model_info=MODEL_INFO, max_retries=0)
+
+
+def test_failover_to_healthy_endpoint():
+    with MockModelServer(fail_status=503) as bad, MockModelServer() as good:
+        pool = make_pool(bad, good, health_interval=3600)
+        bad_endpoint, good_endpoint = pool.endpoints
+
+        async def run():
+            with pytest.raises(Exception):
+                await pool.create(MESSAGES)
+            assert not bad_endpoint.healthy
+            await pool.create(MESSAGES)
+            await pool.create(MESSAGES)
+            await pool.aclose()
+
+        asyncio.run(run())
+        assert bad_endpoint.requests == 1 and bad_endpoint.errors == 1
+        assert good_endpoint.requests == 2 and good_endpoint.errors == 0
+
+
+def test_failures_keep_endpoint_without_probing():
+    with MockModelServer(fail_status=503) as server:
+        pool = make_pool(server)
+
+        async def run():
+            with pytest.raises(Exception):
+                await pool.create(MESSAGES)
+
+        asyncio.run(run())
+        # Nothing would ever bring it back
+        assert pool.endpoints[0].healthy
+
+
+def test_health_probe_sends_api_key():
+    with MockModelServer(api_key="secret") as server:
+        pool = make_pool(server, api_key="secret")
+        asyncio.run(pool.check_health())
+        assert pool.endpoints[0].healthy
+
+        wrong_key = make_pool(server, api_key="wrong")
+        asyncio.run(wrong_key.check_health())
+        assert not wrong_key.endpoints[0].healthy
+
+
+@pytest.mark.parametrize('status', [401, 404, 503])
+def test_health_probe_needs_2xx(status):
+    with MockModelServer(fail_status=status) as server:
+        pool = make_pool(server)
+        endpoint = pool.endpoints[0]
+
+        asyncio.run(pool.check_health())
+        assert not endpoint.healthy
+
+        server.fail_status = None
+        asyncio.run(pool.check_health())
+        assert endpoint.healthy
+
+
+def test_busy_seconds_counts_overlapping_requests_once():
+    with MockModelServer(latency=0.3) as server:
+        pool = make_pool(server)
+
+        async def run():
+            await asyncio.gather(*(pool.create(MESSAGES) for _ in range(4)))
+
+        asyncio.run(run())
+        busy_seconds = pool.endpoints[0].busy_seconds
+        assert 0.3 <= busy_seconds < 0.6
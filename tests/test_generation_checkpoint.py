@@ -0,0 +1,41 @@
+from utils.generation_checkpoint import GenerationCheckpoint, input_key
+
+
+def test_entries_are_kept_but_only_served_with_resume(tmp_path):
+    path = tmp_path / 'checkpoint.jsonl'
+    GenerationCheckpoint(path).add('a', 'a.csv', {'filename': 'a.csv'})
+
+    fresh = GenerationCheckpoint(path)
+    assert fresh.get('a') is None
+    fresh.add('b', 'b.csv', {'filename': 'b.csv'})
+    # Written by this run: not served, even with resume
+    assert fresh.get('b') is None
+
+    resumed = GenerationCheckpoint(path, resume=True)
+    assert resumed.get('a') == {'filename': 'a.csv'}
+    assert resumed.get('b') == {'filename': 'b.csv'}
+
+
+def test_torn_line_is_dropped(tmp_path):
+    path = tmp_path / 'checkpoint.jsonl'
+    GenerationCheckpoint(path).add('a', 'a.csv', {'filename': 'a.csv'})
+    with open(path, 'a') as f:
+        f.write('{"key": "b", "filen')
+
+    checkpoint = GenerationCheckpoint(path)
+    checkpoint.add('c', 'c.csv', {'filename': 'c.csv'})
+    assert set(GenerationCheckpoint(path, resume=True)._entries) == {'a', 'c'}
+
+
+def test_compaction_keeps_the_newest_entries(tmp_path):
+    path = tmp_path / 'checkpoint.jsonl'
+    checkpoint = GenerationCheckpoint(path, max_entries=2)
+    for key in 'abcde':
+        checkpoint.add(key, f'{key}.csv', {'filename': f'{key}.csv'})
+    assert sum(1 for _ in open(path)) <= 4
+    assert list(GenerationCheckpoint(path, resume=True, max_entries=2)._entries) == ['d', 'e']
+
+
+def test_key_covers_prompt_options():
+    base = input_key('a.csv', {'x': [1]}, {'temperature': 0}, {'metadata_format': 'repr'})
+    assert base != input_key('a.csv', {'x': [1]}, {'temperature': 0}, {'metadata_format': 'json'})
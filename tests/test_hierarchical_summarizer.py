@@ -0,0 +1,27 @@
+import asyncio
+
+from utils import hierarchical_summarizer
+from utils.hierarchical_summarizer import StreamingSummarizer
+
+
+def test_streaming_groups_follow_discovery_order(monkeypatch):
+    async def summarize_group(client, scheduler, metrics, name, data_dicts):
+        return [data_dict['filename'] for data_dict in data_dicts]
+
+    async def merge_partials(client, scheduler, metrics, partials, data_dicts, token_budget):
+        return partials
+
+    monkeypatch.setattr(hierarchical_summarizer, '_summarize_group', summarize_group)
+    monkeypatch.setattr(hierarchical_summarizer, '_merge_partials', merge_partials)
+    data_dicts = [{'filename': f'table{index}.csv', 'columns': [{'Column': 'amount'}]} for index in range(5)]
+
+    async def run(arrival_order):
+        summarizer = StreamingSummarizer(None, token_budget=40)
+        for index in arrival_order:
+            # Index 2 had nothing to summarize (skipped, invalid or a schema duplicate)
+            summarizer.add(index, None if index == 2 else data_dicts[index])
+        return await summarizer.finish([])
+
+    expected = asyncio.run(run([0, 1, 2, 3, 4]))
+    assert expected == asyncio.run(run([4, 2, 0, 3, 1]))
+    assert [name for group in expected for name in group] == ['table0.csv', 'table1.csv', 'table3.csv', 'table4.csv']
@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.profile_engine import profile_dataframe, profile_dataframe_loop
+
+FRAMES = {
+    'empty': pd.DataFrame({'number': pd.Series([], dtype='float64'), 'text': pd.Series([], dtype=object)}),
+    'category': pd.DataFrame({'status': pd.Categorical(['open', 'NULL', None, 'open'])}),
+    'all_nan': pd.DataFrame({'number': [np.nan, np.nan], 'text': [None, None]}),
+    'mixed': pd.DataFrame({'id': [1, 2, 3], 'amount': [1.5, None, 2.25], 'name': ['a', 'null', None]}),
+}
+
+
+@pytest.mark.parametrize('name', FRAMES)
+def test_matches_loop_profiler(name):
+    df = FRAMES[name]
+    assert profile_dataframe(df) == profile_dataframe_loop(df)
+
+
+def test_bool_stats_are_computed_as_floats():
+    # The loop profiler can't round numpy bools, compare with the same values as 0/1
+    df = pd.DataFrame({'flag': [True, False, True]})
+    profile = profile_dataframe(df)['flag']
+    expected = profile_dataframe_loop(df.astype('float64'))['flag']
+    assert profile['dtype'] == 'bool'
+    assert profile['sample'] == 'True'
+    for key in ('total_count', 'null_count', 'null_percentage', 'unique_count', 'mean', 'median', 'std', 'min', 'max'):
+        assert profile[key] == expected[key]
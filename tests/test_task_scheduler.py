@@ -0,0 +1,56 @@
+import asyncio
+
+from utils.task_scheduler import BoundedScheduler
+
+
+def test_backoff_releases_the_slot():
+    scheduler = BoundedScheduler(max_in_flight=1, max_retries=1, base_delay=0.5)
+    finished = []
+    attempts = {'flaky': 0}
+
+    async def flaky():
+        attempts['flaky'] += 1
+        if attempts['flaky'] == 1:
+            raise asyncio.TimeoutError()
+        finished.append('flaky')
+        return 'flaky'
+
+    async def quick():
+        finished.append('quick')
+        return 'quick'
+
+    results = asyncio.run(scheduler.run([flaky, quick], labels=['flaky', 'quick']))
+    assert results == ['flaky', 'quick']
+    # quick ran while flaky was backing off instead of waiting behind it
+    assert finished == ['quick', 'flaky']
+    assert [m['attempts'] for m in scheduler.metrics if m['label'] == 'flaky'] == [2]
+
+
+def test_priorities_set_start_order():
+    scheduler = BoundedScheduler(max_in_flight=1)
+    started = []
+
+    def job(name):
+        async def run():
+            started.append(name)
+        return run
+
+    asyncio.run(scheduler.run([job('low'), job('high'), job('mid')], priorities=[0, 2, 1]))
+    assert started == ['high', 'mid', 'low']
+
+
+def test_runs_keep_their_own_metrics():
+    scheduler = BoundedScheduler(max_in_flight=2)
+    first, second = [], []
+
+    async def job():
+        return None
+
+    async def run():
+        await asyncio.gather(scheduler.run([job, job], metrics=first),
+                             scheduler.submit(job, label='other', metrics=second))
+
+    asyncio.run(run())
+    assert len(first) == 2 and [m['label'] for m in second] == ['other']
+    assert scheduler.metrics == []
+    assert scheduler.report(second).startswith("1 tasks")
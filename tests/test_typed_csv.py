@@ -0,0 +1,23 @@
+import pandas as pd
+
+from utils.typed_csv import read_csv_typed
+
+
+def test_floats_past_the_sample_keep_full_precision(tmp_path):
+    path = tmp_path / 'values.csv'
+    path.write_text('value\n' + '0.5\n' * 50 + '123456.789\n')
+
+    df, report = read_csv_typed(path, sample_rows=50)
+    assert df['value'].iloc[-1] == 123456.789
+    assert report['fallbacks'] == []
+
+
+def test_text_past_the_sample_goes_straight_to_string(tmp_path):
+    path = tmp_path / 'codes.csv'
+    path.write_text('code,count\n' + '1,2\n' * 50 + 'x,300\n')
+
+    df, report = read_csv_typed(path, sample_rows=50)
+    assert df['code'].iloc[-1] == 'x' and df['count'].iloc[-1] == 300
+    assert isinstance(df['code'].dtype, pd.ArrowDtype) and df['code'].dtype.pyarrow_dtype == 'string'
+    # One extra read per column: int8 -> string and int8 -> int64
+    assert [column for column, _ in report['fallbacks']] == ['code', 'count']
@@ -3,4 +3,28 @@ from .data_catalog import get_dataset_profile, convert_to_standard_types, get_co
 from .spinner import Spinner
 from ._fix_file_name import _fix_file_name
 from .initialize_individual_chat import initialize_individual_chat
-from .jsonify_prompt import jsonify_prompt
\ No newline at end of file
+from .jsonify_prompt import jsonify_prompt, write_generation_log
+from .ingestion_executor import IngestionExecutor, configure_executor, get_executor
+from .profile_cache import ProfileCache, configure_cache, get_cache
+from .client_wrapper import ChatCompletionClientWrapper
+from .llm_cache import LLMResponseCache, CachedChatCompletionClient, is_json_result
+from .task_scheduler import BoundedScheduler
+from .endpoint_pool import Endpoint, EndpointPool
+from .token_counter import count_tokens
+from .batch_packer import pack_small_files
+from .initialize_batched_chat import initialize_batched_chat
+from .hierarchical_summarizer import summarize_hierarchical, needs_hierarchical_summary, group_tables, StreamingSummarizer
+from .cassette import Cassette, CassetteChatCompletionClient, CassetteMissError
+from .telemetry import TracedChatCompletionClient, configure_telemetry, shutdown_telemetry, stage_span, metrics, serve_metrics
+from .generation_checkpoint import GenerationCheckpoint, input_key
+from .schema_fingerprint import schema_fingerprint, group_by_fingerprint, fan_out_data_dict, summarizer_view
+from .column_classifier import classify_columns
+from .initialize_classified_chat import initialize_classified_chat
+from .metadata_serializer import serialize_metadata, configure_serializer, get_serializer_format, measure_serializers, register_serializer
+from .prompt_layout import configure_prompt_layout, get_prompt_layout
+from .model_warmup import warm_up_models
+from .job_server import JobServer
+from .archive_source import expand_archives, list_archive_members, open_dataset, source_size
+from .dataset_discovery import DatasetDiscovery, hive_partitions, with_partition_columns, partitioned_fingerprint, skipped_report
+from .excel_source import configure_excel, list_sheets, expand_workbooks
+from .typed_csv import read_csv_typed, infer_csv_dtypes, format_memory_report
@@ -1,8 +1,9 @@
+import re
+
+
 async def _fix_file_name(filename):
     # Turn file name into Python identifier
-    # Since Python identifier can't contain '.', we replace it with _
-    last_5_chars = list(filename)[-5:]
-    replace_dot = [char.replace('.', '_') for char in last_5_chars]
-    all_chars_before_last_5 = list(filename)[:-5]
-    all_chars_before_last_5.extend(replace_dot)
-    return ''.join(all_chars_before_last_5)
\ No newline at end of file
+    # Python identifiers can't contain '.', '-', spaces etc., so every such character is replaced with _
+    # (longer extensions such as .parquet or .jsonl need more than the last few characters fixed)
+    fixed = re.sub(r'\W', '_', filename)
+    return fixed if fixed.isidentifier() else f"_{fixed}"
@@ -0,0 +1,148 @@
+from pathlib import Path
+from typing import Any, Dict, Union
+
+import numpy as np
+import pandas as pd
+
+from .dataset_stream import iter_dataset_chunks
+from .profile_engine import NULL_VARIANTS, _json_sample
+from .sketches import HyperLogLog, RunningMoments, TDigest
+
+# Bigger chunks amortise per-chunk overhead, memory stays bounded by one chunk plus sketches
+APPROX_CHUNKSIZE = 100_000
+
+
+class _ColumnState:
+    """Sketches and counters for one column while streaming."""
+
+    def __init__(self, hll_precision: int, tdigest_compression: int):
+        self.dtypes = []
+        self.all_null_dtypes = []
+        self.sample = None
+        self.has_sample = False
+        self.null_count = 0
+        self.null_like_count = 0
+        self.non_numeric = False
+        self.distinct = HyperLogLog(hll_precision)
+        self.moments = RunningMoments()
+        self.quantiles = TDigest(tdigest_compression)
+
+    def update(self, series: pd.Series):
+        non_null = series.dropna()
+
+        # An all-null chunk says nothing about the column's type
+        seen = self.dtypes if not non_null.empty else self.all_null_dtypes
+        if series.dtype not in seen:
+            seen.append(series.dtype)
+
+        self.null_count += len(series) - len(non_null)
+        if not self.has_sample and not non_null.empty:
+            self.sample = non_null.iloc[0]
+            self.has_sample = True
+
+        self.distinct.update(non_null)
+
+        if series.dtype == 'object':
+            self.null_like_count += int(series.isin(NULL_VARIANTS).sum())
+
+        if pd.api.types.is_numeric_dtype(series.dtype):
+            numeric = non_null.astype('float64') if pd.api.types.is_bool_dtype(series.dtype) else non_null
+            self.moments.update(numeric)
+            self.quantiles.update(numeric.to_numpy(dtype='float64'))
+        elif not non_null.empty:
+            # One text chunk turns the whole column into object, as a full read would
+            self.non_numeric = True
+
+    def is_numeric(self) -> bool:
+        return not self.non_numeric and any(pd.api.types.is_numeric_dtype(d) for d in (self.dtypes or self.all_null_dtypes))
+
+    def final_dtype(self) -> str:
+        dtypes = self.dtypes or self.all_null_dtypes
+        if len(dtypes) == 1:
+            return str(dtypes[0])
+        if all(pd.api.types.is_numeric_dtype(d) and not pd.api.types.is_extension_array_dtype(d) for d in dtypes):
+            return str(np.result_type(*dtypes))
+        return 'object'
+
+
+def profile_dataset_approx(file_path: Union[str, Path],
+                           chunksize: int = APPROX_CHUNKSIZE,
+                           hll_precision: int = 14,
+                           tdigest_compression: int = 200) -> Dict[str, Any]:
+    """
+    Profile a dataset chunk by chunk in constant memory using sketches.
+
+    `unique_count` comes from HyperLogLog and `median` from a t-digest; counts, mean,
+    std (Welford), min and max are exact. Every column gets an `accuracy` entry that
+    flags each stat as exact or approximate with its error bound.
+
+    Args:
+        file_path (str or Path): Path to the dataset file.
+        chunksize (int): Rows per chunk for row-oriented formats.
+        hll_precision (int): HyperLogLog precision, 2**p registers per column.
+        tdigest_compression (int): t-digest compression, higher is more accurate.
+
+    Returns:
+        Dict[str, Any]: Per-column profile with the same keys as the exact profiler,
+                        plus `accuracy`.
+    """
+    states: Dict[str, _ColumnState] = {}
+    total = 0
+
+    for chunk in iter_dataset_chunks(file_path, chunksize=chunksize):
+        total += len(chunk)
+        for col in chunk.columns:
+            if col not in states:
+                states[col] = _ColumnState(hll_precision, tdigest_compression)
+            states[col].update(chunk[col])
+
+    profile = {}
+    for col, state in states.items():
+        dtype = state.final_dtype()
+        distinct_error = state.distinct.relative_error
+        col_stats = {
+            'dtype': dtype,
+            'sample': _json_sample(state.sample),
+            'total_count': int(total),
+            'null_count': int(state.null_count),
+            'null_percentage': f"{(state.null_count / total) * 100:.1f}%" if total else "nan%",
+            'unique_count': state.distinct.count()
+        }
+        accuracy = {
+            'total_count': {'exact': True, 'error_bound': None},
+            'null_count': {'exact': True, 'error_bound': None},
+            'unique_count': {
+                'exact': False,
+                'error_bound': f"±{distinct_error * 100:.2f}% relative (1 std. error, HyperLogLog p={hll_precision})"
+            },
+        }
+
+        if state.is_numeric():
+            moments = state.moments
+            has_values = moments.count > 0
+            col_stats.update({
+                'mean': round(moments.mean, 2) if has_values else None,
+                'median': round(state.quantiles.quantile(0.5), 2) if has_values else None,
+                'std': round(moments.std, 2) if has_values else None,
+                'min': round(moments.min, 2) if has_values else None,
+                'max': round(moments.max, 2) if has_values else None
+            })
+            accuracy.update({
+                'mean': {'exact': True, 'error_bound': None},
+                'median': {
+                    'exact': False,
+                    'error_bound': f"±{state.quantiles.rank_error * 100:.2f}% of rank (t-digest, compression={tdigest_compression})"
+                },
+                'std': {'exact': True, 'error_bound': None},
+                'min': {'exact': True, 'error_bound': None},
+                'max': {'exact': True, 'error_bound': None},
+            })
+
+        if dtype == 'object' and state.null_like_count > 0:
+            col_stats['alternative_null_count'] = int(state.null_like_count)
+            accuracy['alternative_null_count'] = {'exact': True, 'error_bound': None}
+
+        col_stats['accuracy'] = accuracy
+        profile[col] = col_stats
+
+    return profile
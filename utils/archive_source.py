@@ -0,0 +1,185 @@
+import bz2
+import contextlib
+import gzip
+import io
+import lzma
+import os
+import re
+import zipfile
+from pathlib import Path
+from typing import IO, Iterator, List, Optional, Tuple, Union
+
+# "<archive>::<member>" names a file inside an archive, e.g. sheets/mysql.zip::mysql/orders.csv
+ARCHIVE_SEPARATOR = "::"
+ARCHIVE_EXTENSIONS = {'.zip'}
+# Streaming decompressors per suffix; zstandard is optional
+COMPRESSION_EXTENSIONS = {'.gz', '.bz2', '.xz', '.zst'}
+# "<workbook>#<sheet>" names one sheet of a workbook, e.g. finance.xlsx#Q1 Budget (sheet names can't hold ':' or '/')
+SHEET_SEPARATOR = "#"
+_SHEET_NAME = re.compile(r'^(.*?\.xlsx?(?:\.(?:gz|bz2|xz|zst))?)#([^:/\\]*)$', re.IGNORECASE)
+
+
+def split_sheet(file_path: Union[str, Path]) -> Tuple[str, Optional[str]]:
+    """Split `workbook.xlsx#Sheet` into the workbook path and the sheet name (None when no sheet is named)."""
+    match = _SHEET_NAME.match(str(file_path))
+    if match is None:
+        return str(file_path), None
+    return match.group(1), match.group(2)
+
+
+def split_source(file_path: Union[str, Path]) -> Tuple[Path, Optional[str]]:
+    """Split `archive.zip::member` into the archive path and the member name (None for plain files)."""
+    file_path = split_sheet(file_path)[0]
+    if ARCHIVE_SEPARATOR in file_path:
+        archive, member = file_path.split(ARCHIVE_SEPARATOR, 1)
+        return Path(archive), member
+    return Path(file_path), None
+
+
+def dataset_suffix(file_path: Union[str, Path]) -> str:
+    """Extension of the data itself, e.g. '.csv' for `orders.csv.gz` or `extract.zip::orders.csv`."""
+    name = Path(split_sheet(file_path)[0].split(ARCHIVE_SEPARATOR)[-1])
+    suffix = name.suffix.lower()
+    if suffix in COMPRESSION_EXTENSIONS:
+        suffix = Path(name.stem).suffix.lower()
+    return suffix
+
+
+def is_archive(file_path: Union[str, Path]) -> bool:
+    return ARCHIVE_SEPARATOR not in str(file_path) and Path(file_path).suffix.lower() in ARCHIVE_EXTENSIONS
+
+
+def is_plain_file(file_path: Union[str, Path]) -> bool:
+    """True when the dataset can be handed to pandas/pyarrow as a path, without decompression."""
+    file_path = split_sheet(file_path)[0]
+    return ARCHIVE_SEPARATOR not in file_path and Path(file_path).suffix.lower() not in COMPRESSION_EXTENSIONS
+
+
+def source_exists(file_path: Union[str, Path]) -> bool:
+    archive, member = split_source(file_path)
+    if member is None:
+        return archive.is_file()
+    try:
+        with zipfile.ZipFile(archive) as zf:
+            zf.getinfo(member)
+        return True
+    except (OSError, KeyError, zipfile.BadZipFile):
+        return False
+
+
+def source_size(file_path: Union[str, Path]) -> int:
+    """Bytes of the source as stored: the compressed size for archive members and compressed files."""
+    archive, member = split_source(file_path)
+    if member is None:
+        return archive.stat().st_size
+    with zipfile.ZipFile(archive) as zf:
+        return zf.getinfo(member).compress_size
+
+
+def list_archive_members(archive_path: Union[str, Path], extensions: Optional[set] = None) -> List[str]:
+    """
+    Dataset members of a zip archive, as `archive::member` names relative to the archive's folder.
+
+    Directories, macOS resource forks (__MACOSX/, ._*) and members whose data
+    extension isn't in `extensions` are left out.
+    """
+    archive_path = Path(archive_path)
+    with zipfile.ZipFile(archive_path) as zf:
+        members = [info.filename for info in zf.infolist() if not info.is_dir()]
+    members = [member for member in members
+               if not member.startswith('__MACOSX/') and not Path(member).name.startswith('._')
+               and (extensions is None or dataset_suffix(member) in extensions)]
+    return [f"{archive_path.name}{ARCHIVE_SEPARATOR}{member}" for member in members]
+
+
+def _decompress(stream: IO[bytes], suffix: str) -> IO[bytes]:
+    if suffix == '.gz':
+        return gzip.GzipFile(fileobj=stream)
+    if suffix == '.bz2':
+        return bz2.BZ2File(stream)
+    if suffix == '.xz':
+        return lzma.LZMAFile(stream)
+    if suffix == '.zst':
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ValueError("Reading .zst files requires the zstandard package (pip install zstandard)") from e
+        return zstandard.ZstdDecompressor().stream_reader(stream, closefd=True)
+    return stream
+
+
+@contextlib.contextmanager
+def open_dataset(file_path: Union[str, Path], seekable: bool = False) -> Iterator[Union[str, IO[bytes]]]:
+    """
+    Open a dataset for pandas/pyarrow, decompressing on the fly.
+
+    Plain files are yielded as their path so readers keep their own fast paths
+    (memory mapping, native file handles). Archive members and compressed files are
+    yielded as a binary stream decompressed while it is read; nothing is extracted
+    to disk.
+
+    Args:
+        file_path: Plain path, compressed file or `archive.zip::member` (a `#Sheet` suffix is ignored)
+        seekable: The reader needs random access (Parquet footer, Excel); streams that
+                  can't seek are read into memory first
+
+    Yields:
+        The path itself, or a binary file object.
+    """
+    if is_plain_file(file_path):
+        yield split_sheet(file_path)[0]
+        return
+
+    archive, member = split_source(file_path)
+    with contextlib.ExitStack() as stack:
+        if member is None:
+            stream = stack.enter_context(open(archive, 'rb'))
+            name = archive.name
+        else:
+            zf = stack.enter_context(zipfile.ZipFile(archive))
+            stream = stack.enter_context(zf.open(member))
+            name = member
+        suffix = Path(name).suffix.lower()
+        if suffix in COMPRESSION_EXTENSIONS:
+            stream = stack.enter_context(_decompress(stream, suffix))
+        if seekable and not (hasattr(stream, 'seekable') and stream.seekable()):
+            stream = io.BytesIO(stream.read())
+        yield stream
+
+
+def read_first_line(file_path: Union[str, Path], max_lines: int = 1000) -> Optional[str]:
+    """First non-empty line of a text dataset, read through any decompression."""
+    with open_dataset(file_path) as source:
+        stream = open(source, 'rb') if isinstance(source, str) else contextlib.nullcontext(source)
+        with stream as f:
+            for _, line in zip(range(max_lines), f):
+                line = line.decode('utf-8', errors='replace').strip()
+                if line:
+                    return line
+    return None
+
+
+def source_identity(file_path: Union[str, Path]) -> Tuple[Path, dict]:
+    """File on disk holding the dataset and the member-level details that tell its versions apart."""
+    archive, member = split_source(file_path)
+    sheet = split_sheet(file_path)[1]
+    details = {'sheet': sheet} if sheet is not None else {}
+    if member is None:
+        return archive, details
+    with zipfile.ZipFile(archive) as zf:
+        info = zf.getinfo(member)
+    return archive, {'member': member, 'crc': info.CRC, 'member_size': info.file_size, **details}
+
+
+def expand_archives(root: Union[str, Path], files: List[str], extensions: Optional[set] = None) -> List[str]:
+    """Replace every zip archive in a directory listing with its dataset members."""
+    expanded = []
+    for file in files:
+        if is_archive(file) and os.path.isfile(os.path.join(root, file)):
+            try:
+                expanded.extend(list_archive_members(os.path.join(root, file), extensions))
+            except zipfile.BadZipFile:
+                print(f"Skipping {file}: not a valid zip archive")
+        else:
+            expanded.append(file)
+    return expanded
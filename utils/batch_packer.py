@@ -0,0 +1,58 @@
+from typing import Any, List, Sequence, Tuple
+
+from .metadata_serializer import serialize_metadata
+from .token_counter import count_tokens
+
+# Rough completion cost of one column entry in the generated dictionary
+COMPLETION_TOKENS_PER_COLUMN = 60
+
+
+def metadata_tokens(filename: str, metadata: Any) -> int:
+    """Tokens one file's metadata block adds to a generator prompt."""
+    return count_tokens(f"{filename}: {serialize_metadata(metadata)}")
+
+
+def pack_small_files(results: Sequence[Tuple[str, Any]], token_budget: int = 3000, small_file_tokens: int = 500,
+                     completion_budget: int = 2048) -> List[List[int]]:
+    """
+    Group small files so several of them share one generator request.
+
+    Files whose metadata is over `small_file_tokens` get a request of their own. Small
+    files are packed first-fit decreasing so each group's metadata stays under
+    `token_budget` and its expected answer under `completion_budget`.
+
+    Args:
+        results: (filename, metadata) pairs as passed to `main`
+        token_budget: Max metadata tokens in one packed request
+        small_file_tokens: Files above this many tokens are never packed
+        completion_budget: Max expected completion tokens of one packed request (the client's max_tokens)
+
+    Returns:
+        List[List[int]]: Groups of indices into `results`; every index appears exactly once.
+    """
+    groups: List[List[int]] = []
+    small: List[Tuple[int, int, int]] = []
+
+    for index, (filename, metadata) in enumerate(results):
+        tokens = metadata_tokens(filename, metadata)
+        columns = len(metadata) if hasattr(metadata, '__len__') else 1
+        if tokens > small_file_tokens:
+            groups.append([index])
+        else:
+            small.append((tokens, columns, index))
+
+    # Bins as [metadata tokens, expected completion tokens, indices]
+    bins: List[list] = []
+    for tokens, columns, index in sorted(small, reverse=True):
+        completion = columns * COMPLETION_TOKENS_PER_COLUMN
+        for packed in bins:
+            if packed[0] + tokens <= token_budget and packed[1] + completion <= completion_budget:
+                packed[0] += tokens
+                packed[1] += completion
+                packed[2].append(index)
+                break
+        else:
+            bins.append([tokens, completion, [index]])
+
+    groups.extend(sorted(packed[2]) for packed in bins)
+    return groups
@@ -0,0 +1,169 @@
+import asyncio
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Any, AsyncGenerator, Deque, Dict, Mapping, Optional, Sequence, Union
+
+from autogen_core import CancellationToken
+from autogen_core.models import ChatCompletionClient, CreateResult, LLMMessage
+from autogen_core.tools import Tool, ToolSchema
+
+from .client_wrapper import ChatCompletionClientWrapper, request_key, sampling_config
+
+REPLAY_LATENCIES = ('original', 'zero')
+
+
+class CassetteMissError(LookupError):
+    """Raised in replay mode when a request was never recorded."""
+
+
+class Cassette:
+    """
+    JSON Lines file of recorded model calls.
+
+    Every line holds the request key, the model, the messages sent, the CreateResult
+    returned and the seconds the call took. In record mode the file is truncated on
+    open and every call is appended as soon as it completes, so an interrupted run
+    still leaves a usable cassette. In replay mode identical requests are served in
+    the order they were recorded.
+    """
+
+    def __init__(self, path: Union[str, Path], mode: str = 'replay'):
+        """
+        Args:
+            path: Cassette file
+            mode: 'record' to capture calls, 'replay' to serve them back
+
+        Raises:
+            ValueError: If `mode` is unknown
+            FileNotFoundError: If replaying a cassette that doesn't exist
+        """
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"Unknown cassette mode {mode!r}; expected 'record' or 'replay'")
+        self.path = Path(path)
+        self.mode = mode
+        self.recorded = 0
+        self.replayed = 0
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Deque[Dict[str, Any]]] = defaultdict(deque)
+
+        if mode == 'record':
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, 'w', encoding='utf-8')
+        else:
+            self._file = None
+            with open(self.path, encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._entries[entry['key']].append(entry)
+
+    def record(self, key: str, model: str, messages: Sequence[LLMMessage], result: CreateResult, latency: float):
+        entry = {
+            'key': key,
+            'model': model,
+            'messages': [message.model_dump() for message in messages],
+            'response': result.model_dump(mode='json'),
+            'latency': latency,
+            'recorded_at': time.time(),
+        }
+        with self._lock:
+            self._file.write(json.dumps(entry) + '\n')
+            self._file.flush()
+            self.recorded += 1
+
+    def play(self, key: str) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                raise CassetteMissError(f"No recorded response for request {key[:12]} in {self.path}; record the cassette again")
+            # Keep the last answer around so extra identical calls still replay
+            entry = entries.popleft() if len(entries) > 1 else entries[0]
+            self.replayed += 1
+            return entry
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'recorded': self.recorded, 'replayed': self.replayed,
+                    'entries': sum(len(entries) for entries in self._entries.values()) if self.mode == 'replay' else self.recorded}
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class CassetteChatCompletionClient(ChatCompletionClientWrapper):
+    """
+    Record model calls to a `Cassette`, or answer them from one without touching the model.
+
+    Requests are matched on the same key as `CachedChatCompletionClient` (model,
+    sampling parameters, messages, tools, overrides). In replay mode the wrapped
+    client is never called; it only supplies the model name and config for the key.
+    """
+
+    def __init__(self, client: ChatCompletionClient, cassette: Cassette, replay_latency: str = 'original'):
+        """
+        Args:
+            client: Client to record (or whose config to match when replaying)
+            cassette: Cassette to record to or replay from
+            replay_latency: 'original' sleeps as long as the recorded call took, 'zero' answers at once
+
+        Raises:
+            ValueError: If `replay_latency` is unknown
+        """
+        if replay_latency not in REPLAY_LATENCIES:
+            raise ValueError(f"Unknown replay latency {replay_latency!r}; expected one of {REPLAY_LATENCIES}")
+        super().__init__(client)
+        self.cassette = cassette
+        self.replay_latency = replay_latency
+        self._sampling_config = sampling_config(client)
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        json_output: Optional[bool] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        key = request_key(self._sampling_config, messages, tools, json_output, extra_create_args)
+
+        if self.cassette.mode == 'replay':
+            entry = self.cassette.play(key)
+            if self.replay_latency == 'original':
+                await asyncio.sleep(entry['latency'])
+            return CreateResult.model_validate(entry['response'])
+
+        started_at = time.perf_counter()
+        result = await self.client.create(
+            messages,
+            tools=tools,
+            json_output=json_output,
+            extra_create_args=extra_create_args,
+            cancellation_token=cancellation_token,
+        )
+        self.cassette.record(key, self._sampling_config.get('model', ''), messages, result, time.perf_counter() - started_at)
+        return result
+
+    async def create_stream(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        json_output: Optional[bool] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        # Recorded as a single non-streamed result so record and replay see the same calls
+        yield await self.create(
+            messages,
+            tools=tools,
+            json_output=json_output,
+            extra_create_args=extra_create_args,
+            cancellation_token=cancellation_token,
+        )
@@ -0,0 +1,111 @@
+import hashlib
+import json
+import warnings
+from typing import Any, AsyncGenerator, Mapping, Optional, Sequence, Union
+
+from autogen_core import CancellationToken
+from autogen_core.models import (
+    ChatCompletionClient,
+    CreateResult,
+    LLMMessage,
+    ModelCapabilities,  # type: ignore
+    ModelInfo,
+    RequestUsage,
+)
+from autogen_core.tools import Tool, ToolSchema
+
+# Connection details that don't change what the model answers
+_NON_SAMPLING_CONFIG = {'api_key', 'base_url', 'organization', 'timeout', 'max_retries', 'default_headers', 'model_info', 'model_capabilities'}
+
+
+def sampling_config(client: ChatCompletionClient) -> dict:
+    """Model name and sampling parameters of a client, without connection details."""
+    inner = client
+    while isinstance(inner, ChatCompletionClientWrapper):
+        inner = inner.client
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            config = dict(inner.dump_component().config)
+    except Exception:
+        config = {}
+    return {key: value for key, value in config.items() if key not in _NON_SAMPLING_CONFIG}
+
+
+def request_key(config: dict, messages: Sequence[LLMMessage], tools: Sequence[Tool | ToolSchema],
+                json_output: Optional[bool], extra_create_args: Mapping[str, Any]) -> str:
+    """Hash of everything that determines a model answer: client config, messages, tools and overrides."""
+    data = {
+        "client": config,
+        "messages": [message.model_dump() for message in messages],
+        "tools": [(tool.schema if isinstance(tool, Tool) else tool) for tool in tools],
+        "json_output": json_output,
+        "extra_create_args": dict(extra_create_args),
+    }
+    return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class ChatCompletionClientWrapper(ChatCompletionClient):
+    """
+    Base for clients that wrap another ChatCompletionClient.
+
+    Everything is forwarded to `client`; subclasses override `create` (and
+    `create_stream` if needed) to add behaviour such as caching or routing.
+    """
+
+    def __init__(self, client: ChatCompletionClient):
+        self.client = client
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        json_output: Optional[bool] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        return await self.client.create(
+            messages,
+            tools=tools,
+            json_output=json_output,
+            extra_create_args=extra_create_args,
+            cancellation_token=cancellation_token,
+        )
+
+    def create_stream(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        json_output: Optional[bool] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        return self.client.create_stream(
+            messages,
+            tools=tools,
+            json_output=json_output,
+            extra_create_args=extra_create_args,
+            cancellation_token=cancellation_token,
+        )
+
+    def actual_usage(self) -> RequestUsage:
+        return self.client.actual_usage()
+
+    def total_usage(self) -> RequestUsage:
+        return self.client.total_usage()
+
+    def count_tokens(self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []) -> int:
+        return self.client.count_tokens(messages, tools=tools)
+
+    def remaining_tokens(self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []) -> int:
+        return self.client.remaining_tokens(messages, tools=tools)
+
+    @property
+    def capabilities(self) -> ModelCapabilities:  # type: ignore
+        return self.client.capabilities
+
+    @property
+    def model_info(self) -> ModelInfo:
+        return self.client.model_info
@@ -0,0 +1,124 @@
+import re
+from typing import Any, Dict, Optional
+
+import pandas as pd
+
+# Key-like column names (id, customer_id, customerNumber, orderID, "Order No"), also used
+# by the hierarchical summarizer to cluster tables; the suffix has to be its own word or
+# camelCase part, so paid, valid, casino or zipcode don't count
+KEY_COLUMN = re.compile(r'(?:(?:^|[\W_])(?i:id|number|num|no|code|key)|(?<=[a-z0-9])(?:Id|ID|Number|NUMBER|Num|No|NO|Code|CODE|Key|KEY))$')
+_BOOLEAN_VALUES = {'true', 'false', 'yes', 'no', 'y', 'n', 't', 'f'}
+_INTEGER = r'^[+-]?\d+$'
+# Digit strings kept as text on purpose: ZIP codes, account numbers ('02134', '000123')
+_ZERO_PADDED = r'^0\d+$'
+_DECIMAL = r'^[+-]?(\d+\.\d*|\.\d+|\d+)([eE][+-]?\d+)?$'
+_DATE = r'^\d{4}-\d{2}-\d{2}$'
+_DATETIME = r'^\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}(:\d{2}(\.\d+)?)?(Z|[+-]\d{2}:?\d{2})?$'
+_EMAIL = r'^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}$'
+# A leading + or the usual grouping ((555) 123-4567, 555-123-4567, 020 7946 0958); the
+# middle group needs 3+ digits, so dotted dates (31.12.2020) and IPs (192.168.1.10) don't match
+_PHONE = r'^(?:\+\d[\d\s().-]{6,19}|\(\d{2,5}\)\s?\d{3,4}[\s.-]?\d{3,5}|\d{2,5}[\s.-]\d{3,4}[\s.-]\d{3,5})$'
+
+# A column is categorical when it has few distinct values relative to the rows seen
+MAX_CATEGORIES = 20
+MIN_ROWS_FOR_CATEGORICAL = 50
+# Rows of the first chunk the rules run on
+CLASSIFIER_ROWS = 1_000
+
+
+def _all_match(values: pd.Series, pattern: str) -> bool:
+    return bool(values.str.match(pattern).all())
+
+
+def classify_column(name: str, column: pd.Series) -> Optional[Dict[str, Any]]:
+    """
+    Detect the format of one column with vectorized rules.
+
+    Args:
+        name: Column name (used to tell integer identifiers from plain integers)
+        column: Values of the column, as read from the file
+
+    Returns:
+        Optional[Dict[str, Any]]: {"Format": ..., "Nullable": ...} when a rule matches
+                                  every non-null value, None when the column is ambiguous.
+    """
+    nullable = bool(column.isna().any())
+    non_null = column.dropna()
+    if non_null.empty:
+        return None
+
+    def result(column_format: str) -> Dict[str, Any]:
+        return {"Format": column_format, "Nullable": nullable}
+
+    if pd.api.types.is_bool_dtype(non_null):
+        return result("Boolean")
+    if pd.api.types.is_datetime64_any_dtype(non_null):
+        return result("Datetime")
+
+    # Integer columns read as float because of missing values
+    if pd.api.types.is_float_dtype(non_null) and (non_null % 1 == 0).all():
+        non_null = non_null.astype('int64')
+
+    values = non_null.astype(str).str.strip()
+    if (values == '').any():
+        return None
+    lowered = values.str.lower()
+
+    if lowered.isin(_BOOLEAN_VALUES).all():
+        return result(f"Boolean ({'/'.join(sorted(lowered.unique()))})")
+    # Only strings can carry leading zeros, numbers would lose them
+    if not pd.api.types.is_numeric_dtype(non_null) and _all_match(values, _INTEGER) and values.str.match(_ZERO_PADDED).any():
+        return result("Identifier (zero-padded digits, keep as text)")
+    if _all_match(values, _INTEGER):
+        if KEY_COLUMN.search(str(name)):
+            return result("Identifier (integer)")
+        return result("Numeric (integer)")
+    if _all_match(values, _DECIMAL):
+        return result("Numeric (decimal)")
+    if _all_match(values, _DATE):
+        return result("Datetime (YYYY-MM-DD)")
+    if _all_match(values, _DATETIME):
+        return result("Datetime (ISO 8601, YYYY-MM-DD HH:MM:SS)")
+    if _all_match(values, _EMAIL):
+        return result("Text (email address)")
+    if _all_match(values, _PHONE) and values.str.count(r'\d').ge(7).all():
+        return result("Text (phone number)")
+
+    distinct = values.nunique()
+    if len(values) >= MIN_ROWS_FOR_CATEGORICAL and distinct <= min(MAX_CATEGORIES, len(values) // 5):
+        return result(f"Categorical ({distinct} values)")
+    return None
+
+
+def classify_columns(df: pd.DataFrame, complete: bool = False) -> Dict[str, Dict[str, Any]]:
+    """
+    Classify every column of a sample of a dataset.
+
+    Formats are decided on the first `CLASSIFIER_ROWS` rows, Nullable on every row of
+    `df` (a null anywhere makes it True). A column without nulls is only known to be
+    non-nullable when `df` is the whole dataset; otherwise its class gets a
+    "Nullable Basis" saying how many rows that was decided on.
+
+    Args:
+        df: First rows of the dataset
+        complete: Whether `df` holds every row of the dataset
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Column names mapped to {"Format", "Nullable"} and, for
+                                   sample-based non-nullable columns, "Nullable Basis";
+                                   ambiguous columns are left out.
+    """
+    has_nulls = df.isna().any().to_numpy()
+    head = df.head(CLASSIFIER_ROWS)
+    classes = {}
+    for position, name in enumerate(df.columns):
+        column = head[name]
+        if isinstance(column, pd.DataFrame):  # Duplicate column names
+            continue
+        classified = classify_column(name, column)
+        if classified is not None:
+            classified["Nullable"] = bool(has_nulls[position])
+            if not classified["Nullable"] and not complete:
+                classified["Nullable Basis"] = f"no nulls in the first {len(df)} rows"
+            classes[str(name)] = classified
+    return classes
@@ -0,0 +1,238 @@
+import contextlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, Tuple, Union
+
+import pandas as pd
+
+from .archive_source import dataset_suffix, open_dataset
+from .profile_engine import NUMERIC_STATS, profile_dataframe
+
+ARROW_EXTENSIONS = {'.feather', '.arrow'}
+# Formats whose footer describes the file without decoding its rows
+COLUMNAR_EXTENSIONS = {'.parquet'} | ARROW_EXTENSIONS
+
+
+def is_columnar(file_path: Union[str, Path]) -> bool:
+    return dataset_suffix(file_path) in COLUMNAR_EXTENSIONS
+
+
+@contextlib.contextmanager
+def open_parquet(file_path: Union[str, Path]) -> Iterator[Any]:
+    """Open a Parquet file for footer and row group reads, memory-mapped when it is a plain file."""
+    import pyarrow.parquet as pq
+    with open_dataset(file_path, seekable=True) as source:
+        yield pq.ParquetFile(source, memory_map=isinstance(source, str))
+
+
+class _TableReader:
+    """Batch access to an Arrow table, for the files `pyarrow.ipc.open_file` can't open."""
+
+    def __init__(self, table):
+        self.schema = table.schema
+        self._batches = table.to_batches()
+        self.num_record_batches = len(self._batches)
+
+    def get_batch(self, index: int):
+        return self._batches[index]
+
+    def count_rows(self) -> int:
+        return sum(batch.num_rows for batch in self._batches)
+
+
+@contextlib.contextmanager
+def open_arrow(file_path: Union[str, Path]) -> Iterator[Any]:
+    """
+    Open a Feather/Arrow IPC file for random access to its record batches.
+
+    Plain files are memory-mapped, so uncompressed batches are used in place without
+    being copied. Feather v1 and Arrow stream-format files have no batch index and
+    are read as a whole.
+    """
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.ipc as ipc
+
+    with open_dataset(file_path, seekable=True) as source:
+        stream = pa.memory_map(source) if isinstance(source, str) else pa.PythonFile(source, mode='r')
+        try:
+            try:
+                reader = ipc.open_file(stream)
+            except pa.ArrowInvalid:
+                stream.seek(0)
+                try:
+                    reader = _TableReader(ipc.open_stream(stream).read_all())
+                except pa.ArrowInvalid:
+                    stream.seek(0)
+                    reader = _TableReader(feather.read_table(stream))
+            yield reader
+        finally:
+            stream.close()
+
+
+def read_columnar_header(file_path: Union[str, Path]) -> pd.DataFrame:
+    """Empty DataFrame with the columns of a Parquet or Arrow file, read from its schema."""
+    if dataset_suffix(file_path) == '.parquet':
+        with open_parquet(file_path) as parquet_file:
+            return parquet_file.schema_arrow.empty_table().to_pandas()
+    with open_arrow(file_path) as reader:
+        return reader.schema.empty_table().to_pandas()
+
+
+def iter_columnar_chunks(file_path: Union[str, Path], chunksize: int) -> Iterator[pd.DataFrame]:
+    """
+    Yield a Parquet or Arrow file `chunksize` rows at a time.
+
+    Parquet is decoded one row group at a time and converted to pandas in batches,
+    so stopping after the first chunk never decodes past the first row group.
+    """
+    if dataset_suffix(file_path) == '.parquet':
+        with open_parquet(file_path) as parquet_file:
+            for batch in parquet_file.iter_batches(batch_size=chunksize):
+                yield batch.to_pandas()
+        return
+
+    with open_arrow(file_path) as reader:
+        for index in range(reader.num_record_batches):
+            batch = reader.get_batch(index)
+            for offset in range(0, batch.num_rows, chunksize):
+                yield batch.slice(offset, chunksize).to_pandas()
+
+
+def read_columnar(file_path: Union[str, Path]) -> pd.DataFrame:
+    """Whole Parquet or Arrow file as a DataFrame, memory-mapped when it is a plain file."""
+    if dataset_suffix(file_path) == '.parquet':
+        with open_parquet(file_path) as parquet_file:
+            return parquet_file.read().to_pandas()
+    import pyarrow as pa
+    with open_arrow(file_path) as reader:
+        batches = [reader.get_batch(index) for index in range(reader.num_record_batches)]
+        return pa.Table.from_batches(batches, schema=reader.schema).to_pandas()
+
+
+def _merge_range(stats: Dict[str, Any], low: Any, high: Any):
+    if low is None or high is None:
+        return
+    stats['min'] = low if stats.get('min') is None else min(stats['min'], low)
+    stats['max'] = high if stats.get('max') is None else max(stats['max'], high)
+
+
+def _parquet_footer(parquet_file) -> Tuple[int, pd.DataFrame, Dict[str, Dict[str, Any]]]:
+    """Row count, first row group and the footer's null counts and ranges of a Parquet file."""
+    metadata = parquet_file.metadata
+    first = (parquet_file.read_row_group(0) if metadata.num_row_groups else parquet_file.schema_arrow.empty_table()).to_pandas()
+
+    # Only flat columns have one column chunk per row group holding their statistics
+    footer: Dict[str, Dict[str, Any]] = {}
+    missing = set()
+    for row_group in range(metadata.num_row_groups):
+        group = metadata.row_group(row_group)
+        for index in range(group.num_columns):
+            chunk = group.column(index)
+            column = chunk.path_in_schema
+            statistics = chunk.statistics
+            if column in missing:
+                continue
+            if statistics is None or not statistics.has_null_count:
+                missing.add(column)
+                footer.pop(column, None)
+                continue
+            stats = footer.setdefault(column, {'null_count': 0})
+            stats['null_count'] += statistics.null_count
+            if statistics.has_min_max:
+                _merge_range(stats, statistics.min, statistics.max)
+            elif statistics.null_count < group.num_rows:
+                # Values without a range, the footer can't tell min/max for this column
+                stats['no_range'] = True
+    return metadata.num_rows, first, footer
+
+
+def _arrow_footer(reader) -> Tuple[int, pd.DataFrame, Dict[str, Dict[str, Any]]]:
+    """Row count and first batch of an Arrow file; it has no statistics to offer beyond that."""
+    # Counted from the batch metadata, later batches are never decompressed
+    total = reader.count_rows()
+    first = reader.get_batch(0).to_pandas() if reader.num_record_batches else reader.schema.empty_table().to_pandas()
+    return total, first, {}
+
+
+def _empty_profile(first: pd.DataFrame) -> Dict[str, Any]:
+    """Profile of a file without rows, every stat of which is known exactly."""
+    exact = {'exact': True, 'error_bound': None}
+    profile = {}
+    for column, dtype in first.dtypes.items():
+        stats = {'dtype': str(dtype), 'sample': None, 'total_count': 0, 'null_count': 0, 'null_percentage': "nan%", 'unique_count': 0}
+        if pd.api.types.is_numeric_dtype(dtype):
+            stats.update({stat: None for stat in NUMERIC_STATS})
+        stats['accuracy'] = {key: exact for key in ('total_count', 'null_count', 'unique_count', *NUMERIC_STATS) if key in stats}
+        profile[column] = stats
+    return profile
+
+
+def _full_read_dtype(dtype, null_count: int) -> str:
+    """The dtype pandas ends up with once every row is read: ints and bools with nulls don't stay ints and bools."""
+    if null_count and pd.api.types.is_integer_dtype(dtype) and not pd.api.types.is_extension_array_dtype(dtype):
+        return 'float64'
+    if null_count and pd.api.types.is_bool_dtype(dtype) and not pd.api.types.is_extension_array_dtype(dtype):
+        return 'object'
+    return str(dtype)
+
+
+def profile_columnar(file_path: Union[str, Path]) -> Dict[str, Any]:
+    """
+    Profile a Parquet or Arrow file from its footer and first row group.
+
+    Row counts, null counts and numeric min/max come from the Parquet footer
+    statistics and are exact. Feather/Arrow files only record their row count, so
+    everything else comes from their first record batch, the rest of the file is
+    never decompressed. Samples,
+    unique counts, mean, median, std and alternative nulls come from the first row
+    group only; they are flagged as approximate in `accuracy` unless that row group
+    is the whole file. Columns without footer statistics get their counts from the
+    first row group too.
+
+    Args:
+        file_path (str or Path): Path to a .parquet, .feather or .arrow file.
+
+    Returns:
+        Dict[str, Any]: Per-column profile with the same keys as the exact profiler,
+                        plus `accuracy`.
+    """
+    if dataset_suffix(file_path) == '.parquet':
+        with open_parquet(file_path) as parquet_file:
+            total, first, footer = _parquet_footer(parquet_file)
+    else:
+        with open_arrow(file_path) as reader:
+            total, first, footer = _arrow_footer(reader)
+
+    if total == 0:
+        return _empty_profile(first)
+    profile = profile_dataframe(first)
+    whole_file = len(first) == total
+    sampled = {'exact': whole_file, 'error_bound': None if whole_file else f"first row group only ({len(first)} of {total} rows)"}
+    exact = {'exact': True, 'error_bound': None}
+
+    for column, stats in profile.items():
+        column_footer = footer.get(str(column))
+        accuracy = {'total_count': exact}
+        stats['total_count'] = int(total)
+        if column_footer is not None:
+            null_count = int(column_footer['null_count'])
+            stats['null_count'] = null_count
+            stats['null_percentage'] = f"{(null_count / total) * 100:.1f}%" if total else "nan%"
+            stats['dtype'] = _full_read_dtype(first[column].dtype, null_count)
+            accuracy['null_count'] = exact
+        else:
+            accuracy['null_count'] = sampled
+        accuracy['unique_count'] = sampled
+
+        if 'mean' in stats:
+            accuracy.update({stat: sampled for stat in NUMERIC_STATS})
+            if column_footer is not None and not column_footer.get('no_range') and column_footer.get('min') is not None:
+                for stat in ('min', 'max'):
+                    value = column_footer[stat]
+                    stats[stat] = round(float(value) if isinstance(value, bool) else value, 2)
+                    accuracy[stat] = exact
+        if 'alternative_null_count' in stats:
+            accuracy['alternative_null_count'] = sampled
+
+        stats['accuracy'] = accuracy
+    return profile
@@ -1,22 +1,51 @@
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from typing import Dict, Any, Union, List, Optional
-from tqdm import tqdm
+from typing import Dict, Any, Union, List, Optional, Tuple
 import json
 import asyncio
 
-class UnsupportedFileTypeError(Exception):
-    """Custom exception for unsupported file types"""
-    pass
+from .dataset_stream import UnsupportedFileTypeError, SUPPORTED_EXTENSIONS, DEFAULT_CHUNKSIZE, read_dataset_header, sample_columns
+from .archive_source import dataset_suffix, open_dataset, source_exists
+from .ingestion_executor import get_executor
+from .profile_engine import profile_dataframe
+from .approx_profile import profile_dataset_approx
+from .columnar_source import COLUMNAR_EXTENSIONS, is_columnar, profile_columnar, read_columnar
+from .excel_source import EXCEL_EXTENSIONS, read_excel
+from .profile_cache import get_cache
+from .telemetry import stage_span
+from .schema_fingerprint import schema_fingerprint
+from .typed_csv import CSV_DTYPE_MODES, format_memory_report, read_csv_typed
 
-async def _LoadDataset(file_path: Union[str, Path], read_header_only: bool = False) -> pd.DataFrame:
+async def _LoadDataset(file_path: Union[str, Path], read_header_only: bool = False, csv_dtypes: str = 'default') -> pd.DataFrame:
     """
     Load various tabular data formats into a pandas DataFrame.
+    The blocking read runs on the shared ingestion executor, not on the event loop.
     
     Args:
         file_path (str or Path): Path to the dataset file.
         read_header_only (bool): If True, only reads the header row (default: False)
+        csv_dtypes (str): 'typed' reads CSVs with compact Arrow-backed dtypes inferred from
+                          a sample and prints their memory before and after (default: 'default')
+    
+    Returns:
+        pd.DataFrame: Loaded DataFrame.
+        
+    Raises:
+        UnsupportedFileTypeError: If the file format is unsupported.
+        ValueError: If there are issues reading the file.
+    """
+    with stage_span("load_dataset", file=str(file_path), header_only=read_header_only):
+        return await get_executor().run(_load_dataset, file_path, read_header_only, csv_dtypes, file_path=file_path)
+
+def _load_dataset(file_path: Union[str, Path], read_header_only: bool = False, csv_dtypes: str = 'default') -> pd.DataFrame:
+    """
+    Blocking implementation of `_LoadDataset`, run inside an executor worker.
+    
+    Args:
+        file_path (str or Path): Path to the dataset file.
+        read_header_only (bool): If True, only reads the header row (default: False)
+        csv_dtypes (str): 'typed' reads CSVs with compact Arrow-backed dtypes (default: 'default')
     
     Returns:
         pd.DataFrame: Loaded DataFrame.
@@ -26,33 +55,44 @@ async def _LoadDataset(file_path: Union[str, Path], read_header_only: bool = Fal
         ValueError: If there are issues reading the file.
     """
     file_path = Path(file_path)
-    ext = file_path.suffix.lower()
+    # Compressed files and archive members are decompressed while they are read
+    ext = dataset_suffix(file_path)
     
     try:
+        if read_header_only:
+            # Never falls back to a full read, Parquet and JSON only touch schema / first record
+            return read_dataset_header(file_path)
+
+        if ext == '.csv' and csv_dtypes == 'typed':
+            # Dtypes from a sample, then one Arrow pass straight into them
+            df, report = read_csv_typed(file_path)
+            print(format_memory_report(file_path.name, report))
+            return df
+
         if ext == '.csv':
-            if read_header_only:
-                return pd.read_csv(file_path, nrows=0)
-            return pd.read_csv(file_path)
+            with open_dataset(file_path) as source:
+                return pd.read_csv(source)
             
-        elif ext in ['.xlsx', '.xls']:
-            if read_header_only:
-                return pd.read_excel(file_path, nrows=0)
-            return pd.read_excel(file_path)
+        elif ext in EXCEL_EXTENSIONS:
+            # One sheet per dataset, `workbook.xlsx#Sheet` (the first sheet otherwise)
+            return read_excel(file_path)
             
-        elif ext == '.parquet':
-            if read_header_only:
-                return pd.read_parquet(file_path, columns=None)
-            return pd.read_parquet(file_path)
+        elif ext in COLUMNAR_EXTENSIONS:
+            # Parquet and Arrow are decoded once, straight from a memory map for plain files
+            return read_columnar(file_path)
             
         elif ext == '.json':
-            if read_header_only:
-                return pd.read_json(file_path, nrows=0)
-            return pd.read_json(file_path)
+            with open_dataset(file_path) as source:
+                return pd.read_json(source)
+
+        elif ext in ['.jsonl', '.ndjson']:
+            with open_dataset(file_path) as source:
+                return pd.read_json(source, lines=True)
             
         else:
             raise UnsupportedFileTypeError(
                 f"Extension '{ext}' is not yet supported. "
-                "Supported formats: .csv, .xlsx, .xls, .parquet, .json"
+                "Supported formats: .csv, .xlsx, .xls, .parquet, .feather, .arrow, .json, .jsonl, .ndjson"
             )
             
     except UnsupportedFileTypeError:
@@ -60,7 +100,8 @@ async def _LoadDataset(file_path: Union[str, Path], read_header_only: bool = Fal
     except Exception as e:
         raise ValueError(f"Error reading {file_path.name}: {str(e)}") from e
 
-async def get_columns_sample(folder_path: str, file_name: str) -> Dict[str, List[Optional[str]]]:
+async def get_columns_sample(folder_path: str, file_name: str, with_fingerprint: bool = False,
+                             with_classes: bool = False) -> Union[Dict[str, List[Optional[str]]], Tuple[Any, ...]]:
     """
     Asynchronously get columns and sample values from a specified file.
     Returns a dictionary with column names as keys and lists of sample values as values.
@@ -68,6 +109,10 @@ async def get_columns_sample(folder_path: str, file_name: str) -> Dict[str, List
     Args:
         folder_path (str): Path to the folder containing the dataset.
         file_name (str): Name of the file to analyze.
+        with_fingerprint (bool): Also return the schema fingerprint (column names and
+                                 inferred dtype families), None if the file couldn't be read.
+        with_classes (bool): Also return the rule-based Format/Nullable of the columns
+                             that could be classified without the model.
         
     Returns:
         Dict[str, List[Optional[str]]]: A dictionary in the format {
@@ -75,134 +120,101 @@ async def get_columns_sample(folder_path: str, file_name: str) -> Dict[str, List
             "column2": ["sample1", "sample2", "sample3"],
             ...
         }
+        With `with_fingerprint` and/or `with_classes`, a tuple of the columns dictionary
+        followed by the fingerprint and/or the column classes, in that order.
         
     Raises:
         FileNotFoundError: If the specified file does not exist.
         UnsupportedFileTypeError: If the file extension is not supported.
     """
     
-    async def _read_file_columns(file_path: Path) -> Dict[str, List[Optional[str]]]:
-        """Helper function to read columns and sample values from a single file."""
+    async def _read_file_columns(file_path: Path) -> Tuple[Dict[str, List[Optional[str]]], Optional[str], Dict[str, Dict[str, Any]]]:
+        """Helper function to read columns, sample values, schema fingerprint and column classes from a single file."""
         try:
-            # First read with header only to check if file is valid
-            await _LoadDataset(file_path, read_header_only=True)
-            
-            # Then read actual data for samples
-            df = await _LoadDataset(file_path, read_header_only=False)
-            
-            # Create dictionary with column names and sample values
-            columns_dict: Dict[str, List[Optional[str]]] = {}
-            for column in df.columns:
-                # Get first 3 non-null values if possible
-                samples = (
-                    df[column]
-                    .dropna()
-                    .head(3)
-                    .map(lambda x: str(x))  # Convert all values to strings
-                    .tolist()
-                )
-                
-                # Pad with None if less than 3 samples
-                while len(samples) < 3:
-                    samples.append(None)
-                    
-                columns_dict[column] = samples
-                
-            return columns_dict
+            with stage_span("get_columns_sample", file=str(file_path)) as span:
+                # Unchanged files are served from the on-disk cache
+                cache = get_cache()
+                cache_key = await asyncio.to_thread(cache.key, file_path, 'columns_schema', n_samples=3)
+                cached = cache.get(cache_key)
+                span.set_attribute("cache_hit", cached is not None)
+                if cached is not None:
+                    return cached['columns'], cached['fingerprint'], cached['classes']
+
+                # Single streaming pass, stops reading as soon as every column has 3 samples
+                columns_dict, schema = await get_executor().run(sample_columns, file_path, 3, DEFAULT_CHUNKSIZE, True, file_path=file_path)
+                fingerprint = schema_fingerprint(schema['dtypes'])
+                await asyncio.to_thread(cache.set, cache_key, {'columns': columns_dict, 'fingerprint': fingerprint, 'classes': schema['classes']})
+                span.set_attribute("columns", len(columns_dict))
+                span.set_attribute("classified_columns", len(schema['classes']))
+                span.set_attribute("schema_fingerprint", fingerprint)
+                return columns_dict, fingerprint, schema['classes']
                 
         except UnsupportedFileTypeError as e:
             print(f"Error with {file_path.name}: {str(e)}")
             raise
         except ValueError as e:
             print(f"Error reading {file_path.name}: {str(e)}")
-            return {}
+            return {}, None, {}
         except Exception as e:
             print(f"Unexpected error with {file_path.name}: {str(e)}")
-            return {}
+            return {}, None, {}
     
-    # Construct full file path and check if file exists
+    # Construct full file path and check if file exists (`archive.zip::member` names a file inside an archive)
     file_path = Path(folder_path) / file_name
-    if not file_path.is_file():
+    if not source_exists(file_path):
         raise FileNotFoundError(f"File '{file_name}' not found in '{folder_path}'")
     
-    # Check if file type is supported
-    supported_extensions = {'.csv', '.xlsx', '.xls', '.parquet', '.json'}
-    if file_path.suffix.lower() not in supported_extensions:
+    # Check if file type is supported, looking through compression suffixes
+    if dataset_suffix(file_path) not in SUPPORTED_EXTENSIONS:
         raise UnsupportedFileTypeError(
             f"Extension '{file_path.suffix}' is not yet supported. "
-            "Supported formats: .csv, .xlsx, .xls, .parquet, .json"
+            "Supported formats: .csv, .xlsx, .xls, .parquet, .feather, .arrow, .json, .jsonl, .ndjson"
         )
     
     # Create and execute task for the file
     task = asyncio.create_task(_read_file_columns(file_path))
-    columns_dict = await task
+    columns_dict, fingerprint, classes = await task
     
+    extras = ([fingerprint] if with_fingerprint else []) + ([classes] if with_classes else [])
+    if extras:
+        return (columns_dict, *extras)
     return columns_dict
 
-async def get_dataset_profile(root, file_name: str, output_format: str = 'json') -> Union[str, Dict[str, Any]]:
+async def get_dataset_profile(root, file_name: str, output_format: str = 'json', mode: str = 'exact',
+                              csv_dtypes: str = 'default') -> Union[str, Dict[str, Any]]:
     """
     Create a comprehensive profile of the dataset including statistics, metadata, and samples.
     
     Args:
         df (pd.DataFrame): Input DataFrame.
         output_format (str): 'markdown', 'natural_language', or 'json'.
+        mode (str): 'exact' loads the whole file, 'approximate' streams it in constant memory
+                    with sketches and flags each stat's accuracy, 'metadata' takes counts and
+                    ranges from the Parquet/Arrow footer and the rest from the first row group
+                    (other formats fall back to 'approximate') (default: 'exact').
+        csv_dtypes (str): 'typed' loads CSVs in 'exact' mode with compact Arrow-backed dtypes
+                          and prints their memory before and after (default: 'default').
     
     Returns:
         Union[str, Dict[str, Any]]: Formatted string containing dataset profile in the specified format
                                     or a dictionary if 'json' is selected.
     
     Raises:
-        ValueError: If an unsupported output format is specified.
+        ValueError: If an unsupported output format or mode is specified.
     """
+    if mode not in ('exact', 'approximate', 'metadata'):
+        raise ValueError("Unsupported profiling mode. Choose from 'exact', 'approximate' or 'metadata'.")
+    if csv_dtypes not in CSV_DTYPE_MODES:
+        raise ValueError(f"Unsupported CSV dtypes. Choose from {', '.join(CSV_DTYPE_MODES)}.")
     
-    df = await(_LoadDataset(file_path=root+file_name))
-    profile = {}
-    
-    for col in tqdm(df.columns,
-                desc=f"Processing {len(df.columns)} columns ({file_name})",
-                bar_format="{desc:<70} {bar:30}|{n_fmt:>4}/{total_fmt:<4}",
-                colour="green"):
-        # Get non-null sample value
-        sample_series = df[col].dropna()
-        sample_value = sample_series.iloc[0] if not sample_series.empty else None
-        
-        # Convert sample_value to appropriate type for JSON compatibility
-        if isinstance(sample_value, (np.floating, float)):
-            sample_value = float(f"{sample_value:.2f}")
-        elif isinstance(sample_value, (np.integer, int)):
-            sample_value = int(sample_value)
-        elif isinstance(sample_value, pd.Timestamp):
-            sample_value = sample_value.isoformat()
-        else:
-            sample_value = str(sample_value) if sample_value is not None else None
-        
-        col_stats = {
-            'dtype': str(df[col].dtype),
-            'sample': sample_value,
-            'total_count': int(len(df[col])),
-            'null_count': int(df[col].isna().sum()),
-            'null_percentage': f"{(df[col].isna().sum() / len(df[col])) * 100:.1f}%",
-            'unique_count': int(df[col].nunique(dropna=True))
-        }
-        
-        # Add numerical statistics if applicable
-        if pd.api.types.is_numeric_dtype(df[col]):
-            col_stats.update({
-                'mean': round(df[col].mean(), 2) if not df[col].dropna().empty else None,
-                'median': round(df[col].median(), 2) if not df[col].dropna().empty else None,
-                'std': round(df[col].std(), 2) if not df[col].dropna().empty else None,
-                'min': round(df[col].min(), 2) if not df[col].dropna().empty else None,
-                'max': round(df[col].max(), 2) if not df[col].dropna().empty else None
-            })
-        
-        # Check for various null representations
-        null_variants = ['NA', 'Na', 'na', 'NULL', 'Null', 'null', 'NAN', 'Nan', 'nan']
-        if df[col].dtype == 'object':
-            null_like_count = df[col].isin(null_variants).sum()
-            if null_like_count > 0:
-                col_stats['alternative_null_count'] = int(null_like_count)
-        
-        profile[col] = col_stats
+    # Unchanged files are served from the on-disk cache
+    cache = get_cache()
+    cache_key = await asyncio.to_thread(cache.key, root+file_name, 'dataset_profile', mode=mode, csv_dtypes=csv_dtypes)
+    profile = cache.get(cache_key)
+    if profile is None:
+        # Loading and profiling both run in the worker, only the small profile dict comes back
+        profile = await get_executor().run(_build_profile, root+file_name, mode, csv_dtypes, file_path=root+file_name)
+        await asyncio.to_thread(cache.set, cache_key, profile)
     
     if output_format == 'markdown':
         return await _format_markdown(profile)
@@ -213,6 +225,24 @@ async def get_dataset_profile(root, file_name: str, output_format: str = 'json')
     else:
         raise ValueError("Unsupported output format. Choose from 'markdown', 'natural_language', or 'json'.")
 
+def _build_profile(file_path: Union[str, Path], mode: str = 'exact', csv_dtypes: str = 'default') -> Dict[str, Any]:
+    """Blocking profile computation for `get_dataset_profile`, run inside an executor worker."""
+    if mode == 'metadata' and is_columnar(file_path):
+        # Footer statistics plus the first row group, the rest of the file is never decoded
+        return profile_columnar(file_path)
+    if mode in ('approximate', 'metadata'):
+        # Chunk by chunk with sketches, the file is never fully in memory
+        return profile_dataset_approx(file_path)
+
+    df = _load_dataset(file_path, csv_dtypes=csv_dtypes)
+    
+    # Batched whole-frame passes instead of re-scanning each column
+    return profile_dataframe(df)
+
+def _approx_mark(stats: Dict[str, Any], key: str) -> str:
+    """Prefix for stats that came from a sketch in approximate mode"""
+    return "~" if not stats.get('accuracy', {}).get(key, {}).get('exact', True) else ""
+
 async def _format_markdown(profile: Dict[str, Any]) -> str:
     """Format profile as markdown table"""
     # Header section
@@ -231,14 +261,14 @@ Total columns: {len(profile)}
         # Basic stats for all columns
         basic_stats = (f"Total: {stats['total_count']}, "
                       f"Nulls: {stats['null_count']} ({stats['null_percentage']}), "
-                      f"Unique: {stats['unique_count']}")
+                      f"Unique: {_approx_mark(stats, 'unique_count')}{stats['unique_count']}")
         
         # Additional info for numeric columns
         add_info = []
         if 'mean' in stats and stats['mean'] is not None:
             add_info.extend([
                 f"Mean: {stats['mean']}",
-                f"Median: {stats['median']}",
+                f"Median: {_approx_mark(stats, 'median')}{stats['median']}",
                 f"Range: [{stats['min']}, {stats['max']}]"
             ])
         
@@ -260,10 +290,10 @@ async def _format_natural_language(profile: Dict[str, Any]) -> str:
         nl += f"  - **Type**: {stats['dtype']}\n"
         nl += f"  - **Sample value**: {stats['sample']}\n"
         nl += f"  - **Total entries**: {stats['total_count']} with {stats['null_count']} nulls ({stats['null_percentage']})\n"
-        nl += f"  - **Unique values**: {stats['unique_count']}\n"
+        nl += f"  - **Unique values**: {_approx_mark(stats, 'unique_count')}{stats['unique_count']}\n"
         
         if 'mean' in stats and stats['mean'] is not None:
-            nl += f"  - **Numerical statistics**: mean={stats['mean']}, median={stats['median']}\n"
+            nl += f"  - **Numerical statistics**: mean={stats['mean']}, median={_approx_mark(stats, 'median')}{stats['median']}\n"
             nl += f"  - **Range**: {stats['min']} to {stats['max']}\n"
         
         if 'alternative_null_count' in stats:
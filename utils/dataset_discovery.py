@@ -0,0 +1,233 @@
+import asyncio
+import concurrent.futures
+import os
+import re
+import threading
+import zipfile
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+from urllib.parse import unquote
+
+from .archive_source import ARCHIVE_SEPARATOR, dataset_suffix, is_archive
+from .dataset_stream import SUPPORTED_EXTENSIONS
+from .excel_source import EXCEL_EXTENSIONS, sheet_datasets
+
+# year=2024/month=01/part-0.parquet
+_HIVE_SEGMENT = re.compile(r'^([^=]+)=(.*)$')
+_HIVE_NULL = '__HIVE_DEFAULT_PARTITION__'
+
+
+def hive_partitions(relative_path: str) -> Dict[str, Optional[str]]:
+    """Partition columns encoded in the directories of a path, e.g. {"year": "2024", "month": "01"}."""
+    partitions = {}
+    for segment in relative_path.split(ARCHIVE_SEPARATOR)[0].split('/')[:-1]:
+        match = _HIVE_SEGMENT.match(segment)
+        if match:
+            value = unquote(match.group(2))
+            partitions[unquote(match.group(1))] = None if value == _HIVE_NULL else value
+    return partitions
+
+
+def with_partition_columns(metadata: Dict[str, List[Optional[str]]], partitions: Dict[str, Optional[str]]) -> Dict[str, List[Optional[str]]]:
+    """Add a file's partition columns to its column samples, unless the file already has them."""
+    if not partitions or not metadata:
+        return metadata
+    width = max((len(samples) for samples in metadata.values()), default=1)
+    extra = {column: [value] * width for column, value in partitions.items() if column not in metadata}
+    return {**metadata, **extra}
+
+
+def partitioned_fingerprint(fingerprint: Optional[str], partitions: Dict[str, Optional[str]]) -> Optional[str]:
+    """Schema fingerprint of a file with its partition columns added, so only files partitioned alike share a dictionary."""
+    if fingerprint is None or not partitions:
+        return fingerprint
+    return f"{fingerprint}+{','.join(partitions)}"
+
+
+def skipped_report(skipped: Sequence[Tuple[str, str]], limit: int = 20) -> str:
+    """The skipped paths and why, at most `limit` of them listed."""
+    lines = [f"Skipped {len(skipped)} paths:"]
+    lines += [f"  {path}: {reason}" for path, reason in skipped[:limit]]
+    if len(skipped) > limit:
+        lines.append(f"  ... and {len(skipped) - limit} more")
+    return "\n".join(lines)
+
+
+class DatasetDiscovery:
+    """
+    Find the datasets under a folder.
+
+    Directories are listed with `os.scandir`, several at a time on a thread pool, so
+    the stat calls of large or remote trees overlap. Zip archives are expanded into
+    their members and workbooks with several sheets into `workbook.xlsx#Sheet`
+    datasets. Names starting with '.' or '_' (_SUCCESS, .crc, _delta_log) are
+    ignored, like Spark and Hive do. Files with unsupported extensions and folders
+    that can't be listed are recorded in `skipped` instead of failing the run.
+
+    Include/exclude globs are matched against the path relative to the root, with '/'
+    separators (`*` also matches '/'), e.g. `--include '*.parquet' --exclude 'tmp/*'`.
+    """
+
+    def __init__(self, root: Union[str, Path], include: Optional[Sequence[str]] = None, exclude: Optional[Sequence[str]] = None,
+                 recursive: bool = True, max_depth: Optional[int] = None, workers: int = 8,
+                 extensions: Optional[set] = None):
+        """
+        Args:
+            root: Folder to search
+            include: Keep only files matching one of these globs (default: every supported file)
+            exclude: Drop files and folders matching one of these globs
+            recursive: Descend into subfolders
+            max_depth: Deepest subfolder level visited, 0 is the root itself (None: no limit)
+            workers: Directories listed concurrently
+            extensions: Dataset extensions to keep (default: every supported format)
+        """
+        self.root = str(root)
+        self.include = list(include or [])
+        self.exclude = list(exclude or [])
+        self.recursive = recursive
+        self.max_depth = max_depth
+        self.workers = max(1, workers)
+        self.extensions = extensions or SUPPORTED_EXTENSIONS
+        # Relative name -> bytes on disk (compressed size for archive members)
+        self.sizes: Dict[str, int] = {}
+        self.partitions: Dict[str, Dict[str, Optional[str]]] = {}
+        self.skipped: List[Tuple[str, str]] = []
+        self._lock = threading.Lock()
+
+    def _excluded(self, relative_path: str) -> bool:
+        return any(fnmatch(relative_path, pattern) for pattern in self.exclude)
+
+    def _wanted(self, relative_path: str) -> bool:
+        if self._excluded(relative_path):
+            return False
+        return not self.include or any(fnmatch(relative_path, pattern) for pattern in self.include)
+
+    def _skip(self, relative_path: str, reason: str):
+        with self._lock:
+            self.skipped.append((relative_path, reason))
+
+    def _scan(self, directory: str, depth: int) -> Tuple[List[Tuple[str, int]], List[Tuple[str, int]]]:
+        """List one directory: its wanted datasets with their sizes, and the subdirectories to visit."""
+        files, subdirectories = [], []
+        relative_directory = os.path.relpath(directory, self.root).replace(os.sep, '/')
+        prefix = '' if relative_directory == '.' else relative_directory + '/'
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name.startswith(('.', '_')):
+                        continue
+                    relative_path = prefix + entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        if self.recursive and (self.max_depth is None or depth < self.max_depth) and not self._excluded(relative_path):
+                            subdirectories.append((entry.path, depth + 1))
+                    elif entry.is_file():
+                        files.extend(self._dataset_files(entry, relative_path))
+        except OSError as e:
+            self._skip(prefix or '.', f"{type(e).__name__}: {e.strerror or e}")
+        return files, subdirectories
+
+    def _dataset_files(self, entry: os.DirEntry, relative_path: str) -> List[Tuple[str, int]]:
+        if is_archive(entry.name):
+            try:
+                with zipfile.ZipFile(entry.path) as zf:
+                    members = [info for info in zf.infolist() if not info.is_dir()]
+            except (OSError, zipfile.BadZipFile) as e:
+                self._skip(relative_path, f"unreadable archive: {e}")
+                return []
+            found = []
+            for info in members:
+                name = f"{relative_path}{ARCHIVE_SEPARATOR}{info.filename}"
+                if info.filename.startswith('__MACOSX/') or Path(info.filename).name.startswith(('.', '_')) or not self._wanted(name):
+                    continue
+                if dataset_suffix(info.filename) in EXCEL_EXTENSIONS:
+                    found.extend((sheet, info.compress_size) for sheet in sheet_datasets(f"{entry.path}{ARCHIVE_SEPARATOR}{info.filename}", name))
+                elif dataset_suffix(info.filename) in self.extensions:
+                    found.append((name, info.compress_size))
+                else:
+                    self._skip(name, f"unsupported extension '{dataset_suffix(info.filename)}'")
+            return found
+
+        if not self._wanted(relative_path):
+            return []
+        if dataset_suffix(entry.name) not in self.extensions:
+            self._skip(relative_path, f"unsupported extension '{dataset_suffix(entry.name)}'")
+            return []
+        try:
+            size = entry.stat().st_size
+        except OSError as e:
+            self._skip(relative_path, f"{type(e).__name__}: {e.strerror or e}")
+            return []
+        # Every sheet of a workbook is a dataset of its own, sampled in parallel with the rest
+        names = sheet_datasets(entry.path, relative_path) if dataset_suffix(entry.name) in EXCEL_EXTENSIONS else [relative_path]
+        return [(name, size) for name in names]
+
+    def _record(self, name: str, size: int) -> str:
+        self.sizes[name] = size
+        partitions = hive_partitions(name)
+        if partitions:
+            self.partitions[name] = partitions
+        return name
+
+    def walk(self) -> Iterator[str]:
+        """
+        Yield dataset names relative to the root as directories finish listing.
+
+        Order follows completion of the directory listings, not the file tree.
+        """
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='discovery') as pool:
+            pending = {pool.submit(self._scan, self.root, 0)}
+            while pending:
+                done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    files, subdirectories = future.result()
+                    pending.update(pool.submit(self._scan, directory, depth) for directory, depth in subdirectories)
+                    for name, size in files:
+                        yield self._record(name, size)
+
+    async def stream(self, max_queued: int = 1000) -> AsyncIterator[str]:
+        """
+        Yield dataset names while the tree is still being walked.
+
+        The walk runs on a background thread and blocks once `max_queued` names are
+        waiting, so a huge tree is never held in memory ahead of the samplers.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(max_queued)
+        stop = threading.Event()
+        finished = object()
+
+        def put(item) -> bool:
+            future = asyncio.run_coroutine_threadsafe(queue.put(item), loop)
+            while True:
+                try:
+                    future.result(timeout=0.1)
+                    return True
+                except concurrent.futures.TimeoutError:
+                    if stop.is_set():
+                        future.cancel()
+                        return False
+
+        def produce():
+            try:
+                for name in self.walk():
+                    if not put(name):
+                        return
+            except BaseException as e:
+                put(e)
+            finally:
+                if not stop.is_set():
+                    put(finished)
+
+        producer = loop.run_in_executor(None, produce)
+        try:
+            while True:
+                item = await queue.get()
+                if item is finished:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            await producer
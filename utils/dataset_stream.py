@@ -0,0 +1,202 @@
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+import pandas as pd
+
+from .archive_source import COMPRESSION_EXTENSIONS, dataset_suffix, open_dataset, read_first_line
+from .column_classifier import classify_columns
+from .columnar_source import COLUMNAR_EXTENSIONS, iter_columnar_chunks, read_columnar_header
+from .excel_source import EXCEL_EXTENSIONS, iter_excel_chunks, read_excel_header
+
+SUPPORTED_EXTENSIONS = {'.csv', '.xlsx', '.xls', '.parquet', '.feather', '.arrow', '.json', '.jsonl', '.ndjson'}
+
+# Rows per chunk when streaming text formats
+DEFAULT_CHUNKSIZE = 10_000
+
+
+class UnsupportedFileTypeError(Exception):
+    """Custom exception for unsupported file types"""
+    pass
+
+
+def _unsupported(ext: str) -> UnsupportedFileTypeError:
+    return UnsupportedFileTypeError(
+        f"Extension '{ext}' is not yet supported. "
+        "Supported formats: .csv, .xlsx, .xls, .parquet, .feather, .arrow, .json, .jsonl, .ndjson, "
+        f"optionally compressed ({', '.join(sorted(COMPRESSION_EXTENSIONS))}) or inside a .zip archive"
+    )
+
+
+def _is_json_lines(file_path: Union[str, Path]) -> bool:
+    """Sniff whether a .json file holds one record per line rather than a single document."""
+    if dataset_suffix(file_path) in ('.jsonl', '.ndjson'):
+        return True
+    line = read_first_line(file_path)
+    if line is None:
+        return False
+    # A JSON array or a pretty-printed object won't parse from its first line alone
+    try:
+        return isinstance(json.loads(line), dict)
+    except ValueError:
+        return False
+
+
+def read_dataset_header(file_path: Union[str, Path]) -> pd.DataFrame:
+    """
+    Read only the column layout of a dataset, without touching its rows where the format allows it.
+
+    Args:
+        file_path (str or Path): Path to the dataset file, a compressed file or an `archive.zip::member`.
+
+    Returns:
+        pd.DataFrame: Empty DataFrame carrying the dataset's columns.
+
+    Raises:
+        UnsupportedFileTypeError: If the file format is unsupported.
+    """
+    ext = dataset_suffix(file_path)
+
+    if ext == '.csv':
+        with open_dataset(file_path) as source:
+            return pd.read_csv(source, nrows=0)
+    elif ext in EXCEL_EXTENSIONS:
+        # Only the sheet's first row is parsed
+        return read_excel_header(file_path)
+    elif ext in COLUMNAR_EXTENSIONS:
+        # Schema lives in the footer, no row group is decoded
+        return read_columnar_header(file_path)
+    elif ext in ['.json', '.jsonl', '.ndjson']:
+        # Only the first record is needed to know the columns
+        first = next(iter_dataset_chunks(file_path, chunksize=1), pd.DataFrame())
+        return first.iloc[0:0]
+    else:
+        raise _unsupported(ext)
+
+
+def iter_dataset_chunks(file_path: Union[str, Path], chunksize: int = DEFAULT_CHUNKSIZE) -> Iterator[pd.DataFrame]:
+    """
+    Lazily yield a dataset as a sequence of DataFrames so callers can stop reading early.
+
+    CSV is read in `chunksize` row chunks, Parquet and Arrow in `chunksize` row batches
+    (Parquet decoding one row group at a time, from a memory map for plain files), JSON Lines
+    line by line (batched into `chunksize` records) and Excel sheets row by row (batched into
+    `chunksize` rows).
+    A JSON file that is a single document (e.g. an array of records) can't be split
+    and is yielded as one chunk. Compressed files and archive members are decompressed
+    while they are read, so stopping early also stops the decompression.
+
+    Args:
+        file_path (str or Path): Path to the dataset file, a compressed file or an `archive.zip::member`.
+        chunksize (int): Number of rows per chunk for row-oriented formats.
+
+    Yields:
+        pd.DataFrame: Consecutive, non-overlapping slices of the dataset.
+
+    Raises:
+        UnsupportedFileTypeError: If the file format is unsupported.
+    """
+    ext = dataset_suffix(file_path)
+
+    if ext == '.csv':
+        with open_dataset(file_path) as source, pd.read_csv(source, chunksize=chunksize) as reader:
+            for chunk in reader:
+                yield chunk
+
+    elif ext in COLUMNAR_EXTENSIONS:
+        yield from iter_columnar_chunks(file_path, chunksize)
+
+    elif ext in ['.json', '.jsonl', '.ndjson']:
+        if _is_json_lines(file_path):
+            with open_dataset(file_path) as source, pd.read_json(source, lines=True, chunksize=chunksize) as reader:
+                for chunk in reader:
+                    yield chunk
+        else:
+            with open_dataset(file_path) as source:
+                yield pd.read_json(source)
+
+    elif ext in EXCEL_EXTENSIONS:
+        # One pass over the sheet's rows, `workbook.xlsx#Sheet` picks the sheet
+        yield from iter_excel_chunks(file_path, chunksize)
+
+    else:
+        raise _unsupported(ext)
+
+
+def sample_columns(file_path: Union[str, Path], n_samples: int = 3, chunksize: int = DEFAULT_CHUNKSIZE,
+                   with_schema: bool = False) -> Union[Dict[str, List[Optional[str]]], Tuple[Dict[str, List[Optional[str]]], Dict[str, Any]]]:
+    """
+    Collect the first `n_samples` non-null values of every column in a single streaming pass.
+
+    Reading stops as soon as every column has `n_samples` values, or at the end of the file.
+    Columns that first appear in a later chunk (keys missing from the first JSON Lines
+    records) are added as they show up.
+
+    Args:
+        file_path (str or Path): Path to the dataset file.
+        n_samples (int): Number of non-null samples to collect per column.
+        chunksize (int): Number of rows per chunk for row-oriented formats.
+        with_schema (bool): Also return what the first chunk says about the schema: the
+                            dtypes pandas inferred and the rule-based column classes.
+
+    Returns:
+        Dict[str, List[Optional[str]]]: Column names mapped to their string samples,
+                                        padded with None when a column has fewer values.
+                                        With `with_schema`, a tuple of that and
+                                        {"dtypes": {column: dtype name},
+                                         "classes": {column: {"Format", "Nullable"[, "Nullable Basis"]}}}.
+    """
+    columns_dict: Dict[str, List[Optional[str]]] = {}
+    dtypes: Dict[str, str] = {}
+    classes: Dict[str, Dict[str, Any]] = {}
+    pending = None
+    first_chunk = None
+    chunk_count = 0
+    chunks = iter_dataset_chunks(file_path, chunksize=chunksize)
+
+    for chunk in chunks:
+        chunk_count += 1
+        if pending is None:
+            first_chunk = chunk
+            pending = []
+        # JSON Lines records don't all share the same keys: columns can show up in any chunk
+        for column, dtype in chunk.dtypes.items():
+            if column not in columns_dict:
+                columns_dict[column] = []
+                dtypes[str(column)] = str(dtype)
+                pending.append(column)
+
+        for column in list(pending):
+            if column not in chunk.columns:
+                continue
+            needed = n_samples - len(columns_dict[column])
+            columns_dict[column].extend(
+                chunk[column].dropna().head(needed).map(lambda x: str(x)).tolist()
+            )
+            if len(columns_dict[column]) >= n_samples:
+                pending.remove(column)
+
+        if not pending:
+            break
+
+    if with_schema and first_chunk is not None:
+        # Non-nullable is only certain when the classifier saw every row; a first chunk
+        # shorter than asked for is usually the whole file (free to confirm at EOF)
+        complete = chunk_count == 1 and len(first_chunk) < chunksize and next(chunks, None) is None
+        classes = classify_columns(first_chunk, complete=complete)
+    chunks.close()
+
+    # File had no rows at all, fall back to the header for column names
+    if pending is None:
+        header = read_dataset_header(file_path)
+        columns_dict = {column: [] for column in header.columns}
+        dtypes = {str(column): str(dtype) for column, dtype in header.dtypes.items()}
+
+    # Pad with None if less than n_samples
+    for samples in columns_dict.values():
+        while len(samples) < n_samples:
+            samples.append(None)
+
+    if with_schema:
+        return columns_dict, {"dtypes": dtypes, "classes": classes}
+    return columns_dict
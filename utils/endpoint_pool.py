@@ -0,0 +1,252 @@
+import asyncio
+import itertools
+import time
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import httpx
+from autogen_core import CancellationToken
+from autogen_core.models import ChatCompletionClient, CreateResult, LLMMessage, RequestUsage
+from autogen_core.tools import Tool, ToolSchema
+from autogen_ext.models.openai import OpenAIChatCompletionClient
+
+from .client_wrapper import ChatCompletionClientWrapper
+from .task_scheduler import is_transient_error
+
+ROUTING_POLICIES = ('least-outstanding', 'round-robin')
+
+
+class Endpoint:
+    """One model server in an `EndpointPool` with its live counters."""
+
+    def __init__(self, client: ChatCompletionClient, base_url: Optional[str] = None, api_key: Optional[str] = None):
+        """
+        Args:
+            client: Client bound to this server
+            base_url: OpenAI-compatible base URL, used for health checks (None: never checked)
+            api_key: Key sent with health checks, as the client sends it with requests
+        """
+        self.client = client
+        self.base_url = base_url
+        self.api_key = api_key
+        self.healthy = True
+        self.outstanding = 0
+        self.requests = 0
+        self.errors = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        # Wall time with at least one request in flight, so overlapping requests count once
+        self._busy_total = 0.0
+        self._busy_since: Optional[float] = None
+
+    @property
+    def name(self) -> str:
+        return self.base_url or repr(self.client)
+
+    @property
+    def busy_seconds(self) -> float:
+        """Seconds this endpoint has had a request in flight, the current stretch included."""
+        if self._busy_since is None:
+            return self._busy_total
+        return self._busy_total + time.perf_counter() - self._busy_since
+
+    def start_request(self):
+        if self.outstanding == 0:
+            self._busy_since = time.perf_counter()
+        self.outstanding += 1
+        self.requests += 1
+
+    def end_request(self):
+        self.outstanding -= 1
+        if self.outstanding == 0 and self._busy_since is not None:
+            self._busy_total += time.perf_counter() - self._busy_since
+            self._busy_since = None
+
+    def counters(self) -> Dict[str, float]:
+        """Raw running totals, to take per-job differences with `stats(since=...)`."""
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'prompt_tokens': self.prompt_tokens,
+            'completion_tokens': self.completion_tokens,
+            'busy_seconds': self.busy_seconds,
+        }
+
+    def stats(self, since: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """Totals so far, or what was added since the `counters()` snapshot `since`."""
+        counters = self.counters()
+        if since is not None:
+            counters = {name: value - since.get(name, 0) for name, value in counters.items()}
+        busy_seconds = counters['busy_seconds']
+        return {
+            'endpoint': self.name,
+            'healthy': self.healthy,
+            'requests': counters['requests'],
+            'errors': counters['errors'],
+            'prompt_tokens': counters['prompt_tokens'],
+            'completion_tokens': counters['completion_tokens'],
+            'busy_seconds': round(busy_seconds, 2),
+            'completion_tokens_per_second': round(counters['completion_tokens'] / busy_seconds, 2) if busy_seconds else 0.0,
+        }
+
+
+class EndpointPool(ChatCompletionClientWrapper):
+    """
+    Spread requests across several OpenAI-compatible model servers.
+
+    Each request goes to the healthy endpoint with the fewest requests outstanding,
+    or to the next one in turn with 'round-robin'. Endpoints are probed with
+    `GET {base_url}/models` (with the API key) every `health_interval` seconds; one
+    that fails a probe (anything but a 2xx) or a request with a transient error is
+    taken out until a probe succeeds again. With probing disabled, failed requests
+    don't take an endpoint out, since nothing would bring it back.
+    """
+
+    def __init__(self, endpoints: Sequence[Endpoint], routing: str = 'least-outstanding',
+                 health_interval: float = 15.0, health_timeout: float = 5.0):
+        """
+        Args:
+            endpoints: Servers to route between
+            routing: 'least-outstanding' or 'round-robin'
+            health_interval: Seconds between health probes (0 disables probing)
+            health_timeout: Timeout of a single probe
+        """
+        if not endpoints:
+            raise ValueError("EndpointPool needs at least one endpoint.")
+        if routing not in ROUTING_POLICIES:
+            raise ValueError(f"Unsupported routing '{routing}'. Choose from {', '.join(ROUTING_POLICIES)}.")
+        super().__init__(endpoints[0].client)
+        self.endpoints = list(endpoints)
+        self.routing = routing
+        self.health_interval = health_interval
+        self.health_timeout = health_timeout
+        self._round_robin = itertools.cycle(range(len(self.endpoints)))
+        self._health_task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_urls(cls, base_urls: Sequence[str], routing: str = 'least-outstanding', health_interval: float = 15.0,
+                  **client_kwargs: Any) -> "EndpointPool":
+        """Build one OpenAIChatCompletionClient per URL with the same model and sampling settings."""
+        endpoints = [Endpoint(OpenAIChatCompletionClient(base_url=url, **client_kwargs), base_url=url, api_key=client_kwargs.get('api_key'))
+                     for url in base_urls]
+        return cls(endpoints, routing=routing, health_interval=health_interval)
+
+    def _pick(self) -> Endpoint:
+        candidates = [endpoint for endpoint in self.endpoints if endpoint.healthy]
+        # Nothing healthy: keep trying everything rather than failing every request outright
+        if not candidates:
+            candidates = self.endpoints
+        if self.routing == 'round-robin':
+            while True:
+                endpoint = self.endpoints[next(self._round_robin)]
+                if endpoint in candidates:
+                    return endpoint
+        return min(candidates, key=lambda endpoint: endpoint.outstanding)
+
+    async def check_health(self):
+        """Probe every endpoint once and update its healthy flag."""
+        async with httpx.AsyncClient(timeout=self.health_timeout) as http:
+            async def probe(endpoint: Endpoint):
+                if endpoint.base_url is None:
+                    return
+                try:
+                    headers = {'Authorization': f'Bearer {endpoint.api_key}'} if endpoint.api_key else None
+                    response = await http.get(endpoint.base_url.rstrip('/') + '/models', headers=headers)
+                    # 401/404 mean a wrong key or URL, not a server that can take requests
+                    endpoint.healthy = 200 <= response.status_code < 300
+                except httpx.HTTPError:
+                    endpoint.healthy = False
+            await asyncio.gather(*(probe(endpoint) for endpoint in self.endpoints))
+
+    async def _health_loop(self):
+        while True:
+            await self.check_health()
+            await asyncio.sleep(self.health_interval)
+
+    def _ensure_health_checks(self):
+        if self.health_interval > 0 and (self._health_task is None or self._health_task.done()):
+            self._health_task = asyncio.create_task(self._health_loop())
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        json_output: Optional[bool] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        self._ensure_health_checks()
+        endpoint = self._pick()
+        endpoint.start_request()
+        try:
+            result = await endpoint.client.create(
+                messages,
+                tools=tools,
+                json_output=json_output,
+                extra_create_args=extra_create_args,
+                cancellation_token=cancellation_token,
+            )
+        except Exception as e:
+            endpoint.errors += 1
+            # Passive health check, the next probe brings it back if it recovers; without
+            # probes nothing would, so the endpoint stays in rotation
+            if is_transient_error(e) and self.health_interval > 0:
+                endpoint.healthy = False
+            raise
+        finally:
+            endpoint.end_request()
+
+        endpoint.prompt_tokens += result.usage.prompt_tokens
+        endpoint.completion_tokens += result.usage.completion_tokens
+        return result
+
+    def actual_usage(self) -> RequestUsage:
+        usages = [endpoint.client.actual_usage() for endpoint in self.endpoints]
+        return RequestUsage(prompt_tokens=sum(u.prompt_tokens for u in usages),
+                            completion_tokens=sum(u.completion_tokens for u in usages))
+
+    def total_usage(self) -> RequestUsage:
+        usages = [endpoint.client.total_usage() for endpoint in self.endpoints]
+        return RequestUsage(prompt_tokens=sum(u.prompt_tokens for u in usages),
+                            completion_tokens=sum(u.completion_tokens for u in usages))
+
+    def snapshot(self) -> List[Dict[str, float]]:
+        """Counters of every endpoint, to report one job's share with `report(since=...)`."""
+        return [endpoint.counters() for endpoint in self.endpoints]
+
+    def stats(self, since: Optional[List[Dict[str, float]]] = None) -> List[Dict[str, Any]]:
+        if since is None:
+            return [endpoint.stats() for endpoint in self.endpoints]
+        return [endpoint.stats(earlier) for endpoint, earlier in zip(self.endpoints, since)]
+
+    def report(self, since: Optional[List[Dict[str, float]]] = None) -> str:
+        """
+        Per-endpoint request counts and throughput as a plain text table.
+
+        Args:
+            since: A `snapshot()` to report only what happened after it; daemon jobs running
+                   at the same time share the endpoints, so their requests are included
+        """
+        lines = [f"{'Endpoint':<40} {'Healthy':<8} {'Reqs':>5} {'Errors':>6} {'Tokens out':>10} {'Tok/s':>8}"]
+        for stats in self.stats(since):
+            lines.append(
+                f"{stats['endpoint'][:40]:<40} {str(stats['healthy']):<8} {stats['requests']:>5} {stats['errors']:>6} "
+                f"{stats['completion_tokens']:>10} {stats['completion_tokens_per_second']:>8.1f}"
+            )
+        return "\n".join(lines)
+
+    def close(self):
+        """Forget the health check task, for when its event loop has already ended (`asyncio.run` cancels it)."""
+        if self._health_task is not None and not self._health_task.get_loop().is_closed():
+            self._health_task.cancel()
+        self._health_task = None
+
+    async def aclose(self):
+        """Stop background health checks."""
+        if self._health_task is not None:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+            self._health_task = None
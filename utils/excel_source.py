@@ -0,0 +1,216 @@
+import contextlib
+import xml.etree.ElementTree as ET
+import zipfile
+from datetime import date, time, timedelta
+from pathlib import Path
+from typing import Any, Iterator, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+from pandas.io.parsers import TextParser
+
+from .archive_source import SHEET_SEPARATOR, dataset_suffix, open_dataset, split_sheet
+
+EXCEL_EXTENSIONS = {'.xlsx', '.xls'}
+EXCEL_ENGINES = ('auto', 'calamine', 'openpyxl')
+# Rows in the first chunk of a sheet, doubling up to the requested chunk size; enough
+# for the samples and the column classifier, so sampling rarely parses more of the sheet
+FIRST_CHUNK_ROWS = 1_000
+
+# Set by configure_excel(), read in the ingestion workers
+_engine = 'auto'
+
+
+def configure_excel(engine: str = 'auto'):
+    """
+    Pick the library that parses workbooks.
+
+    Args:
+        engine: 'calamine' (Rust, needs `pip install python-calamine`), 'openpyxl', or
+                'auto' for calamine when it is installed and openpyxl otherwise
+    """
+    global _engine
+    if engine not in EXCEL_ENGINES:
+        raise ValueError(f"Unsupported Excel engine '{engine}'. Choose from {', '.join(EXCEL_ENGINES)}.")
+    if engine == 'calamine':
+        import python_calamine  # noqa: F401  Fail at startup rather than on the first workbook
+    _engine = engine
+
+
+def excel_engine(file_path: Union[str, Path]) -> Optional[str]:
+    """Engine for `pd.read_excel` and the row reader; None leaves .xls to pandas' default (xlrd)."""
+    if _engine in ('auto', 'calamine'):
+        try:
+            import python_calamine  # noqa: F401
+            return 'calamine'
+        except ImportError:
+            pass
+    return 'openpyxl' if dataset_suffix(file_path) != '.xls' else None
+
+
+def list_sheets(file_path: Union[str, Path]) -> List[str]:
+    """
+    Sheet names of a workbook, in workbook order.
+
+    For .xlsx only `xl/workbook.xml` is read, none of the sheets are parsed.
+    """
+    with open_dataset(split_sheet(file_path)[0], seekable=True) as source:
+        if dataset_suffix(file_path) == '.xlsx':
+            with zipfile.ZipFile(source) as workbook:
+                root = ET.fromstring(workbook.read('xl/workbook.xml'))
+            return [element.get('name') for element in root.iter() if element.tag.rsplit('}', 1)[-1] == 'sheet']
+        if excel_engine(file_path) == 'calamine':
+            from python_calamine import CalamineWorkbook
+            return list(CalamineWorkbook.from_object(source).sheet_names)
+        return list(pd.ExcelFile(source).sheet_names)
+
+
+def sheet_datasets(file_path: Union[str, Path], name: str) -> List[str]:
+    """
+    Dataset names for a workbook: `name` itself when it has one sheet, else `name#<sheet>` per sheet.
+
+    Workbooks that can't be opened keep their own name, so the error shows up when
+    they are sampled.
+    """
+    try:
+        sheets = list_sheets(file_path)
+    except Exception:
+        return [name]
+    if len(sheets) <= 1:
+        return [name]
+    return [f"{name}{SHEET_SEPARATOR}{sheet}" for sheet in sheets]
+
+
+def expand_workbooks(root: Union[str, Path], files: List[str]) -> List[str]:
+    """Replace every workbook with several sheets in a directory listing with its sheets."""
+    expanded = []
+    for file in files:
+        if dataset_suffix(file) in EXCEL_EXTENSIONS and split_sheet(file)[1] is None:
+            expanded.extend(sheet_datasets(Path(root) / file, file))
+        else:
+            expanded.append(file)
+    return expanded
+
+
+def _calamine_cell(value: Any) -> Any:
+    # Same conversions as pandas' calamine reader
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else value
+    if isinstance(value, date):
+        return pd.Timestamp(value)
+    if isinstance(value, timedelta):
+        return pd.Timedelta(value)
+    return value
+
+
+def _openpyxl_cell(cell) -> Any:
+    # Same conversions as pandas' openpyxl reader
+    from openpyxl.cell.cell import TYPE_ERROR, TYPE_NUMERIC
+    if cell.value is None:
+        return ""
+    if cell.data_type == TYPE_ERROR:
+        return np.nan
+    if cell.data_type == TYPE_NUMERIC and not isinstance(cell.value, (date, time, timedelta)):
+        return int(cell.value) if float(cell.value).is_integer() else float(cell.value)
+    return cell.value
+
+
+@contextlib.contextmanager
+def _open_rows(file_path: Union[str, Path]) -> Iterator[Iterator[List[Any]]]:
+    """Rows of one sheet as lists of cell values, read lazily (the first sheet when none is named)."""
+    workbook_path, sheet = split_sheet(file_path)
+    engine = excel_engine(file_path)
+    with open_dataset(workbook_path, seekable=True) as source:
+        if engine == 'calamine':
+            from python_calamine import CalamineWorkbook
+            workbook = CalamineWorkbook.from_object(source)
+            try:
+                worksheet = workbook.get_sheet_by_name(sheet) if sheet is not None else workbook.get_sheet_by_index(0)
+                # iter_rows leaves out the empty columns on the left, pandas keeps them
+                first_column = worksheet.start[1] if worksheet.start else 0
+                yield ([""] * first_column + [_calamine_cell(value) for value in row] for row in worksheet.iter_rows())
+            finally:
+                workbook.close()
+
+        elif engine == 'openpyxl':
+            import openpyxl
+            # Read-only mode streams the sheet's XML instead of building the whole workbook
+            workbook = openpyxl.load_workbook(source, read_only=True, data_only=True, keep_links=False)
+            try:
+                worksheet = workbook[sheet] if sheet is not None else workbook.worksheets[0]
+                worksheet.reset_dimensions()
+                yield ([_openpyxl_cell(cell) for cell in row] for row in worksheet.rows)
+            finally:
+                workbook.close()
+
+        else:
+            # .xls without calamine, pandas needs the whole sheet anyway
+            df = pd.read_excel(source, sheet_name=sheet if sheet is not None else 0, header=None, dtype=object)
+            yield ([("" if pd.isna(value) else value) for value in row] for row in df.itertuples(index=False))
+
+
+def _widen(header: List[Any], rows: List[List[Any]]) -> List[Any]:
+    """Pad the header to the widest row, pandas names the extra columns "Unnamed: n"."""
+    width = max([len(header)] + [len(row) for row in rows])
+    return header + [""] * (width - len(header))
+
+
+def _frame(header: List[Any], rows: List[List[Any]]) -> pd.DataFrame:
+    width = len(header)
+    rows = [row[:width] + [""] * (width - len(row)) for row in rows]
+    # The parser pd.read_excel hands its cells to, so names and dtypes come out the same
+    return TextParser([header] + rows, header=0).read()
+
+
+def iter_excel_chunks(file_path: Union[str, Path], chunksize: int) -> Iterator[pd.DataFrame]:
+    """
+    Yield one sheet of a workbook `chunksize` rows at a time in a single streaming pass.
+
+    `workbook.xlsx#Sheet` names the sheet, a bare workbook path reads the first sheet.
+    Cells are converted and parsed like `pd.read_excel` does. Chunks start at
+    `FIRST_CHUNK_ROWS` rows and double up to `chunksize`, since parsing rows is what
+    costs the most in a workbook.
+    """
+    with _open_rows(file_path) as rows:
+        header = None
+        batch = []
+        first_chunk = True
+        size = min(chunksize, FIRST_CHUNK_ROWS)
+        for row in rows:
+            # Trailing empty cells don't make columns, like pandas' readers
+            while row and row[-1] == "":
+                row.pop()
+            if header is None:
+                header = row
+                continue
+            batch.append(row)
+            if len(batch) >= size:
+                if first_chunk:
+                    header = _widen(header, batch)
+                    first_chunk = False
+                yield _frame(header, batch)
+                batch = []
+                size = min(chunksize, size * 2)
+        # Trailing empty rows don't make rows either
+        while batch and not batch[-1]:
+            batch.pop()
+        if batch:
+            yield _frame(_widen(header, batch) if first_chunk else header, batch)
+
+
+def read_excel_header(file_path: Union[str, Path]) -> pd.DataFrame:
+    """Empty DataFrame with the columns of one sheet, only its first row is read."""
+    with _open_rows(file_path) as rows:
+        header = next(rows, None)
+    if not header:
+        return pd.DataFrame()
+    while header and header[-1] == "":
+        header.pop()
+    return _frame(header, [])
+
+
+def read_excel(file_path: Union[str, Path]) -> pd.DataFrame:
+    """Whole sheet as a DataFrame (`workbook.xlsx#Sheet`, or the first sheet)."""
+    workbook_path, sheet = split_sheet(file_path)
+    with open_dataset(workbook_path, seekable=True) as source:
+        return pd.read_excel(source, sheet_name=sheet if sheet is not None else 0, engine=excel_engine(file_path))
@@ -0,0 +1,117 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+DEFAULT_CHECKPOINT_PATH = "generation_log/checkpoint.jsonl"
+# Distinct files kept in the checkpoint, older ones are dropped when it is compacted
+DEFAULT_MAX_ENTRIES = 100_000
+
+
+def input_key(filename: str, metadata: Any, config: Optional[dict] = None, options: Optional[dict] = None) -> str:
+    """
+    Hash of what a file's data dictionary depends on.
+
+    Args:
+        filename: File the dictionary is for
+        metadata: Its sampled metadata
+        config: Generator sampling config
+        options: Settings that change the prompt, e.g. metadata format, prompt layout
+                 and whether the classifier was used
+    """
+    data = {"filename": filename, "metadata": str(metadata), "config": config or {}, "options": options or {}}
+    return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class GenerationCheckpoint:
+    """
+    Append-only JSON Lines record of finished data dictionaries.
+
+    Each completed file is written as one line and fsynced straight away, so a crash
+    or Ctrl+C loses at most the file in flight. A torn last line from an interrupted
+    write is dropped when the file is opened. Existing entries are always kept, so a
+    run started without `resume` doesn't throw away an earlier run's progress; only
+    with `resume=True` does `get` return the dictionaries loaded at startup of files
+    whose inputs haven't changed. Entries written since are never served, so daemon
+    jobs don't pick up each other's results. The file is compacted to the latest
+    `max_entries` files whenever it holds twice as many lines.
+    """
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_CHECKPOINT_PATH, resume: bool = False,
+                 max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Args:
+            path: Checkpoint file
+            resume: Reuse the entries of a previous run instead of generating every file again
+            max_entries: Distinct files kept in the file
+        """
+        self.path = Path(path)
+        self.resume = resume
+        self.max_entries = max_entries
+        self.reused = 0
+        self.written = 0
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lines = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Rewritten without the torn line either way, so new entries don't get glued onto it
+        entries = self._compact()
+        if resume:
+            self._entries = entries
+
+    def _compact(self) -> Dict[str, Dict[str, Any]]:
+        """Rewrite the file with the latest entry of each of the newest `max_entries` files, return them by key."""
+        entries: Dict[str, Dict[str, Any]] = {}
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    # Re-inserted so the dict stays ordered by completion
+                    entries.pop(entry["key"], None)
+                    entries[entry["key"]] = entry
+        for key in list(entries)[:max(0, len(entries) - self.max_entries)]:
+            del entries[key]
+
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(entry) + "\n" for entry in entries.values())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+        self._lines = len(entries)
+        return entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Data dictionary loaded for `key` with `resume`, or None if that file still has to be generated."""
+        if not self.resume:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self.reused += 1
+            return entry["data_dict"]
+
+    def add(self, key: str, filename: str, data_dict: Dict[str, Any]):
+        entry = {"key": key, "filename": filename, "data_dict": data_dict, "completed_at": time.time()}
+        line = json.dumps(entry) + "\n"
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            self.written += 1
+            self._lines += 1
+            # Bounded for daemons that keep appending job after job
+            if self._lines > 2 * self.max_entries:
+                self._compact()
@@ -0,0 +1,338 @@
+import asyncio
+import json
+from typing import Any, Dict, List, Optional, Sequence
+
+from autogen_agentchat.agents import AssistantAgent
+from autogen_agentchat.messages import TextMessage
+from prompts import data_dict_summarizer_prompt, data_dict_use_case_merger_prompt
+
+from .column_classifier import KEY_COLUMN
+from .task_scheduler import BoundedScheduler
+from .token_counter import count_tokens
+
+# Share of a merge prompt's token budget the dataset index may take
+INDEX_BUDGET_SHARE = 0.25
+
+
+def _table_columns(data_dict: Dict[str, Any]) -> List[str]:
+    columns = data_dict.get("columns", []) if isinstance(data_dict, dict) else []
+    return [column.get("Column") for column in columns if isinstance(column, dict) and column.get("Column")]
+
+
+def group_tables(data_dicts: Sequence[Dict[str, Any]], token_budget: int) -> List[List[int]]:
+    """
+    Cluster data dictionaries by shared key columns, then cut clusters to fit a token budget.
+
+    Tables sharing a key-like column name (e.g. customerNumber) end up in the same
+    cluster, so the map step still sees the joins it can suggest use cases for. Large
+    clusters are split and small ones packed together so no group exceeds `token_budget`.
+
+    Args:
+        data_dicts: Per-file data dictionaries as returned by `jsonify_prompt`
+        token_budget: Max tokens of one group's serialized dictionaries
+
+    Returns:
+        List[List[int]]: Groups of indices into `data_dicts`.
+    """
+    parent = list(range(len(data_dicts)))
+
+    def find(index: int) -> int:
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    owners: Dict[str, int] = {}
+    for index, data_dict in enumerate(data_dicts):
+        for column in _table_columns(data_dict):
+            if not KEY_COLUMN.search(column):
+                continue
+            if column in owners:
+                parent[find(index)] = find(owners[column])
+            else:
+                owners[column] = index
+
+    clusters: Dict[int, List[int]] = {}
+    for index in range(len(data_dicts)):
+        clusters.setdefault(find(index), []).append(index)
+
+    tokens = [count_tokens(json.dumps(data_dict)) for data_dict in data_dicts]
+
+    # Split oversized clusters, keeping their tables in order
+    pieces: List[List[int]] = []
+    for members in sorted(clusters.values(), key=len, reverse=True):
+        current, current_tokens = [], 0
+        for index in members:
+            if current and current_tokens + tokens[index] > token_budget:
+                pieces.append(current)
+                current, current_tokens = [], 0
+            current.append(index)
+            current_tokens += tokens[index]
+        pieces.append(current)
+
+    # Pack small pieces together so unrelated singletons don't each cost a call
+    groups: List[List[int]] = []
+    group_tokens: List[int] = []
+    for piece in pieces:
+        piece_tokens = sum(tokens[index] for index in piece)
+        for position, used in enumerate(group_tokens):
+            if used + piece_tokens <= token_budget:
+                groups[position].extend(piece)
+                group_tokens[position] += piece_tokens
+                break
+        else:
+            groups.append(list(piece))
+            group_tokens.append(piece_tokens)
+    return groups
+
+
+def _use_cases(content: str) -> Any:
+    """Pull the use case list out of a summarizer answer, or keep the raw text."""
+    try:
+        parsed = json.loads(content)
+    except ValueError:
+        return content
+    if isinstance(parsed, dict) and "use_cases" in parsed:
+        return parsed["use_cases"]
+    return parsed
+
+
+async def _ask(data_dict_summarizer_client, scheduler: BoundedScheduler, metrics: Optional[List[Dict[str, Any]]],
+               name: str, system_message: str, content: str) -> str:
+    async def ask() -> str:
+        agent = AssistantAgent(name=name, model_client=data_dict_summarizer_client, system_message=system_message)
+        response = await agent.on_messages([TextMessage(content=content, source="user")], None)
+        return response.chat_message.content
+
+    # Through the generator's scheduler: one cap on requests in flight, and retries
+    return await scheduler.submit(ask, label=name, metrics=metrics)
+
+
+async def _summarize_group(data_dict_summarizer_client, scheduler: BoundedScheduler, metrics: Optional[List[Dict[str, Any]]],
+                           name: str, data_dicts: Sequence[Dict[str, Any]]) -> str:
+    """Map step: use cases for one group of tables, with the regular summarizer prompt."""
+    return await _ask(data_dict_summarizer_client, scheduler, metrics, name, data_dict_summarizer_prompt(),
+                      f"{list(data_dicts)}\n\nReview the above data dictionary.")
+
+
+def _dataset_index(data_dicts: Sequence[Dict[str, Any]], token_budget: int) -> str:
+    """
+    Every table's column names for the merger, within `token_budget` tokens.
+
+    Falls back to key-like columns only (what joins are spotted on), then to as many
+    tables as fit with a count of the ones left out.
+    """
+    tables = [(data_dict.get("filename", f"table_{index}"), _table_columns(data_dict))
+              for index, data_dict in enumerate(data_dicts) if isinstance(data_dict, dict)]
+    index_text = f"Dataset index: {json.dumps(dict(tables))}"
+    if count_tokens(index_text) <= token_budget:
+        return index_text
+
+    keys_only = [(name, [column for column in columns if KEY_COLUMN.search(column)]) for name, columns in tables]
+    index_text = f"Dataset index (key columns only): {json.dumps(dict(keys_only))}"
+    if count_tokens(index_text) <= token_budget:
+        return index_text
+
+    # Counted per table, the sum is close enough to the joined text
+    kept, used = {}, count_tokens("Dataset index (key columns only, N more tables not listed): {}")
+    for name, columns in keys_only:
+        tokens = count_tokens(json.dumps({name: columns}))
+        if used + tokens > token_budget:
+            break
+        kept[name] = columns
+        used += tokens
+    return f"Dataset index (key columns only, {len(tables) - len(kept)} more tables not listed): {json.dumps(kept)}"
+
+
+def _fit(partial: Any, token_budget: int) -> Any:
+    """Trim a partial use case list (or raw answer) to `token_budget` tokens, dropping its last use cases first."""
+    if count_tokens(json.dumps(partial)) <= token_budget:
+        return partial
+    if isinstance(partial, list):
+        while len(partial) > 1 and count_tokens(json.dumps(partial)) > token_budget:
+            partial = partial[:-1]
+        if count_tokens(json.dumps(partial)) <= token_budget:
+            return partial
+    text = partial if isinstance(partial, str) else json.dumps(partial)
+    return text[:len(text) * token_budget // max(count_tokens(text), 1)]
+
+
+async def _merge_partials(data_dict_summarizer_client, scheduler: BoundedScheduler, metrics: Optional[List[Dict[str, Any]]],
+                          partials: List[str], data_dicts: Sequence[Dict[str, Any]], token_budget: int) -> str:
+    """Reduce step: merge partial use case lists in rounds until one answer is left."""
+    if len(partials) == 1:
+        return partials[0]
+
+    # Every table's column names, so the merger can spot joins across groups; capped so
+    # a large catalog can't push the merge prompt past the budget it is meant to keep
+    index_text = _dataset_index(data_dicts, int(token_budget * INDEX_BUDGET_SHARE))
+    budget = token_budget - count_tokens(index_text)
+
+    partial_lists = [_use_cases(partial) for partial in partials]
+    reduce_round = 0
+    while True:
+        batches: List[List[Any]] = []
+        batch_tokens: Optional[int] = None
+        for partial in partial_lists:
+            partial_tokens = count_tokens(json.dumps(partial))
+            if batches and batch_tokens + partial_tokens <= budget:
+                batches[-1].append(partial)
+                batch_tokens += partial_tokens
+            else:
+                batches.append([partial])
+                batch_tokens = partial_tokens
+
+        # Partials too big to share a batch: merge pairwise so every round still shrinks,
+        # trimmed so each pair still fits
+        if len(batches) == len(partial_lists):
+            batches = [[_fit(partial, budget // 2) for partial in partial_lists[position:position + 2]]
+                       for position in range(0, len(partial_lists), 2)]
+
+        merged = await asyncio.gather(*[
+            _ask(data_dict_summarizer_client, scheduler, metrics, f"Use_Case_Merger_{reduce_round}_{position}", data_dict_use_case_merger_prompt(),
+                 f"{index_text}\n\nPartial use case lists:\n{json.dumps(batch)}\n\nMerge the above use cases.")
+            for position, batch in enumerate(batches)
+        ])
+        if len(merged) == 1:
+            return merged[0]
+        partial_lists = [_use_cases(content) for content in merged]
+        reduce_round += 1
+
+
+async def summarize_hierarchical(data_dicts: Sequence[Dict[str, Any]], data_dict_summarizer_client,
+                                 token_budget: int = 16000, max_concurrency: int = 4,
+                                 scheduler: Optional[BoundedScheduler] = None,
+                                 metrics: Optional[List[Dict[str, Any]]] = None) -> str:
+    """
+    Suggest analytics use cases for dictionaries too large for one summarizer prompt.
+
+    Map: tables are grouped by shared key columns (`group_tables`) and every group is
+    summarized in parallel with the regular summarizer prompt. Reduce: the partial
+    use case lists, plus a compact index of every table's columns, are merged with
+    the merger prompt; if the partials themselves exceed the budget they are merged
+    in rounds until one answer is left.
+
+    Args:
+        data_dicts: Per-file data dictionaries as returned by `jsonify_prompt`
+        data_dict_summarizer_client: Model client for the summarizer
+        token_budget: Max tokens of data placed in a single prompt
+        max_concurrency: Max summarizer calls in flight, when no `scheduler` is given
+        scheduler: Scheduler the calls go through, shared with other model calls
+        metrics: Metrics list passed on to the scheduler
+
+    Returns:
+        str: The final summarizer answer (JSON with a "use_cases" list).
+    """
+    scheduler = scheduler or BoundedScheduler(max_in_flight=max_concurrency)
+
+    # Map: one use case list per group of related tables
+    groups = group_tables(data_dicts, token_budget)
+    partials = await asyncio.gather(*[
+        _summarize_group(data_dict_summarizer_client, scheduler, metrics, f"Data_Dictionary_Analytics_Suggester_{position}",
+                         [data_dicts[index] for index in group])
+        for position, group in enumerate(groups)
+    ])
+    return await _merge_partials(data_dict_summarizer_client, scheduler, metrics, list(partials), data_dicts, token_budget)
+
+
+class StreamingSummarizer:
+    """
+    Summarize groups of data dictionaries while the rest are still being generated.
+
+    Dictionaries are buffered in discovery order, whatever order their answers arrive
+    in, so the same files always form the same groups and prompts (cassette replay,
+    LLM cache hits). Once the buffer would exceed `token_budget` it is summarized in
+    the background (the map step of `summarize_hierarchical`, grouped by discovery
+    order instead of shared keys), and `finish` summarizes the remainder and merges
+    the partial lists. When everything fit in one buffer nothing is sent early and
+    `finish` returns None, so the caller can run the regular single-prompt summarizer
+    with the same result as before.
+    """
+
+    def __init__(self, data_dict_summarizer_client, token_budget: int = 16000, max_concurrency: int = 4,
+                 scheduler: Optional[BoundedScheduler] = None, metrics: Optional[List[Dict[str, Any]]] = None):
+        """
+        Args:
+            data_dict_summarizer_client: Model client for the summarizer
+            token_budget: Max tokens of data placed in a single prompt
+            max_concurrency: Max summarizer calls in flight, when no `scheduler` is given
+            scheduler: Scheduler the calls go through, shared with other model calls
+            metrics: Metrics list passed on to the scheduler
+        """
+        self.client = data_dict_summarizer_client
+        self.token_budget = token_budget
+        self._scheduler = scheduler or BoundedScheduler(max_in_flight=max_concurrency)
+        self._metrics = metrics
+        # Discovery index -> dictionary (None: nothing to summarize) waiting for the ones before it
+        self._arrived: Dict[int, Optional[Dict[str, Any]]] = {}
+        self._next = 0
+        self._buffer: List[Dict[str, Any]] = []
+        self._buffer_tokens = 0
+        self._partials: List[asyncio.Task] = []
+
+    def add(self, index: int, data_dict: Optional[Dict[str, Any]] = None):
+        """
+        Record the outcome of the file discovered at `index`.
+
+        Every index has to be reported once, with None for files that have nothing to
+        summarize (skipped, invalid or sharing another file's schema), so the ones
+        after it can move on to the buffer.
+        """
+        self._arrived[index] = data_dict
+        while self._next in self._arrived:
+            data_dict = self._arrived.pop(self._next)
+            self._next += 1
+            if data_dict is not None:
+                self._append(data_dict)
+
+    def _append(self, data_dict: Dict[str, Any]):
+        """Buffer one dictionary, sending the buffer off for a partial summary once it is full."""
+        tokens = count_tokens(json.dumps(data_dict))
+        if self._buffer and self._buffer_tokens + tokens > self.token_budget:
+            self._flush()
+        self._buffer.append(data_dict)
+        self._buffer_tokens += tokens
+
+    def _flush(self):
+        name = f"Data_Dictionary_Analytics_Suggester_{len(self._partials)}"
+        self._partials.append(asyncio.create_task(
+            _summarize_group(self.client, self._scheduler, self._metrics, name, self._buffer)))
+        self._buffer, self._buffer_tokens = [], 0
+
+    @property
+    def started(self) -> bool:
+        """True once at least one partial summary has been sent."""
+        return bool(self._partials)
+
+    async def finish(self, data_dicts: Sequence[Dict[str, Any]]) -> Optional[str]:
+        """
+        Summarize the remaining buffer and merge every partial list.
+
+        Args:
+            data_dicts: All data dictionaries, for the merger's dataset index
+
+        Returns:
+            Optional[str]: The final summarizer answer, or None if no partial summary was started.
+        """
+        # Indices never reported (a run cut short) no longer hold the rest back
+        for index in sorted(self._arrived):
+            data_dict = self._arrived.pop(index)
+            if data_dict is not None:
+                self._append(data_dict)
+        if not self._partials:
+            return None
+        if self._buffer:
+            self._flush()
+        partials = await asyncio.gather(*self._partials)
+        return await _merge_partials(self.client, self._scheduler, self._metrics, list(partials), data_dicts, self.token_budget)
+
+    async def aclose(self):
+        """Cancel partial summaries still running, e.g. when generation failed."""
+        for task in self._partials:
+            task.cancel()
+        await asyncio.gather(*self._partials, return_exceptions=True)
+
+
+def needs_hierarchical_summary(data_dicts: Sequence[Dict[str, Any]], token_budget: int) -> bool:
+    """True when the whole dictionary would not fit in one summarizer prompt."""
+    return count_tokens(f"{list(data_dicts)}") > token_budget
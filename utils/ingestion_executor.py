@@ -0,0 +1,145 @@
+import asyncio
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from .archive_source import dataset_suffix
+
+# pyarrow releases the GIL while decoding, so threads are enough for these formats.
+# The pandas C/openpyxl/json parsers hold it, so they need separate processes to scale.
+THREAD_FRIENDLY_EXTENSIONS = {'.parquet', '.feather', '.arrow'}
+
+EXECUTOR_MODES = ('auto', 'thread', 'process')
+
+
+def _timed_call(func: Callable, *args: Any) -> tuple:
+    """Run `func` inside the worker and return its result with the time spent running it."""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+class IngestionExecutor:
+    """
+    Dispatch blocking file parsing and profiling off the event loop.
+
+    Jobs are sent to a thread or process pool depending on `mode`, with at most
+    `max_concurrency` of them in flight at once. Every job's queue wait and run time
+    is recorded in `timings`.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, mode: str = 'auto', max_concurrency: Optional[int] = None,
+                 initializer: Optional[Callable] = None, initargs: tuple = ()):
+        """
+        Args:
+            max_workers: Size of each pool (default: number of CPUs)
+            mode: 'thread', 'process', or 'auto' to pick by file extension
+            max_concurrency: Max jobs submitted at once (default: max_workers)
+            initializer: Called with `initargs` in every worker process before its first
+                         job, to apply module-level configuration (e.g. `configure_excel`)
+                         that spawned workers don't inherit from the parent
+        """
+        if mode not in EXECUTOR_MODES:
+            raise ValueError(f"Unsupported executor mode '{mode}'. Choose from {', '.join(EXECUTOR_MODES)}.")
+
+        self.mode = mode
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_concurrency = max_concurrency or self.max_workers
+        self.initializer = initializer
+        self.initargs = initargs
+        self.timings: List[Dict[str, Any]] = []
+        self._pools: Dict[str, Executor] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _pool_kind(self, file_path: Optional[Union[str, Path]]) -> str:
+        if self.mode != 'auto':
+            return self.mode
+        if file_path is not None and dataset_suffix(file_path) in THREAD_FRIENDLY_EXTENSIONS:
+            return 'thread'
+        return 'process'
+
+    def _get_pool(self, kind: str) -> Executor:
+        if kind not in self._pools:
+            if kind == 'thread':
+                self._pools[kind] = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='ingest')
+            else:
+                self._pools[kind] = ProcessPoolExecutor(max_workers=self.max_workers, initializer=self.initializer, initargs=self.initargs)
+        return self._pools[kind]
+
+    async def run(self, func: Callable, *args: Any, file_path: Optional[Union[str, Path]] = None, label: Optional[str] = None) -> Any:
+        """
+        Run a blocking function in the pool and await its result.
+
+        Args:
+            func: Module-level function (must be picklable for the process pool)
+            *args: Positional arguments for `func`
+            file_path: File the job works on, used to pick the pool in 'auto' mode
+            label: Name recorded in `timings` (default: file name or function name)
+
+        Returns:
+            Whatever `func` returns.
+        """
+        # Semaphores bind to one event loop, make a new one if the executor outlives its loop
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+
+        kind = self._pool_kind(file_path)
+        label = label or (Path(file_path).name if file_path is not None else func.__name__)
+        queued_at = time.perf_counter()
+
+        async with self._semaphore:
+            started_at = time.perf_counter()
+            result, run_seconds = await loop.run_in_executor(self._get_pool(kind), _timed_call, func, *args)
+
+        self.timings.append({
+            'label': label,
+            'task': func.__name__,
+            'pool': kind,
+            'wait_seconds': round(started_at - queued_at, 4),
+            'run_seconds': round(run_seconds, 4),
+            'total_seconds': round(time.perf_counter() - queued_at, 4),
+        })
+        return result
+
+    def report(self) -> str:
+        """Format the recorded per-file timings as a plain text table, slowest first."""
+        lines = [f"{'File':<40} {'Task':<20} {'Pool':<8} {'Wait (s)':>9} {'Run (s)':>9}"]
+        for timing in sorted(self.timings, key=lambda t: t['run_seconds'], reverse=True):
+            lines.append(
+                f"{timing['label'][:40]:<40} {timing['task'][:20]:<20} {timing['pool']:<8} "
+                f"{timing['wait_seconds']:>9.3f} {timing['run_seconds']:>9.3f}"
+            )
+        return "\n".join(lines)
+
+    def shutdown(self):
+        """Shut down every pool that was started."""
+        for pool in self._pools.values():
+            pool.shutdown(wait=True)
+        self._pools.clear()
+
+
+_default_executor: Optional[IngestionExecutor] = None
+
+
+def configure_executor(max_workers: Optional[int] = None, mode: str = 'auto', max_concurrency: Optional[int] = None,
+                       initializer: Optional[Callable] = None, initargs: tuple = ()) -> IngestionExecutor:
+    """Replace the shared executor used by the data catalog helpers."""
+    global _default_executor
+    if _default_executor is not None:
+        _default_executor.shutdown()
+    _default_executor = IngestionExecutor(max_workers=max_workers, mode=mode, max_concurrency=max_concurrency,
+                                          initializer=initializer, initargs=initargs)
+    return _default_executor
+
+
+def get_executor() -> IngestionExecutor:
+    """Return the shared executor, creating one with default settings on first use."""
+    global _default_executor
+    if _default_executor is None:
+        _default_executor = IngestionExecutor()
+    return _default_executor
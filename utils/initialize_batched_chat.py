@@ -0,0 +1,110 @@
+import json
+from typing import Any, Dict, List, Optional, Sequence
+
+from autogen_agentchat.agents import AssistantAgent
+from autogen_agentchat.base import Response
+from autogen_agentchat.messages import TextMessage
+from prompts import data_dict_batch_generator_prompt
+
+from . import _fix_file_name
+from .initialize_classified_chat import initialize_classified_chat
+from .initialize_individual_chat import initialize_individual_chat
+from .metadata_serializer import serialize_metadata
+from .prompt_layout import system_prompt_filenames
+from .telemetry import stage_span
+
+
+ColumnClasses = Optional[Dict[str, Dict[str, Any]]]
+
+
+async def _initialize_single(filename: str, metadata: Any, column_classes: ColumnClasses, data_dict_generator_client) -> Response:
+    """One file on its own: with the classifier's results when there are any."""
+    if column_classes:
+        return await initialize_classified_chat(filename=filename, metadata=metadata, column_classes=column_classes,
+                                                data_dict_generator_client=data_dict_generator_client)
+    return await initialize_individual_chat(filename=filename, metadata=metadata, data_dict_generator_client=data_dict_generator_client)
+
+
+def _apply_classes(data_dict: Dict[str, Any], column_classes: ColumnClasses) -> Dict[str, Any]:
+    """Format/Nullable of classified columns come from the rules, whatever the model answered."""
+    if not column_classes:
+        return data_dict
+    columns = []
+    for entry in data_dict.get("columns", []):
+        classes = column_classes.get(entry.get("Column")) if isinstance(entry, dict) else None
+        if classes is not None:
+            entry = {**entry, "Format": classes["Format"], "Nullable": classes["Nullable"]}
+            # Non-nullable only as far as the classifier's sample goes
+            if "Nullable Basis" in classes:
+                entry["Nullable Basis"] = classes["Nullable Basis"]
+        columns.append(entry)
+    return {**data_dict, "columns": columns}
+
+
+async def initialize_batched_chat(filenames: Sequence[str], metadatas: Sequence[Any], data_dict_generator_client,
+                                  column_classes: Optional[Sequence[ColumnClasses]] = None) -> List[Response]:
+    """
+    Generate the data dictionaries of several small files with a single model call.
+
+    The combined answer is split back into one Response per file, each holding that
+    file's `{"filename": ..., "columns": [...]}` JSON, so the result can go straight
+    to `jsonify_prompt` in the same order as `filenames`. Files missing from (or
+    unparseable in) the combined answer fall back to their own individual call.
+    Classified columns keep the classifier's Format/Nullable either way.
+
+    Args:
+        filenames: Names of the packed files
+        metadatas: Column samples of each file, same order as `filenames`
+        data_dict_generator_client: Model client for the generator
+        column_classes: Rule-based {"Format", "Nullable"} per column of each file (None: not
+                        classified); they replace the model's Format/Nullable in the
+                        combined answer, and files generated on their own go through
+                        `initialize_classified_chat`
+
+    Returns:
+        List[Response]: One response per file, in the order of `filenames`.
+    """
+    column_classes = list(column_classes) if column_classes is not None else [None] * len(filenames)
+    if len(filenames) == 1:
+        return [await _initialize_single(filenames[0], metadatas[0], column_classes[0], data_dict_generator_client)]
+
+    fixed_names = [await _fix_file_name(filename) for filename in filenames]
+    agent_name = "File_handler_batch_" + "_".join(fixed_names)[:48]
+
+    file_handler = AssistantAgent(
+        name=agent_name,
+        description=f"A file handling agent for the files {', '.join(filenames)}.",
+        model_client=data_dict_generator_client,
+        system_message=data_dict_batch_generator_prompt(system_prompt_filenames(filenames)),
+    )
+
+    encoded = [serialize_metadata(metadata) for metadata in metadatas]
+    # Multi-line encodings (markdown, csv) start on their own line under the file name
+    blocks = "\n".join(f"- {filename}:\n{block}" if "\n" in block else f"- {filename}: {block}"
+                       for filename, block in zip(filenames, encoded))
+    with stage_span("initialize_batched_chat", files=len(filenames)) as span:
+        response = await file_handler.on_messages(
+            [TextMessage(content=f"You are a file handling agent for the files {', '.join(filenames)}. The metadata of each file is as follow:\n{blocks}", source="user")], cancellation_token=None,
+        )
+        usage = response.chat_message.models_usage
+        if usage is not None:
+            span.set_attribute("gen_ai.usage.input_tokens", usage.prompt_tokens)
+            span.set_attribute("gen_ai.usage.output_tokens", usage.completion_tokens)
+
+    # Split the combined answer into per-file dictionaries
+    by_filename = {}
+    try:
+        for data_dict in json.loads(response.chat_message.content).get("data_dictionaries", []):
+            if isinstance(data_dict, dict) and data_dict.get("filename") in filenames:
+                by_filename[data_dict["filename"]] = data_dict
+    except (ValueError, AttributeError):
+        pass
+
+    responses = []
+    for filename, metadata, file_classes in zip(filenames, metadatas, column_classes):
+        if filename in by_filename:
+            data_dict = _apply_classes(by_filename[filename], file_classes)
+            responses.append(Response(chat_message=TextMessage(content=json.dumps(data_dict), source=agent_name)))
+        else:
+            responses.append(await _initialize_single(filename, metadata, file_classes, data_dict_generator_client))
+    return responses
@@ -0,0 +1,102 @@
+import json
+from typing import Any, Dict, List, Optional
+
+from autogen_agentchat.agents import AssistantAgent
+from autogen_agentchat.base import Response
+from autogen_agentchat.messages import TextMessage
+from prompts import data_dict_classified_generator_prompt
+
+from . import _fix_file_name
+from .initialize_individual_chat import initialize_individual_chat
+from .metadata_serializer import serialize_metadata
+from .prompt_layout import system_prompt_filename
+from .telemetry import stage_span
+
+
+def _samples(values: List[Optional[str]]) -> List[str]:
+    return [value for value in values if value is not None]
+
+
+async def initialize_classified_chat(filename: str, metadata: Dict[str, List[Optional[str]]], column_classes: Dict[str, Dict[str, Any]],
+                                     data_dict_generator_client) -> Response:
+    """
+    Generate a file's data dictionary, asking the model only for what the rules couldn't detect.
+
+    Columns in `column_classes` get their Format and Nullable from the classifier and
+    the model is asked for their description only; the other columns get a full entry
+    from the model. Sample values are filled in from `metadata` instead of being
+    restated by the model. Falls back to `initialize_individual_chat` when nothing was
+    classified or the answer misses a column.
+
+    Args:
+        filename: Name of the file
+        metadata: Column samples of the file
+        column_classes: Rule-based {"Format", "Nullable"} per classified column
+        data_dict_generator_client: Model client for the generator
+
+    Returns:
+        Response: Holding the file's `{"filename": ..., "columns": [...]}` JSON, like `initialize_individual_chat`.
+    """
+    classified = {column: column_classes[column] for column in metadata if column in column_classes}
+    if not classified:
+        return await initialize_individual_chat(filename=filename, metadata=metadata, data_dict_generator_client=data_dict_generator_client)
+
+    file_name_fixed = await _fix_file_name(filename)
+    agent_name = f"File_handler_{file_name_fixed}"
+    unclassified = {column: samples for column, samples in metadata.items() if column not in classified}
+    known = serialize_metadata({column: metadata[column] for column in classified},
+                               formats={column: classes["Format"] for column, classes in classified.items()})
+
+    with stage_span("initialize_classified_chat", file=filename, classified_columns=len(classified), columns=len(metadata)) as span:
+        file_handler = AssistantAgent(
+            name=agent_name,
+            description=f"A file handling agent specific for the file {filename}.",
+            model_client=data_dict_generator_client,
+            system_message=data_dict_classified_generator_prompt(system_prompt_filename(filename)),
+        )
+        response = await file_handler.on_messages(
+            [TextMessage(content=f"You are a file handling agent for the file {filename}. "
+                                 f"Unclassified columns: {serialize_metadata(unclassified)}. Classified columns: {known}.", source="user")],
+            cancellation_token=None,
+        )
+        usage = response.chat_message.models_usage
+        if usage is not None:
+            span.set_attribute("gen_ai.usage.input_tokens", usage.prompt_tokens)
+            span.set_attribute("gen_ai.usage.output_tokens", usage.completion_tokens)
+
+    try:
+        answer = json.loads(response.chat_message.content)
+        entries = {entry["Column"]: entry for entry in answer.get("columns", []) if isinstance(entry, dict) and "Column" in entry}
+        descriptions = answer.get("descriptions", {})
+    except (ValueError, AttributeError):
+        entries, descriptions = None, None
+    if entries is None or not isinstance(descriptions, dict) or any(column not in entries for column in unclassified):
+        return await initialize_individual_chat(filename=filename, metadata=metadata, data_dict_generator_client=data_dict_generator_client)
+
+    # Back to the regular dictionary layout, in the file's column order
+    columns = []
+    for column, samples in metadata.items():
+        if column in classified:
+            entry = {
+                "Column": column,
+                "Description": descriptions.get(column, ""),
+                "Format": classified[column]["Format"],
+                "Nullable": classified[column]["Nullable"],
+            }
+            # Non-nullable only as far as the classifier's sample goes
+            if "Nullable Basis" in classified[column]:
+                entry["Nullable Basis"] = classified[column]["Nullable Basis"]
+            entry["Sample Values"] = _samples(samples)
+            columns.append(entry)
+        else:
+            entry = entries[column]
+            columns.append({
+                "Column": column,
+                "Description": entry.get("Description", ""),
+                "Format": entry.get("Format", "None"),
+                "Nullable": entry.get("Nullable", False),
+                "Sample Values": _samples(samples),
+            })
+
+    content = json.dumps({"filename": filename, "columns": columns})
+    return Response(chat_message=TextMessage(content=content, source=agent_name, models_usage=response.chat_message.models_usage))
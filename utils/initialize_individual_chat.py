@@ -3,20 +3,29 @@ from . import _fix_file_name
 from autogen_agentchat.agents import AssistantAgent
 from autogen_agentchat.messages import TextMessage
 from prompts import data_dict_generator_prompt
+from .metadata_serializer import serialize_metadata
+from .prompt_layout import system_prompt_filename
+from .telemetry import stage_span
 
 async def initialize_individual_chat(filename: str, metadata, data_dict_generator_client):
     
-    file_name_fixed = await _fix_file_name(filename)
-    
-    # Initialize agents dynamically
-    file_handler = AssistantAgent(
-        name=f"File_handler_{file_name_fixed}",
-        description=f"A file handling agent specific for the file {filename}.",
-        model_client=data_dict_generator_client,
-        system_message=data_dict_generator_prompt(filename),
-    )
-    
-    response = await file_handler.on_messages(
-        [TextMessage(content=f"You are a file handling agent for the file {filename}. The file metadata is as follow: {str(metadata)}.", source="user")], cancellation_token=None,
-    )
-    return response
\ No newline at end of file
+    with stage_span("initialize_individual_chat", file=filename) as span:
+        file_name_fixed = await _fix_file_name(filename)
+        
+        # Initialize agents dynamically
+        file_handler = AssistantAgent(
+            name=f"File_handler_{file_name_fixed}",
+            description=f"A file handling agent specific for the file {filename}.",
+            model_client=data_dict_generator_client,
+            system_message=data_dict_generator_prompt(system_prompt_filename(filename)),
+        )
+        
+        response = await file_handler.on_messages(
+            [TextMessage(content=f"You are a file handling agent for the file {filename}. The file metadata is as follow: {serialize_metadata(metadata)}.", source="user")], cancellation_token=None,
+        )
+        # Token counts per file; request latency is on the child llm_create span
+        usage = response.chat_message.models_usage
+        if usage is not None:
+            span.set_attribute("gen_ai.usage.input_tokens", usage.prompt_tokens)
+            span.set_attribute("gen_ai.usage.output_tokens", usage.completion_tokens)
+        return response
\ No newline at end of file
@@ -0,0 +1,175 @@
+import asyncio
+import json
+import os
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from .telemetry import metrics
+
+_STATUS_TEXT = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                409: "Conflict", 500: "Internal Server Error"}
+# Fields of a job listed by GET /jobs; GET /jobs/<id> adds the result
+_SUMMARY_FIELDS = ("job_id", "path", "status", "submitted_at", "started_at", "finished_at", "error")
+
+
+class JobServer:
+    """
+    Minimal asyncio HTTP API running pipeline jobs inside a long-lived process.
+
+    Jobs run on the server's event loop, so they share whatever the process keeps
+    warm: model clients and their connection pools, caches, the executor and the
+    scheduler's cap on requests in flight. At most `max_jobs` run at once, the rest
+    wait in submission order.
+
+    Endpoints:
+        POST   /jobs        {"path": "<folder or file>"} -> 202 {"job_id", "status", ...}
+        GET    /jobs        Every known job, without results
+        GET    /jobs/<id>   One job; "result" is set once its status is "done"
+        DELETE /jobs/<id>   Cancel a queued or running job
+        GET    /health      Liveness and job counts
+        GET    /metrics     Prometheus text exposition
+    """
+
+    def __init__(self, run_job: Callable[[str], Awaitable[Any]], max_jobs: int = 2, max_finished: int = 100):
+        """
+        Args:
+            run_job: Runs the pipeline on a folder or file path and returns a JSON-serializable result
+            max_jobs: Jobs running concurrently
+            max_finished: Finished jobs kept for GET before the oldest are forgotten
+        """
+        self.run_job = run_job
+        self.max_jobs = max(1, max_jobs)
+        self.max_finished = max_finished
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8080) -> asyncio.AbstractServer:
+        self._slots = asyncio.Semaphore(self.max_jobs)
+        self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server
+
+    async def serve_forever(self, host: str = "127.0.0.1", port: int = 8080):
+        server = await self.start(host, port)
+        async with server:
+            await server.serve_forever()
+
+    async def close(self):
+        """Stop accepting requests and cancel the jobs still queued or running."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for task in list(self._tasks.values()):
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+
+    def submit(self, path: str) -> Dict[str, Any]:
+        """Queue a job for `path` and return its record."""
+        job_id = uuid.uuid4().hex[:12]
+        job = {"job_id": job_id, "path": path, "status": "queued", "submitted_at": time.time(),
+               "started_at": None, "finished_at": None, "error": None, "result": None}
+        self.jobs[job_id] = job
+        self._tasks[job_id] = asyncio.create_task(self._execute(job))
+        metrics.increment("autogen_daemon_jobs_total", status="submitted")
+        return job
+
+    async def _execute(self, job: Dict[str, Any]):
+        try:
+            async with self._slots:
+                job["status"] = "running"
+                job["started_at"] = time.time()
+                job["result"] = await self.run_job(job["path"])
+                job["status"] = "done"
+        except asyncio.CancelledError:
+            job["status"] = "cancelled"
+        except Exception as e:
+            job["status"] = "failed"
+            job["error"] = f"{type(e).__name__}: {e}"
+        finally:
+            job["finished_at"] = time.time()
+            self._tasks.pop(job["job_id"], None)
+            metrics.increment("autogen_daemon_jobs_total", status=job["status"])
+            if job["started_at"] is not None:
+                metrics.observe("autogen_daemon_job_duration_seconds", job["finished_at"] - job["started_at"], status=job["status"])
+            self._forget_old_jobs()
+
+    def _forget_old_jobs(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job["finished_at"] is not None]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self.jobs[job_id]
+
+    def _route(self, method: str, path: str, body: bytes) -> Tuple[int, Any]:
+        parts = [part for part in path.split("/") if part]
+
+        if parts == ["health"] and method == "GET":
+            counts = {}
+            for job in self.jobs.values():
+                counts[job["status"]] = counts.get(job["status"], 0) + 1
+            return 200, {"status": "ok", "max_jobs": self.max_jobs, "jobs": counts}
+
+        if parts == ["metrics"] and method == "GET":
+            return 200, metrics.render()
+
+        if parts == ["jobs"]:
+            if method == "GET":
+                return 200, {"jobs": [{field: job[field] for field in _SUMMARY_FIELDS} for job in self.jobs.values()]}
+            if method == "POST":
+                try:
+                    request = json.loads(body or b"{}")
+                    path = request["path"]
+                except (ValueError, KeyError, TypeError):
+                    return 400, {"error": 'Expected a JSON body like {"path": "<folder or file>"}'}
+                if not isinstance(path, str) or not os.path.exists(path):
+                    return 400, {"error": f"Path not found: {path}"}
+                job = self.submit(path)
+                return 202, {field: job[field] for field in _SUMMARY_FIELDS}
+            return 405, {"error": f"{method} not allowed on /jobs"}
+
+        if len(parts) == 2 and parts[0] == "jobs":
+            job = self.jobs.get(parts[1])
+            if job is None:
+                return 404, {"error": f"Unknown job {parts[1]}"}
+            if method == "GET":
+                return 200, job
+            if method == "DELETE":
+                task = self._tasks.get(parts[1])
+                if task is None:
+                    return 409, {"error": f"Job {parts[1]} already {job['status']}"}
+                task.cancel()
+                return 200, {"job_id": parts[1], "status": "cancelling"}
+            return 405, {"error": f"{method} not allowed on /jobs/<id>"}
+
+        return 404, {"error": f"Unknown path {path}"}
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            try:
+                method, target, _ = (await reader.readline()).decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length") or 0))
+                status, payload = self._route(method.upper(), target.split("?")[0], body)
+            except (ValueError, asyncio.IncompleteReadError):
+                status, payload = 400, {"error": "Malformed HTTP request"}
+            except Exception as e:
+                status, payload = 500, {"error": f"{type(e).__name__}: {e}"}
+
+            if isinstance(payload, str):
+                content, content_type = payload.encode(), "text/plain; version=0.0.4"
+            else:
+                content, content_type = json.dumps(payload, default=str).encode(), "application/json"
+            writer.write(f"HTTP/1.1 {status} {_STATUS_TEXT.get(status, '')}\r\n"
+                         f"Content-Type: {content_type}\r\nContent-Length: {len(content)}\r\nConnection: close\r\n\r\n".encode("latin-1"))
+            writer.write(content)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
@@ -2,13 +2,59 @@ import json
 from datetime import datetime
 import os
 
-async def jsonify_prompt(responses):
+
+def parse_use_cases(content: str):
+    """
+    Parse the summarizer's answer into JSON, or keep the raw text if it isn't JSON.
+
+    The summarizer prompt shows its format as a bare `"use_cases": [...]` member, so
+    answers without the enclosing braces are accepted too.
+    """
+    for candidate in (content, "{" + content + "}"):
+        try:
+            return json.loads(candidate)
+        except ValueError:
+            continue
+    return content
+
+
+def write_generation_log(filepath: str, data_dicts: list, use_cases=None, invalid=None):
+    """
+    Atomically write the generation log as a single valid JSON document.
+
+    The content goes to a temporary file that replaces `filepath` only once it is
+    complete, so an interrupted run never leaves a half-written log behind.
+
+    Args:
+        filepath: Log file to (re)write
+        data_dicts: Parsed data dictionaries
+        use_cases: Summarizer answer, raw or parsed; omitted when None
+        invalid: (filename, error) of generator answers that weren't valid JSON
+                 and were left out of `data_dicts`; omitted when empty
+    """
+    payload = {"Data_Dictionaries": data_dicts}
+    if invalid:
+        payload["Invalid_Responses"] = [{"filename": filename, "error": error} for filename, error in invalid]
+    if use_cases is not None:
+        parsed = parse_use_cases(use_cases) if isinstance(use_cases, str) else use_cases
+        payload.update(parsed if isinstance(parsed, dict) else {"use_cases": parsed})
+
+    temp_path = f"{filepath}.tmp"
+    with open(temp_path, 'w') as f:
+        json.dump(payload, f, indent=4)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, filepath)
+
+async def jsonify_prompt(responses, invalid=None):
     """
     Convert a list of LLM responses into JSON format and save to a timestamped file.
 
     Args:
         responses (list): List of LLM response objects containing chat_message attributes
                          with JSON content strings
+        invalid (list): (filename, error) of answers already left out because they
+                        weren't valid JSON, recorded in the log as "Invalid_Responses"
 
     Returns:
         list: List of parsed JSON objects from the responses
@@ -16,14 +62,14 @@ async def jsonify_prompt(responses):
     The function:
     1. Converts each response's chat_message content into a JSON object
     2. Creates a 'generation_log' directory if it doesn't exist 
-    3. Saves raw responses to a timestamped JSON file in the format:
-       'generated_data_dict_YYYYMMDDHHMM.json'
+    3. Atomically saves the parsed responses as a valid JSON document
+       '{"Data_Dictionaries": [...]}' to 'generation_log/Log_YYYYMMDDHHMM.log'
     4. Returns the parsed JSON objects from the responses
 
     Example:
         responses = [Response(chat_message=Message(content='{"key": "value"}'))]
         json_objects = await jsonify_prompt(responses)
-        # Creates file: generated_data_dict_202401201430.json
+        # Creates file: generation_log/Log_202401201430.log
         # Returns: [{"key": "value"}]
     """
     # Turn list of LLM responses into list of JSON objects
@@ -37,24 +83,15 @@ async def jsonify_prompt(responses):
     timestamp = datetime.now().strftime("%Y%m%d%H%M")
     filename = f"Log_{timestamp}.log"
     
-    # Combine directory and filename
+    # Combine directory and filename, runs finishing within the same minute (daemon jobs) get a suffix
     filepath = os.path.join(directory, filename)
+    suffix = 1
+    while os.path.exists(filepath):
+        suffix += 1
+        filepath = os.path.join(directory, f"Log_{timestamp}_{suffix}.log")
     
-    # Save each dictionary in the list
-    with open(filepath, 'w') as f:
-        # Write opening bracket for JSON array
-        f.write('{"Data_Dictionaries":[\n')
-        
-        # Write each dictionary
-        for i, item in enumerate(json_response):
-            json.dump(item, f, indent=4)
-            if i < len(json_response) - 1:
-                f.write(',\n')
-            else:
-                f.write('\n')
-                
-        # Write closing bracket
-        f.write('],')
+    # Written atomically as valid JSON; main adds the use cases to the same file later
+    write_generation_log(filepath, json_response, invalid=invalid)
         
     print(f"\nData saved to: {filepath}")
     return json_response, filepath  # Return filename for reference
\ No newline at end of file
@@ -0,0 +1,160 @@
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Mapping, Optional, Sequence, Union
+
+from autogen_core import CancellationToken
+from autogen_core.models import ChatCompletionClient, CreateResult, LLMMessage
+from autogen_core.tools import Tool, ToolSchema
+
+from .client_wrapper import ChatCompletionClientWrapper, request_key, sampling_config
+
+DEFAULT_LLM_CACHE_PATH = ".cache/llm_cache.sqlite"
+
+
+class LLMResponseCache:
+    """
+    Persistent SQLite store for model responses.
+
+    Entries older than `ttl_seconds` are never served, and once there are more than
+    `max_entries` the least recently used ones are deleted.
+    """
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_LLM_CACHE_PATH, ttl_seconds: Optional[float] = 7 * 24 * 3600,
+                 max_entries: Optional[int] = 10_000):
+        """
+        Args:
+            path: SQLite database file
+            ttl_seconds: Age after which an entry expires (None: never)
+            max_entries: Entry count above which LRU entries are evicted (None: unbounded)
+        """
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " last_access REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS responses_last_access ON responses(last_access)")
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None and self.ttl_seconds is not None and now - row[1] > self.ttl_seconds:
+                with self._conn:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            with self._conn:
+                self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return row[0]
+
+    def set(self, key: str, value: str):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            self._evict(now)
+
+    def _evict(self, now: float):
+        if self.ttl_seconds is not None:
+            self._conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,))
+        if self.max_entries is not None:
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                " SELECT key FROM responses ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def clear(self) -> int:
+        with self._lock, self._conn:
+            return self._conn.execute("DELETE FROM responses").rowcount
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return {'hits': self.hits, 'misses': self.misses, 'entries': entries}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class CachedChatCompletionClient(ChatCompletionClientWrapper):
+    """
+    Serve repeated requests from an `LLMResponseCache` instead of the model.
+
+    The key covers the model name and sampling parameters of the wrapped client
+    (seed, temperature, penalties, ...), the system and user messages, tools and
+    any per-call overrides, so any change in input is a miss. With `validate`, only
+    results it accepts are stored or served, so an unusable answer is asked again
+    instead of being replayed on every run.
+    """
+
+    def __init__(self, client: ChatCompletionClient, cache: LLMResponseCache,
+                 validate: Optional[Callable[[CreateResult], bool]] = None):
+        super().__init__(client)
+        self.cache = cache
+        self.validate = validate
+        self._sampling_config = sampling_config(client)
+
+    def _key(self, messages: Sequence[LLMMessage], tools: Sequence[Tool | ToolSchema],
+             json_output: Optional[bool], extra_create_args: Mapping[str, Any]) -> str:
+        return request_key(self._sampling_config, messages, tools, json_output, extra_create_args)
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        json_output: Optional[bool] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        key = self._key(messages, tools, json_output, extra_create_args)
+        cached = self.cache.get(key)
+        if cached is not None:
+            result = CreateResult.model_validate_json(cached)
+            if self.validate is None or self.validate(result):
+                result.cached = True
+                return result
+
+        result = await self.client.create(
+            messages,
+            tools=tools,
+            json_output=json_output,
+            extra_create_args=extra_create_args,
+            cancellation_token=cancellation_token,
+        )
+        if self.validate is None or self.validate(result):
+            self.cache.set(key, result.model_dump_json())
+        return result
+
+
+def is_json_result(result: CreateResult) -> bool:
+    """Whether a model answer is a JSON document, for `CachedChatCompletionClient(validate=...)`."""
+    if not isinstance(result.content, str):
+        return False
+    try:
+        json.loads(result.content)
+        return True
+    except ValueError:
+        return False
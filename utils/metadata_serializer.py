@@ -0,0 +1,153 @@
+import csv
+import io
+import json
+from typing import Callable, Dict, List, Optional
+
+from .token_counter import count_tokens
+
+# Longest sample value placed in a prompt; longer values are cut with an ellipsis
+DEFAULT_MAX_VALUE_CHARS = 200
+
+Metadata = Dict[str, List[Optional[str]]]
+Serializer = Callable[[Metadata, Optional[Dict[str, str]]], str]
+
+
+def truncate_value(value: Optional[str], max_value_chars: Optional[int]) -> Optional[str]:
+    """Cut a sample value to `max_value_chars` characters (None: no limit), marking the cut with an ellipsis."""
+    if value is None or max_value_chars is None or len(value) <= max_value_chars:
+        return value
+    return value[:max(max_value_chars - 1, 0)] + "…"
+
+
+def _repr(metadata: Metadata, formats: Optional[Dict[str, str]]) -> str:
+    if formats is None:
+        return str(metadata)
+    return str({column: {"Format": formats[column], "Sample Values": [value for value in values if value is not None]}
+                for column, values in metadata.items()})
+
+
+def _json(metadata: Metadata, formats: Optional[Dict[str, str]]) -> str:
+    if formats is not None:
+        metadata = {column: {"Format": formats[column], "Sample Values": [value for value in values if value is not None]}
+                    for column, values in metadata.items()}
+    return json.dumps(metadata, ensure_ascii=False, separators=(',', ':'))
+
+
+def _table_rows(metadata: Metadata, formats: Optional[Dict[str, str]]) -> List[List[str]]:
+    width = max((len(values) for values in metadata.values()), default=0)
+    header = ["Column"] + (["Format"] if formats is not None else []) + [f"Sample {index + 1}" for index in range(width)]
+    rows = [header]
+    for column, values in metadata.items():
+        cells = [column] + ([formats[column]] if formats is not None else [])
+        cells += ["" if value is None else value for value in values] + [""] * (width - len(values))
+        rows.append(cells)
+    return rows
+
+
+def _markdown(metadata: Metadata, formats: Optional[Dict[str, str]]) -> str:
+    def cell(text: str) -> str:
+        return str(text).replace("|", "\\|").replace("\r", " ").replace("\n", " ")
+
+    rows = _table_rows(metadata, formats)
+    lines = ["| " + " | ".join(cell(text) for text in rows[0]) + " |", "|" + "---|" * len(rows[0])]
+    lines += ["| " + " | ".join(cell(text) for text in row) + " |" for row in rows[1:]]
+    return "\n".join(lines)
+
+
+def _csv(metadata: Metadata, formats: Optional[Dict[str, str]]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerows(_table_rows(metadata, formats))
+    return buffer.getvalue().rstrip("\n")
+
+
+# One column per row for the tabular encodings, so wide files stay readable
+SERIALIZERS: Dict[str, Serializer] = {
+    'repr': _repr,
+    'json': _json,
+    'markdown': _markdown,
+    'csv': _csv,
+}
+# Formats that fit on one line, e.g. after "- filename: " in a packed request
+SINGLE_LINE_FORMATS = {'repr', 'json'}
+
+_format = 'repr'
+_max_value_chars: Optional[int] = DEFAULT_MAX_VALUE_CHARS
+
+
+def register_serializer(name: str, serializer: Serializer, single_line: bool = False):
+    """
+    Add a metadata encoding.
+
+    Args:
+        name: Name used with `configure_serializer` and `serialize_metadata`
+        serializer: Called with the (already truncated) metadata and an optional
+                    column -> detected format mapping; returns the prompt text
+        single_line: Whether the output never contains line breaks
+    """
+    SERIALIZERS[name] = serializer
+    if single_line:
+        SINGLE_LINE_FORMATS.add(name)
+
+
+def configure_serializer(metadata_format: str = 'repr', max_value_chars: Optional[int] = DEFAULT_MAX_VALUE_CHARS):
+    """
+    Set the encoding the generator prompts use for file metadata.
+
+    Args:
+        metadata_format: A registered encoding, or 'auto' for the one with the fewest tokens per file
+        max_value_chars: Longest sample value kept (None: no limit)
+
+    Raises:
+        ValueError: If `metadata_format` is unknown
+    """
+    global _format, _max_value_chars
+    if metadata_format != 'auto' and metadata_format not in SERIALIZERS:
+        raise ValueError(f"Unknown metadata format {metadata_format!r}; expected 'auto' or one of {sorted(SERIALIZERS)}")
+    _format = metadata_format
+    _max_value_chars = max_value_chars
+
+
+def get_serializer_format() -> str:
+    return _format
+
+
+def serialize_metadata(metadata: Metadata, metadata_format: Optional[str] = None, max_value_chars: Optional[int] = -1,
+                       formats: Optional[Dict[str, str]] = None) -> str:
+    """
+    Encode a file's column samples for a prompt.
+
+    Args:
+        metadata: Column names mapped to their sample values
+        metadata_format: Encoding to use (default: the configured one; 'auto' picks the fewest tokens)
+        max_value_chars: Longest sample value kept (default: the configured cap; None: no limit)
+        formats: Detected format per column, added next to the samples
+
+    Returns:
+        str: The encoded metadata.
+    """
+    metadata_format = metadata_format or _format
+    max_value_chars = _max_value_chars if max_value_chars == -1 else max_value_chars
+    truncated = {str(column): [truncate_value(value, max_value_chars) for value in values] for column, values in metadata.items()}
+
+    if metadata_format == 'auto':
+        encoded = [SERIALIZERS[name](truncated, formats) for name in SERIALIZERS]
+        return min(encoded, key=count_tokens)
+    return SERIALIZERS[metadata_format](truncated, formats)
+
+
+def measure_serializers(metadatas: List[Metadata], max_value_chars: Optional[int] = -1) -> Dict[str, int]:
+    """
+    Tokens every registered encoding spends on the given files' metadata.
+
+    Args:
+        metadatas: Column samples of each file
+        max_value_chars: Longest sample value kept (default: the configured cap; None: no limit)
+
+    Returns:
+        Dict[str, int]: Encoding name mapped to its total token count, cheapest first.
+    """
+    totals = {
+        name: sum(count_tokens(serialize_metadata(metadata, name, max_value_chars)) for metadata in metadatas)
+        for name in SERIALIZERS
+    }
+    return dict(sorted(totals.items(), key=lambda item: item[1]))
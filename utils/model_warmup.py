@@ -0,0 +1,64 @@
+import asyncio
+import time
+from typing import Dict, List, Optional, Sequence
+
+import httpx
+
+
+async def _warm_up_endpoint(http: httpx.AsyncClient, base_url: str, model: str, system_prompts: Sequence[str],
+                            keep_alive: Optional[str], api_key: str) -> Optional[str]:
+    base_url = base_url.rstrip('/')
+    headers = {"Authorization": f"Bearer {api_key}"}
+    try:
+        # One-token completions load the model and leave each static system prompt in the prefix cache
+        for system_prompt in system_prompts or [""]:
+            messages = [{"role": "user", "content": "Reply with {}."}]
+            if system_prompt:
+                messages.insert(0, {"role": "system", "content": system_prompt})
+            body = {"model": model, "messages": messages, "max_tokens": 1, "temperature": 0}
+            if keep_alive:
+                body["keep_alive"] = keep_alive
+            response = await http.post(f"{base_url}/chat/completions", json=body, headers=headers)
+            response.raise_for_status()
+
+        # Ollama's OpenAI endpoint resets keep_alive to the server default, pin it with the native API
+        if keep_alive and base_url.endswith('/v1'):
+            try:
+                await http.post(f"{base_url[:-3]}/api/generate", json={"model": model, "keep_alive": keep_alive})
+            except httpx.HTTPError:
+                pass  # Not an Ollama server
+    except httpx.HTTPError as e:
+        return f"{model} at {base_url}: {type(e).__name__}: {e}"
+    return None
+
+
+async def warm_up_models(base_urls: Sequence[str], models: Dict[str, Sequence[str]], keep_alive: Optional[str] = "30m",
+                         api_key: str = "none", timeout: float = 600.0) -> float:
+    """
+    Load every model on every server before the first real request.
+
+    Each model gets a one-token completion per static system prompt, so the model is
+    resident and the prompts' prefixes are cached when the fan-out starts. Requests go
+    straight to the servers, bypassing the LLM cache and cassettes. Failures are
+    reported and otherwise ignored; the run then just pays the load on its first call.
+
+    Args:
+        base_urls: OpenAI-compatible base URLs
+        models: Model name mapped to the static system prompts worth caching (may be empty)
+        keep_alive: How long the server should keep the models loaded, e.g. "30m" (Ollama; None: server default)
+        api_key: Bearer token for the servers
+        timeout: Seconds to wait for a model to load
+
+    Returns:
+        float: Seconds spent warming up.
+    """
+    started_at = time.perf_counter()
+    async with httpx.AsyncClient(timeout=timeout) as http:
+        errors: List[Optional[str]] = await asyncio.gather(*(
+            _warm_up_endpoint(http, base_url, model, system_prompts, keep_alive, api_key)
+            for base_url in base_urls for model, system_prompts in models.items()
+        ))
+    for error in errors:
+        if error is not None:
+            print(f"\nWarm-up failed for {error}")
+    return time.perf_counter() - started_at
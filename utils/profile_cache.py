@@ -0,0 +1,199 @@
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .archive_source import source_identity
+
+# Bump whenever sampling or profiling output changes so stale entries are never served
+# 2: text checks on string/categorical columns, Arrow dtypes, metadata profiles of Arrow files
+# 3: sample-based "Nullable Basis" in column classes
+# 4: stricter phone numbers, zero-padded digit strings in column classes
+# 5: columns that first appear after the first chunk in samples
+CACHE_VERSION = "5"
+
+DEFAULT_CACHE_DIR = ".cache/data_catalog"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+# Eviction goes down to this share of the budget, so a full cache isn't rescanned on every write
+EVICT_TO = 0.9
+
+
+def _json_default(obj: Any) -> Any:
+    """Make numpy / pandas scalars in profiles JSON serialisable."""
+    if isinstance(obj, np.integer):
+        return int(obj)
+    if isinstance(obj, np.floating):
+        return float(obj)
+    if isinstance(obj, np.bool_):
+        return bool(obj)
+    if isinstance(obj, pd.Timestamp):
+        return obj.isoformat()
+    return str(obj)
+
+
+def _content_hash(file_path: Path, block_size: int = 1 << 20) -> str:
+    digest = hashlib.blake2b(digest_size=20)
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ProfileCache:
+    """
+    On-disk cache for column samples and dataset profiles.
+
+    Entries are keyed by the file's resolved path plus its size and mtime (or a hash of
+    its content), the kind of result, its parameters and `CACHE_VERSION`. Each entry is
+    one JSON file; reads refresh its mtime and the least recently used entries are
+    evicted once the directory grows past `max_bytes`. The directory's size is scanned
+    once and then tracked on every write; only a write that goes over budget scans it
+    again, evicting down to `EVICT_TO` of the budget.
+    """
+
+    def __init__(self, cache_dir: Union[str, Path] = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES,
+                 enabled: bool = True, content_hash: bool = False):
+        """
+        Args:
+            cache_dir: Directory holding the cache entries
+            max_bytes: Total size above which the oldest entries are evicted
+            enabled: If False every lookup misses and nothing is written
+            content_hash: Key on a hash of the file's bytes instead of size/mtime
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.content_hash = content_hash
+        self.hits = 0
+        self.misses = 0
+        # Bytes in the cache directory, None until the first write scans it
+        self._total_bytes: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def key(self, file_path: Union[str, Path], kind: str, **params: Any) -> str:
+        """Build the cache key for a file and the kind of result stored for it."""
+        # Archive members are keyed on the archive file plus the member's name and CRC
+        on_disk, member = source_identity(file_path)
+        on_disk = on_disk.resolve()
+        stat = on_disk.stat()
+        identity = {
+            'path': str(on_disk),
+            'kind': kind,
+            'params': params,
+            'version': CACHE_VERSION,
+            **member,
+        }
+        if self.content_hash:
+            identity['content'] = member.get('crc') or _content_hash(on_disk)
+        else:
+            identity['size'] = stat.st_size
+            identity['mtime_ns'] = stat.st_mtime_ns
+        return hashlib.sha256(json.dumps(identity, sort_keys=True, default=str).encode()).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None on a miss."""
+        if not self.enabled:
+            return None
+        entry = self._entry_path(key)
+        try:
+            with open(entry, 'r', encoding='utf-8') as f:
+                value = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self.misses += 1
+            return None
+        # Refresh recency for LRU eviction; the entry may have been evicted since the read
+        with contextlib.suppress(FileNotFoundError):
+            os.utime(entry, None)
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any):
+        """Store a value atomically, then evict old entries if over budget."""
+        if not self.enabled:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entry = self._entry_path(key)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(value, f, default=_json_default)
+            size = os.path.getsize(tmp_path)
+            with self._lock:
+                replaced = entry.stat().st_size if entry.exists() else 0
+                os.replace(tmp_path, entry)
+                if self._total_bytes is not None:
+                    self._total_bytes += size - replaced
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        if self._total_bytes is None or self._total_bytes > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in `EVICT_TO` of `max_bytes`."""
+        with self._lock:
+            self._total_bytes = self._evict()
+
+    def _evict(self) -> int:
+        entries = []
+        total = 0
+        for entry in self.cache_dir.glob('*.json'):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+            total += stat.st_size
+
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes * EVICT_TO:
+                break
+            try:
+                entry.unlink()
+                total -= size
+            except FileNotFoundError:
+                pass
+        return total
+
+    def clear(self) -> int:
+        """Remove every entry and return how many were deleted."""
+        self._total_bytes = None
+        removed = 0
+        if self.cache_dir.is_dir():
+            for entry in self.cache_dir.glob('*.json'):
+                entry.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+    def stats(self) -> Dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses}
+
+
+_default_cache: Optional[ProfileCache] = None
+
+
+def configure_cache(cache_dir: Union[str, Path] = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES,
+                    enabled: bool = True, content_hash: bool = False) -> ProfileCache:
+    """Replace the shared cache used by the data catalog helpers."""
+    global _default_cache
+    _default_cache = ProfileCache(cache_dir=cache_dir, max_bytes=max_bytes, enabled=enabled, content_hash=content_hash)
+    return _default_cache
+
+
+def get_cache() -> ProfileCache:
+    """Return the shared cache, creating one with default settings on first use."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ProfileCache()
+    return _default_cache
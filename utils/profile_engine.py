@@ -0,0 +1,157 @@
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Optional
+from tqdm import tqdm
+
+# Strings that mean "missing" but aren't parsed as NaN
+NULL_VARIANTS = ['NA', 'Na', 'na', 'NULL', 'Null', 'null', 'NAN', 'Nan', 'nan']
+
+NUMERIC_STATS = ('mean', 'median', 'std', 'min', 'max')
+
+
+def _is_text(dtype) -> bool:
+    """Object, string (including Arrow strings) and categorical columns, the ones that can hold "NULL" and friends."""
+    return dtype == 'object' or pd.api.types.is_string_dtype(dtype) or isinstance(dtype, pd.CategoricalDtype)
+
+
+def _json_sample(sample_value: Any) -> Any:
+    """Convert a sample value to an appropriate type for JSON compatibility."""
+    if isinstance(sample_value, (np.floating, float)):
+        return float(f"{sample_value:.2f}")
+    elif isinstance(sample_value, (np.integer, int)):
+        return int(sample_value)
+    elif isinstance(sample_value, pd.Timestamp):
+        return sample_value.isoformat()
+    else:
+        return str(sample_value) if sample_value is not None else None
+
+
+def profile_dataframe_loop(df: pd.DataFrame, file_name: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Reference column-by-column profiler.
+
+    Kept as the baseline for `benchmarks/profile_benchmark.py`; `profile_dataframe`
+    produces the same dict in a handful of whole-frame passes.
+    """
+    profile = {}
+
+    for col in tqdm(df.columns,
+                desc=f"Processing {len(df.columns)} columns ({file_name})",
+                bar_format="{desc:<70} {bar:30}|{n_fmt:>4}/{total_fmt:<4}",
+                colour="green"):
+        # Get non-null sample value
+        sample_series = df[col].dropna()
+        sample_value = sample_series.iloc[0] if not sample_series.empty else None
+
+        col_stats = {
+            'dtype': str(df[col].dtype),
+            'sample': _json_sample(sample_value),
+            'total_count': int(len(df[col])),
+            'null_count': int(df[col].isna().sum()),
+            'null_percentage': f"{(df[col].isna().sum() / len(df[col])) * 100:.1f}%",
+            'unique_count': int(df[col].nunique(dropna=True))
+        }
+
+        # Add numerical statistics if applicable
+        if pd.api.types.is_numeric_dtype(df[col]):
+            col_stats.update({
+                'mean': round(df[col].mean(), 2) if not df[col].dropna().empty else None,
+                'median': round(df[col].median(), 2) if not df[col].dropna().empty else None,
+                'std': round(df[col].std(), 2) if not df[col].dropna().empty else None,
+                'min': round(df[col].min(), 2) if not df[col].dropna().empty else None,
+                'max': round(df[col].max(), 2) if not df[col].dropna().empty else None
+            })
+
+        # Check for various null representations
+        if _is_text(df[col].dtype):
+            null_like_count = df[col].isin(NULL_VARIANTS).sum()
+            if null_like_count > 0:
+                col_stats['alternative_null_count'] = int(null_like_count)
+
+        profile[col] = col_stats
+
+    return profile
+
+
+def profile_dataframe(df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Profile every column of a DataFrame using batched whole-frame reductions.
+
+    Null counts, unique counts, first non-null samples and numeric statistics are each
+    computed once for all columns (numeric stats once per dtype so ints stay ints),
+    instead of re-scanning every column several times.
+
+    Args:
+        df (pd.DataFrame): Input DataFrame.
+
+    Returns:
+        Dict[str, Any]: Same per-column profile dict as `profile_dataframe_loop`.
+                        Boolean columns get their stats computed as 0/1 floats.
+    """
+    columns = list(df.columns)
+    total = len(df)
+
+    # One null mask for everything: null counts and first non-null row per column
+    notna = df.notna().to_numpy()
+    null_counts = total - notna.sum(axis=0)
+    has_value = notna.any(axis=0)
+    # A frame without rows has no first non-null row to look for
+    first_valid = notna.argmax(axis=0) if total else np.zeros(len(columns), dtype=np.int64)
+    unique_counts = df.nunique(dropna=True).to_numpy()
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        null_pcts = (null_counts / np.float64(total)) * 100
+
+    # Numeric reductions, one pass per statistic per dtype group
+    numeric_stats: Dict[int, Dict[str, Any]] = {}
+    numeric_positions = [i for i, dtype in enumerate(df.dtypes) if pd.api.types.is_numeric_dtype(dtype)]
+    groups: Dict[str, list] = {}
+    for i in numeric_positions:
+        groups.setdefault(str(df.dtypes.iloc[i]), []).append(i)
+    for dtype, positions in groups.items():
+        block = df.iloc[:, positions]
+        if pd.api.types.is_bool_dtype(block.dtypes.iloc[0]):
+            block = block.astype('float64')
+        reductions = {
+            'mean': block.mean().to_numpy(),
+            'median': block.median().to_numpy(),
+            'std': block.std().to_numpy(),
+            'min': block.min().to_numpy(),
+            'max': block.max().to_numpy(),
+        }
+        for offset, i in enumerate(positions):
+            numeric_stats[i] = {
+                stat: round(values[offset], 2) if has_value[i] else None
+                for stat, values in reductions.items()
+            }
+
+    # Alternative null strings only matter for text columns
+    object_positions = [i for i, dtype in enumerate(df.dtypes) if _is_text(dtype)]
+    null_like_counts = (
+        df.iloc[:, object_positions].isin(NULL_VARIANTS).sum().to_numpy()
+        if object_positions else np.array([], dtype=np.int64)
+    )
+    null_like = dict(zip(object_positions, null_like_counts))
+
+    profile = {}
+    for i, col in enumerate(columns):
+        sample_value = df.iat[first_valid[i], i] if has_value[i] else None
+
+        col_stats = {
+            'dtype': str(df.dtypes.iloc[i]),
+            'sample': _json_sample(sample_value),
+            'total_count': int(total),
+            'null_count': int(null_counts[i]),
+            'null_percentage': f"{null_pcts[i]:.1f}%",
+            'unique_count': int(unique_counts[i])
+        }
+
+        if i in numeric_stats:
+            col_stats.update(numeric_stats[i])
+
+        if null_like.get(i, 0) > 0:
+            col_stats['alternative_null_count'] = int(null_like[i])
+
+        profile[col] = col_stats
+
+    return profile
@@ -0,0 +1,37 @@
+from typing import List, Optional, Sequence
+
+# 'per-file' names the file in the system prompt; 'shared-prefix' keeps the system prompt
+# identical for every file so the model server can reuse its KV/prefix cache across requests
+PROMPT_LAYOUTS = ('per-file', 'shared-prefix')
+
+_layout = 'per-file'
+
+
+def configure_prompt_layout(layout: str = 'per-file'):
+    """
+    Set how the generator prompts are laid out.
+
+    Args:
+        layout: 'per-file' or 'shared-prefix'
+
+    Raises:
+        ValueError: If `layout` is unknown
+    """
+    global _layout
+    if layout not in PROMPT_LAYOUTS:
+        raise ValueError(f"Unsupported prompt layout '{layout}'. Choose from {', '.join(PROMPT_LAYOUTS)}.")
+    _layout = layout
+
+
+def get_prompt_layout() -> str:
+    return _layout
+
+
+def system_prompt_filename(filename: str) -> Optional[str]:
+    """File name to put in a generator system prompt, None when the prompt must stay static."""
+    return None if _layout == 'shared-prefix' else filename
+
+
+def system_prompt_filenames(filenames: Sequence[str]) -> Optional[List[str]]:
+    """File names to put in a batch generator system prompt, None when the prompt must stay static."""
+    return None if _layout == 'shared-prefix' else list(filenames)
@@ -0,0 +1,97 @@
+import copy
+import hashlib
+import json
+from typing import Any, Dict, List, Optional, Sequence
+
+# Coarse dtype families, so a partition whose int column picked up a NaN (float64)
+# still matches its siblings
+_KIND_PREFIXES = (
+    ('bool', 'boolean'),
+    ('int', 'numeric'),
+    ('uint', 'numeric'),
+    ('Int', 'numeric'),
+    ('UInt', 'numeric'),
+    ('float', 'numeric'),
+    ('Float', 'numeric'),
+    ('decimal', 'numeric'),
+    ('double', 'numeric'),
+    ('datetime', 'datetime'),
+    ('timestamp', 'datetime'),
+    ('date', 'datetime'),
+    ('timedelta', 'duration'),
+    ('duration', 'duration'),
+    ('category', 'text'),
+)
+
+
+def dtype_kind(dtype: str) -> str:
+    """Map a pandas/pyarrow dtype name to a coarse family: numeric, boolean, datetime, duration or text."""
+    for prefix, kind in _KIND_PREFIXES:
+        if dtype.startswith(prefix):
+            return kind
+    return 'text'
+
+
+def schema_fingerprint(dtypes: Dict[str, str]) -> str:
+    """
+    Fingerprint of a file's schema: its column names, in order, with their dtype family.
+
+    Args:
+        dtypes: Column names mapped to inferred dtype names
+
+    Returns:
+        str: Hex digest shared by every file with the same columns and dtype families.
+    """
+    schema = [[column, dtype_kind(dtype)] for column, dtype in dtypes.items()]
+    return hashlib.sha256(json.dumps(schema).encode()).hexdigest()[:16]
+
+
+def group_by_fingerprint(fingerprints: Sequence[Optional[str]]) -> List[List[int]]:
+    """
+    Group file indices by schema fingerprint, in order of first appearance.
+
+    The first index of every group is its representative. Files without a
+    fingerprint (e.g. unreadable ones) always get a group of their own.
+    """
+    groups: Dict[Any, List[int]] = {}
+    for index, fingerprint in enumerate(fingerprints):
+        groups.setdefault(fingerprint if fingerprint is not None else ('unique', index), []).append(index)
+    return list(groups.values())
+
+
+def fan_out_data_dict(data_dict: Dict[str, Any], filename: str, metadata: Dict[str, List[Optional[str]]]) -> Dict[str, Any]:
+    """
+    Reuse a representative file's data dictionary for another file with the same schema.
+
+    The descriptions, formats and nullability are kept; the file name and the sample
+    values are replaced by the member's own.
+    """
+    member = copy.deepcopy(data_dict)
+    member["filename"] = filename
+    for column in member.get("columns", []):
+        if isinstance(column, dict) and column.get("Column") in metadata:
+            column["Sample Values"] = [value for value in metadata[column["Column"]] if value is not None]
+    return member
+
+
+def summarizer_view(data_dicts: Sequence[Dict[str, Any]], schema_groups: Sequence[Sequence[int]]) -> List[Dict[str, Any]]:
+    """
+    One data dictionary per schema group, listing every file that shares it.
+
+    Args:
+        data_dicts: Per-file data dictionaries, every member included
+        schema_groups: Groups of indices into `data_dicts` from `group_by_fingerprint`
+
+    Returns:
+        List[Dict[str, Any]]: The representatives' dictionaries; groups of several
+                              files get a "files" list with all member file names.
+    """
+    view = []
+    for group in schema_groups:
+        representative = data_dicts[group[0]]
+        if len(group) > 1 and isinstance(representative, dict):
+            representative = dict(representative)
+            representative["files"] = [data_dicts[index].get("filename") if isinstance(data_dicts[index], dict) else None
+                                       for index in group]
+        view.append(representative)
+    return view
@@ -0,0 +1,162 @@
+import math
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+def _hash_values(values: pd.Series) -> np.ndarray:
+    """
+    Hash non-null values to uint64 so equal values hash equally across chunks.
+
+    Numbers are hashed as float64 so a column that is int in one chunk and float in
+    the next (because of a NaN) doesn't count 1 and 1.0 twice.
+    """
+    if pd.api.types.is_bool_dtype(values) or pd.api.types.is_numeric_dtype(values):
+        array = values.to_numpy(dtype='float64')
+    elif pd.api.types.is_datetime64_any_dtype(values):
+        array = values.astype('int64').to_numpy()
+    else:
+        array = values.astype(str).to_numpy(dtype=object)
+    return pd.util.hash_array(array)
+
+
+class HyperLogLog:
+    """
+    HyperLogLog distinct counter with 2**precision one-byte registers.
+
+    Relative standard error is 1.04 / sqrt(2**precision), about 0.81% at the default
+    precision of 14 (16 KB per column).
+    """
+
+    def __init__(self, precision: int = 14):
+        self.precision = precision
+        self.m = 1 << precision
+        self.registers = np.zeros(self.m, dtype=np.uint8)
+
+    @property
+    def relative_error(self) -> float:
+        return 1.04 / math.sqrt(self.m)
+
+    def update(self, values: pd.Series):
+        """Add the non-null values of a chunk."""
+        if values.empty:
+            return
+        hashes = _hash_values(values)
+        value_bits = 64 - self.precision
+        index = (hashes >> np.uint64(value_bits)).astype(np.int64)
+        remainder = hashes & np.uint64((1 << value_bits) - 1)
+        # Position of the leftmost 1-bit in the remaining bits (frexp exponent == bit length)
+        _, bit_length = np.frexp(remainder.astype(np.float64))
+        rho = np.minimum(value_bits - bit_length + 1, value_bits + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rho)
+
+    def count(self) -> int:
+        alpha = 0.7213 / (1 + 1.079 / self.m)
+        estimate = alpha * self.m ** 2 / np.sum(np.power(2.0, -self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        # Linear counting is more accurate while many registers are still empty
+        if estimate <= 2.5 * self.m and zeros:
+            estimate = self.m * math.log(self.m / zeros)
+        return int(round(estimate))
+
+
+class TDigest:
+    """
+    Merging t-digest quantile sketch.
+
+    Values are buffered and folded into at most ~`compression` centroids using the
+    k1 (arcsine) scale function, so memory stays constant however many rows are added.
+    Near the median a centroid spans about pi / compression of the rank, so the
+    interpolated median is within roughly pi / (2 * compression) of the true rank.
+    """
+
+    def __init__(self, compression: int = 200, buffer_size: int = 100_000):
+        self.compression = compression
+        self.buffer_size = buffer_size
+        self.means = np.empty(0, dtype=np.float64)
+        self.weights = np.empty(0, dtype=np.float64)
+        self._buffer = []
+        self._buffered = 0
+
+    @property
+    def rank_error(self) -> float:
+        return math.pi / (2 * self.compression)
+
+    def update(self, values: np.ndarray):
+        """Add a batch of non-null numeric values."""
+        values = np.asarray(values, dtype=np.float64)
+        if values.size == 0:
+            return
+        self._buffer.append(values)
+        self._buffered += values.size
+        if self._buffered >= self.buffer_size:
+            self._compress()
+
+    def _compress(self):
+        if not self._buffer:
+            return
+        buffered = np.concatenate(self._buffer)
+        means = np.concatenate([self.means, buffered])
+        weights = np.concatenate([self.weights, np.ones(buffered.size)])
+        self._buffer, self._buffered = [], 0
+
+        order = np.argsort(means, kind='mergesort')
+        means, weights = means[order], weights[order]
+        total = weights.sum()
+
+        # Bucket every point by the k1 scale of its mid-rank, one centroid per unit of k
+        mid_rank = (np.cumsum(weights) - weights / 2) / total
+        k = self.compression / (2 * math.pi) * np.arcsin(2 * mid_rank - 1)
+        bucket = np.floor(k - k.min()).astype(np.int64)
+        bucket_weights = np.bincount(bucket, weights=weights)
+        bucket_sums = np.bincount(bucket, weights=means * weights)
+        keep = bucket_weights > 0
+        self.weights = bucket_weights[keep]
+        self.means = bucket_sums[keep] / self.weights
+
+    def quantile(self, q: float) -> Optional[float]:
+        self._compress()
+        if self.weights.size == 0:
+            return None
+        if self.weights.size == 1:
+            return float(self.means[0])
+        centres = (np.cumsum(self.weights) - self.weights / 2) / self.weights.sum()
+        return float(np.interp(q, centres, self.means))
+
+
+class RunningMoments:
+    """
+    Count, mean and variance accumulated chunk by chunk (Welford / Chan et al. merge),
+    plus running min and max. Exact up to floating point rounding.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+
+    def update(self, values: pd.Series):
+        """Add the non-null numeric values of a chunk."""
+        n = len(values)
+        if n == 0:
+            return
+        chunk_mean = float(values.mean())
+        chunk_m2 = float(((values - chunk_mean) ** 2).sum())
+
+        delta = chunk_mean - self.mean
+        total = self.count + n
+        self.mean += delta * n / total
+        self.m2 += chunk_m2 + delta ** 2 * self.count * n / total
+        self.count = total
+
+        chunk_min, chunk_max = values.min(), values.max()
+        self.min = chunk_min if self.min is None else min(self.min, chunk_min)
+        self.max = chunk_max if self.max is None else max(self.max, chunk_max)
+
+    @property
+    def std(self) -> float:
+        # Sample standard deviation (ddof=1) to match pandas
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else float('nan')
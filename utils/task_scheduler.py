@@ -0,0 +1,175 @@
+import asyncio
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+import httpx
+import openai
+
+# Errors worth retrying: the request never reached the model or the server was overloaded
+TRANSIENT_ERRORS = (
+    openai.APIConnectionError,  # includes APITimeoutError
+    openai.RateLimitError,
+    openai.InternalServerError,
+    httpx.TransportError,
+    asyncio.TimeoutError,
+)
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """True for connection failures, timeouts, 429s and 5xx responses."""
+    if isinstance(error, TRANSIENT_ERRORS):
+        return True
+    status_code = getattr(error, 'status_code', None)
+    return status_code is not None and (status_code == 429 or status_code >= 500)
+
+
+class BoundedScheduler:
+    """
+    Run coroutine jobs with a cap on how many are in flight at once.
+
+    Jobs start in priority order (highest first), transient HTTP errors are retried
+    with exponential backoff and jitter, and results come back in submission order,
+    like `asyncio.gather`. Per-job latency and attempt counts are kept in `metrics`,
+    or in the list a caller passes so each pipeline run reports only its own jobs.
+    Concurrent `run` and `submit` calls share the cap, so pipelines running side by
+    side (daemon jobs) never have more than `max_in_flight` jobs in flight together.
+    A job waiting to retry gives its slot back until the backoff is over.
+    """
+
+    def __init__(self, max_in_flight: int = 4, max_retries: int = 3, base_delay: float = 1.0, max_delay: float = 30.0):
+        """
+        Args:
+            max_in_flight: Max jobs running concurrently
+            max_retries: Retries per job after the first attempt
+            base_delay: Backoff before the first retry, doubled on every retry (seconds)
+            max_delay: Upper bound for a single backoff (seconds)
+        """
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.metrics: List[Dict[str, Any]] = []
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _slots(self) -> asyncio.Semaphore:
+        # Semaphores bind to one event loop, make a new one if the scheduler outlives its loop
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    def _backoff(self, attempt: int) -> float:
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return delay * (0.5 + random.random() / 2)
+
+    async def _run_job(self, job: Callable[[], Awaitable[Any]], label: str, queued_at: float,
+                       metrics: List[Dict[str, Any]]) -> Any:
+        # Each attempt takes its own slot, so a job backing off doesn't keep one idle
+        slots = self._slots()
+        started_at = None
+        attempt = 0
+        status = 'ok'
+        try:
+            while True:
+                try:
+                    async with slots:
+                        if started_at is None:
+                            started_at = time.perf_counter()
+                        return await job()
+                except Exception as e:
+                    if attempt >= self.max_retries or not is_transient_error(e):
+                        status = f"failed: {type(e).__name__}"
+                        raise
+                    delay = self._backoff(attempt)
+                    print(f"\n{label}: {type(e).__name__}, retrying in {delay:.1f}s ({attempt + 1}/{self.max_retries})")
+                    attempt += 1
+                    await asyncio.sleep(delay)
+        finally:
+            if started_at is not None:
+                metrics.append({
+                    'label': label,
+                    'status': status,
+                    'attempts': attempt + 1,
+                    'wait_seconds': round(started_at - queued_at, 3),
+                    'latency_seconds': round(time.perf_counter() - started_at, 3),
+                })
+
+    async def run(self, jobs: Sequence[Callable[[], Awaitable[Any]]], priorities: Optional[Sequence[float]] = None,
+                  labels: Optional[Sequence[str]] = None, return_exceptions: bool = False,
+                  metrics: Optional[List[Dict[str, Any]]] = None) -> List[Any]:
+        """
+        Run all jobs and return their results in the order they were given.
+
+        Args:
+            jobs: Zero-argument callables returning a fresh awaitable (so retries can re-create it)
+            priorities: Larger values start first (default: submission order)
+            labels: Names used in metrics and retry messages
+            return_exceptions: Put exceptions in the result list instead of raising the first one
+            metrics: List the jobs' metrics are appended to (default: `self.metrics`)
+
+        Returns:
+            List of job results in submission order.
+        """
+        metrics = self.metrics if metrics is None else metrics
+        labels = list(labels) if labels is not None else [f"task_{index}" for index in range(len(jobs))]
+        order = list(range(len(jobs)))
+        if priorities is not None:
+            order.sort(key=lambda index: priorities[index], reverse=True)
+
+        results: List[Any] = [None] * len(jobs)
+        queued_at = time.perf_counter()
+
+        async def run_one(index: int):
+            try:
+                results[index] = await self._run_job(jobs[index], labels[index], queued_at, metrics)
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                results[index] = e
+
+        # Tasks are created in priority order and the semaphore wakes waiters first come,
+        # first served, so jobs start by priority; retries queue up again behind them
+        tasks = [asyncio.create_task(run_one(index)) for index in order]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        return results
+
+    async def submit(self, job: Callable[[], Awaitable[Any]], label: Optional[str] = None,
+                     metrics: Optional[List[Dict[str, Any]]] = None) -> Any:
+        """
+        Run one job as soon as a slot is free, for pipelines where jobs arrive over time.
+
+        Submitted jobs share the `max_in_flight` cap with `run`, start in arrival order
+        and get the same retries and metrics.
+
+        Args:
+            job: Zero-argument callable returning a fresh awaitable
+            label: Name used in metrics and retry messages
+            metrics: List the job's metrics are appended to (default: `self.metrics`)
+
+        Returns:
+            The job's result.
+        """
+        metrics = self.metrics if metrics is None else metrics
+        return await self._run_job(job, label or f"task_{len(metrics)}", time.perf_counter(), metrics)
+
+    def report(self, metrics: Optional[List[Dict[str, Any]]] = None) -> str:
+        """Summarise latency and retries of the jobs in `metrics` (default: every job run without its own list)."""
+        metrics = self.metrics if metrics is None else metrics
+        if not metrics:
+            return "No scheduled tasks."
+        latencies = sorted(m['latency_seconds'] for m in metrics)
+        p50 = latencies[len(latencies) // 2]
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        retries = sum(m['attempts'] - 1 for m in metrics)
+        failed = sum(1 for m in metrics if m['status'] != 'ok')
+        return (f"{len(metrics)} tasks, max {self.max_in_flight} in flight: "
+                f"p50 {p50:.2f}s, p95 {p95:.2f}s, max {latencies[-1]:.2f}s, "
+                f"{retries} retries, {failed} failed")
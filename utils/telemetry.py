@@ -0,0 +1,266 @@
+import threading
+import time
+import warnings
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, AsyncGenerator, Dict, Iterator, Mapping, Optional, Sequence, Tuple, Union
+
+from autogen_core import CancellationToken
+from autogen_core.models import ChatCompletionClient, CreateResult, LLMMessage
+from autogen_core.tools import Tool, ToolSchema
+from opentelemetry import trace
+
+from .client_wrapper import ChatCompletionClientWrapper, sampling_config
+
+TRACER_NAME = "autogen_v2"
+EXPORTERS = ('none', 'console', 'otlp')
+
+tracer = trace.get_tracer(TRACER_NAME)
+
+
+class MetricsRegistry:
+    """
+    In-process stage durations and token counters, rendered in the Prometheus text format.
+
+    Kept separate from the OpenTelemetry metrics API so the numbers are available
+    even when only `opentelemetry-api` (whose metrics are no-ops) is installed.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (metric, labels) -> [count, sum, max]
+        self._summaries: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], list] = {}
+        self._counters: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = {}
+
+    def observe(self, metric: str, value: float, **labels: str):
+        key = (metric, tuple(sorted(labels.items())))
+        with self._lock:
+            summary = self._summaries.setdefault(key, [0, 0.0, 0.0])
+            summary[0] += 1
+            summary[1] += value
+            summary[2] = max(summary[2], value)
+
+    def increment(self, metric: str, value: float = 1, **labels: str):
+        key = (metric, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def reset(self):
+        with self._lock:
+            self._summaries.clear()
+            self._counters.clear()
+
+    def render(self) -> str:
+        """Prometheus text exposition of every metric recorded so far."""
+        def label_text(labels: Tuple[Tuple[str, str], ...]) -> str:
+            if not labels:
+                return ""
+            escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in labels)
+            return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(labels, escaped)) + "}"
+
+        lines = []
+        with self._lock:
+            for metric in sorted({metric for metric, _ in self._summaries}):
+                lines.append(f"# TYPE {metric} summary")
+                for (name, labels), (count, total, _) in sorted(self._summaries.items()):
+                    if name == metric:
+                        lines.append(f"{metric}_count{label_text(labels)} {count}")
+                        lines.append(f"{metric}_sum{label_text(labels)} {total:.6f}")
+                lines.append(f"# TYPE {metric}_max gauge")
+                for (name, labels), (_, _, maximum) in sorted(self._summaries.items()):
+                    if name == metric:
+                        lines.append(f"{metric}_max{label_text(labels)} {maximum:.6f}")
+            for metric in sorted({metric for metric, _ in self._counters}):
+                lines.append(f"# TYPE {metric} counter")
+                for (name, labels), value in sorted(self._counters.items()):
+                    if name == metric:
+                        lines.append(f"{metric}{label_text(labels)} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str):
+        with open(path, "w") as f:
+            f.write(self.render())
+
+
+metrics = MetricsRegistry()
+
+
+@contextmanager
+def stage_span(stage: str, **attributes: Any) -> Iterator[trace.Span]:
+    """
+    Trace one pipeline stage and record its wall time.
+
+    Opens an OpenTelemetry span named `stage` (a no-op unless a tracer provider is
+    configured) and adds the duration to `autogen_stage_duration_seconds{stage=...}`.
+
+    Args:
+        stage: Stage name, used as span name and metric label
+        **attributes: Span attributes, e.g. the file being processed
+
+    Yields:
+        trace.Span: The span, so callers can add attributes found along the way.
+    """
+    started_at = time.perf_counter()
+    with tracer.start_as_current_span(stage, attributes={key: value for key, value in attributes.items() if value is not None}) as span:
+        try:
+            yield span
+        finally:
+            metrics.observe("autogen_stage_duration_seconds", time.perf_counter() - started_at, stage=stage)
+
+
+def record_usage(span: trace.Span, model: str, usage: Any, request_seconds: Optional[float] = None,
+                 time_to_first_token: Optional[float] = None):
+    """Put token counts, request latency and (streamed answers only) time to first token on a span and the metrics."""
+    if usage is not None:
+        span.set_attribute("gen_ai.usage.input_tokens", usage.prompt_tokens)
+        span.set_attribute("gen_ai.usage.output_tokens", usage.completion_tokens)
+        metrics.increment("autogen_llm_tokens_total", usage.prompt_tokens, model=model, kind="prompt")
+        metrics.increment("autogen_llm_tokens_total", usage.completion_tokens, model=model, kind="completion")
+    if request_seconds is not None:
+        span.set_attribute("llm.request_seconds", request_seconds)
+        metrics.observe("autogen_llm_request_seconds", request_seconds, model=model)
+    if time_to_first_token is not None:
+        span.set_attribute("gen_ai.response.time_to_first_token", time_to_first_token)
+        metrics.observe("autogen_llm_time_to_first_token_seconds", time_to_first_token, model=model)
+
+
+class TracedChatCompletionClient(ChatCompletionClientWrapper):
+    """
+    Trace every model call with its model, token counts, cache status and latency.
+
+    Time to first token is only known for `create_stream`, measured at the first
+    chunk; `create` gets the whole answer at once, so it records the request latency
+    (`autogen_llm_request_seconds`) and leaves time to first token unset.
+    """
+
+    def __init__(self, client: ChatCompletionClient):
+        super().__init__(client)
+        self.model = str(sampling_config(client).get("model", ""))
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        json_output: Optional[bool] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        with stage_span("llm_create", **{"gen_ai.request.model": self.model}) as span:
+            started_at = time.perf_counter()
+            result = await self.client.create(
+                messages,
+                tools=tools,
+                json_output=json_output,
+                extra_create_args=extra_create_args,
+                cancellation_token=cancellation_token,
+            )
+            span.set_attribute("llm.cached", bool(result.cached))
+            record_usage(span, self.model, result.usage, request_seconds=time.perf_counter() - started_at)
+            metrics.increment("autogen_llm_requests_total", model=self.model, cached=str(bool(result.cached)).lower())
+            return result
+
+    async def create_stream(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        json_output: Optional[bool] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        with stage_span("llm_create_stream", **{"gen_ai.request.model": self.model}) as span:
+            started_at = time.perf_counter()
+            time_to_first_token = None
+            async for chunk in self.client.create_stream(
+                messages,
+                tools=tools,
+                json_output=json_output,
+                extra_create_args=extra_create_args,
+                cancellation_token=cancellation_token,
+            ):
+                if time_to_first_token is None:
+                    time_to_first_token = time.perf_counter() - started_at
+                if isinstance(chunk, CreateResult):
+                    span.set_attribute("llm.cached", bool(chunk.cached))
+                    record_usage(span, self.model, chunk.usage, request_seconds=time.perf_counter() - started_at,
+                                 time_to_first_token=time_to_first_token)
+                    metrics.increment("autogen_llm_requests_total", model=self.model, cached=str(bool(chunk.cached)).lower())
+                yield chunk
+
+
+def configure_telemetry(exporter: str = 'none', otlp_endpoint: Optional[str] = None, service_name: str = TRACER_NAME) -> bool:
+    """
+    Install a tracer provider that exports the pipeline's spans.
+
+    Needs `opentelemetry-sdk` (and `opentelemetry-exporter-otlp` for 'otlp'); when they
+    aren't installed a warning is issued and spans stay no-ops. Stage metrics are
+    recorded either way.
+
+    Args:
+        exporter: 'none', 'console' (spans printed as JSON) or 'otlp' (OTLP over gRPC)
+        otlp_endpoint: Collector address for 'otlp' (default: the exporter's own, localhost:4317)
+        service_name: `service.name` resource attribute
+
+    Returns:
+        bool: True if spans will be exported.
+
+    Raises:
+        ValueError: If `exporter` is unknown
+    """
+    if exporter not in EXPORTERS:
+        raise ValueError(f"Unknown exporter {exporter!r}; expected one of {EXPORTERS}")
+    if exporter == 'none':
+        return False
+
+    try:
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+        if exporter == 'otlp':
+            from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+    except ImportError as e:
+        warnings.warn(f"Tracing disabled, {e.name} is not installed "
+                      f"(pip install opentelemetry-sdk{' opentelemetry-exporter-otlp' if exporter == 'otlp' else ''}).")
+        return False
+
+    span_exporter = ConsoleSpanExporter() if exporter == 'console' else OTLPSpanExporter(**({'endpoint': otlp_endpoint} if otlp_endpoint else {}))
+    provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+    provider.add_span_processor(BatchSpanProcessor(span_exporter))
+    trace.set_tracer_provider(provider)
+    return True
+
+
+def shutdown_telemetry():
+    """Flush spans still queued in the exporter."""
+    provider = trace.get_tracer_provider()
+    if hasattr(provider, "shutdown"):
+        provider.shutdown()
+
+
+def serve_metrics(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """
+    Serve `metrics.render()` at http://host:port/metrics from a daemon thread.
+
+    Returns:
+        ThreadingHTTPServer: The running server; call `shutdown()` on it to stop.
+    """
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            payload = metrics.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
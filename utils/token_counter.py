@@ -0,0 +1,38 @@
+import warnings
+from functools import lru_cache
+from typing import Optional
+
+import tiktoken
+
+# Qwen has its own tokenizer, cl100k_base is a close enough proxy for budgeting
+DEFAULT_ENCODING = "cl100k_base"
+
+# Rough characters-per-token ratio used when no tiktoken encoding can be loaded (e.g. offline)
+_FALLBACK_CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=None)
+def _get_encoding(encoding_name: str) -> Optional[tiktoken.Encoding]:
+    try:
+        return tiktoken.get_encoding(encoding_name)
+    except Exception as e:
+        warnings.warn(f"tiktoken encoding '{encoding_name}' unavailable ({type(e).__name__}), "
+                      f"estimating tokens as characters / {_FALLBACK_CHARS_PER_TOKEN}.")
+        return None
+
+
+def count_tokens(text: str, encoding_name: str = DEFAULT_ENCODING) -> int:
+    """
+    Count the tokens of a prompt fragment.
+
+    Args:
+        text: Text to measure
+        encoding_name: tiktoken encoding name
+
+    Returns:
+        int: Token count, or a character-based estimate if the encoding can't be loaded.
+    """
+    encoding = _get_encoding(encoding_name)
+    if encoding is None:
+        return -(-len(text) // _FALLBACK_CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
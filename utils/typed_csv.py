@@ -0,0 +1,212 @@
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import pandas as pd
+
+from .archive_source import open_dataset
+
+CSV_DTYPE_MODES = ('default', 'typed')
+# Rows read to choose the dtypes of a file
+INFERENCE_ROWS = 100_000
+# Text columns with at most this share of distinct values in the sample become categoricals
+CATEGORY_MAX_RATIO = 0.5
+CATEGORY_MAX_VALUES = 10_000
+
+
+def _integer_type(low: int, high: int):
+    import pyarrow as pa
+    for arrow_type, bits in ((pa.int8(), 8), (pa.int16(), 16), (pa.int32(), 32)):
+        if -2 ** (bits - 1) <= low and high < 2 ** (bits - 1):
+            return arrow_type
+    return pa.int64()
+
+
+def _date_format(values: pd.Series) -> Optional[str]:
+    """strptime format every sampled value parses with, None when the column isn't dates."""
+    from pandas.tseries.api import guess_datetime_format
+    first = values.iloc[0]
+    if not isinstance(first, str):
+        return None
+    for dayfirst in (False, True):
+        date_format = guess_datetime_format(first, dayfirst=dayfirst)
+        if date_format is None:
+            continue
+        try:
+            pd.to_datetime(values, format=date_format)
+            return date_format
+        except (ValueError, TypeError):
+            pass
+    return None
+
+
+def infer_csv_dtypes(sample: pd.DataFrame) -> Dict[str, Tuple[Any, Optional[str]]]:
+    """
+    Pick compact Arrow types for the columns of a CSV from a sample read with pandas' defaults.
+
+    Integers get the smallest integer type covering the sample, floats stay float64,
+    low-cardinality text becomes dictionary-encoded (a pandas categorical) and text
+    that parses with a single non-ISO date format becomes timestamps (ISO dates and
+    timestamps are recognised by Arrow itself). Every other column is pinned to
+    what pandas found, so the whole file is read with the sample's view of it.
+
+    Args:
+        sample: First rows of the file, read with pandas' default dtypes
+
+    Returns:
+        Dict[str, Tuple[Any, Optional[str]]]: Column names mapped to their Arrow type and
+                                              the strptime format for dates (None for
+                                              columns left to Arrow's inference).
+    """
+    import pyarrow as pa
+    dtypes = {}
+    for column in sample.columns:
+        values = sample[column].dropna()
+        dtype = sample[column].dtype
+        if values.empty:
+            dtypes[column] = (pa.string(), None)
+        elif pd.api.types.is_bool_dtype(dtype):
+            dtypes[column] = (pa.bool_(), None)
+        elif pd.api.types.is_integer_dtype(dtype):
+            dtypes[column] = (_integer_type(int(values.min()), int(values.max())), None)
+        elif pd.api.types.is_float_dtype(dtype):
+            # float64 whatever the sample says: Arrow would round later values to float32
+            # without complaint. Whole numbers written "5.0" are narrowed afterwards
+            dtypes[column] = (pa.float64(), None)
+        elif dtype == 'object':
+            date_format = _date_format(values)
+            if date_format is not None:
+                if not date_format.startswith('%Y-%m-%d'):
+                    dtypes[column] = (pa.timestamp('s'), date_format)
+            elif values.nunique() <= min(CATEGORY_MAX_VALUES, CATEGORY_MAX_RATIO * len(values)):
+                dtypes[column] = (pa.dictionary(pa.int32(), pa.string()), None)
+            else:
+                dtypes[column] = (pa.string(), None)
+    return dtypes
+
+
+def _wider(arrow_type, value: Optional[str] = None):
+    """
+    Next type to try for a column whose sampled type doesn't fit `value`, a later value of the file.
+
+    Straight to text when the value isn't a number, so a stray 'x' costs one more read, not three.
+    """
+    import pyarrow as pa
+    try:
+        number = float(value) if value is not None else None
+    except ValueError:
+        return pa.string()
+    if not (pa.types.is_integer(arrow_type) or pa.types.is_floating(arrow_type)):
+        return pa.string()
+    if number is not None and not number.is_integer():
+        return pa.float64()
+    if pa.types.is_integer(arrow_type) and arrow_type != pa.int64():
+        return pa.int64()
+    return pa.float64() if pa.types.is_integer(arrow_type) else pa.string()
+
+
+def _narrow_floats(table):
+    """Cast float columns that only hold whole numbers to the smallest integer type holding them."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    for index, field in enumerate(table.schema):
+        if not pa.types.is_floating(field.type):
+            continue
+        column = table.column(index)
+        bounds = pc.min_max(column)
+        if bounds['min'].as_py() is None or not pc.all(pc.equal(pc.floor(column), column)).as_py():
+            continue
+        integer_type = _integer_type(int(bounds['min'].as_py()), int(bounds['max'].as_py()))
+        table = table.set_column(index, field.with_type(integer_type), column.cast(integer_type))
+    return table
+
+
+def _read_arrow(file_path: Union[str, Path], column_names: List[str], column_types: Dict[str, Any], date_formats: List[str]):
+    import pyarrow as pa
+    import pyarrow.csv as csv
+    from pandas._libs.parsers import STR_NA_VALUES
+
+    read_options = csv.ReadOptions(column_names=column_names, skip_rows=1)
+    # Same missing-value strings as pd.read_csv
+    convert_options = csv.ConvertOptions(column_types=column_types, null_values=sorted(STR_NA_VALUES), strings_can_be_null=True,
+                                         timestamp_parsers=[csv.ISO8601, *date_formats])
+    with open_dataset(file_path) as source:
+        # Block by block, so the raw text of the whole file is never held at once
+        with csv.open_csv(source, read_options=read_options, convert_options=convert_options) as reader:
+            return pa.Table.from_batches(list(reader), schema=reader.schema)
+
+
+def read_csv_typed(file_path: Union[str, Path], sample_rows: int = INFERENCE_ROWS) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Read a whole CSV with compact, Arrow-backed dtypes.
+
+    The first `sample_rows` rows are read with pandas' defaults to choose the types
+    (`infer_csv_dtypes`), then the file is streamed through Arrow's CSV reader (what
+    `pd.read_csv(engine="pyarrow")` uses) converting every column straight to its
+    type, and handed to pandas as `pd.ArrowDtype` columns like
+    `dtype_backend="pyarrow"` does (categoricals as pandas categoricals). Text stays in Arrow buffers instead of Python
+    objects. When a later value doesn't fit a column's sampled type, the file is
+    read again with that column widened (int64 or float64 for numbers, text otherwise).
+
+    Args:
+        file_path: Plain path, compressed file or `archive.zip::member`
+        sample_rows: Rows read to choose the types
+
+    Returns:
+        Tuple[pd.DataFrame, Dict[str, Any]]: The data and its memory report:
+            {"rows", "default_bytes" (estimated from the sample unless it held every
+            row), "default_bytes_exact", "typed_bytes", "dtypes", "fallbacks"}.
+    """
+    import pyarrow as pa
+
+    with open_dataset(file_path) as source:
+        sample = pd.read_csv(source, nrows=sample_rows)
+    dtypes = infer_csv_dtypes(sample)
+    # pandas' names for blank and duplicate headers, which Arrow keeps as they are
+    column_names = [str(column) for column in sample.columns]
+
+    fallbacks = []
+    while True:
+        try:
+            table = _read_arrow(file_path, column_names, {str(column): arrow_type for column, (arrow_type, _) in dtypes.items()},
+                                sorted({date_format for _, date_format in dtypes.values() if date_format}))
+            break
+        except pa.ArrowInvalid as e:
+            # "In CSV column #3: ... CSV conversion error to int8: invalid value '300'"
+            match = re.search(r'CSV column #(\d+)', str(e))
+            column = sample.columns[int(match.group(1))] if match else None
+            if column not in dtypes or dtypes[column][0] == pa.string():
+                raise
+            # "... CSV conversion error to int8: invalid value '300'"
+            value = re.search(r"invalid value '(.*)'$", str(e), re.DOTALL)
+            dtypes[column] = (_wider(dtypes[column][0], value.group(1) if value else None), None)
+            fallbacks.append((str(column), str(e).split(': ', 1)[-1]))
+
+    # Dictionary columns become pandas categoricals, everything else ArrowDtype
+    df = _narrow_floats(table).to_pandas(types_mapper=lambda arrow_type: None if pa.types.is_dictionary(arrow_type) else pd.ArrowDtype(arrow_type))
+    del table
+    df.columns = sample.columns
+
+    sample_bytes = int(sample.memory_usage(deep=True).sum())
+    default_bytes_exact = len(sample) >= len(df)
+    default_bytes = sample_bytes if default_bytes_exact else int(sample_bytes / max(len(sample), 1) * len(df))
+    report = {
+        "rows": len(df),
+        "default_bytes": default_bytes,
+        "default_bytes_exact": default_bytes_exact,
+        "typed_bytes": int(df.memory_usage(deep=True).sum()),
+        "dtypes": {str(column): str(dtype) for column, dtype in df.dtypes.items()},
+        "fallbacks": fallbacks,
+    }
+    return df, report
+
+
+def format_memory_report(name: str, report: Dict[str, Any]) -> str:
+    """One line comparing a file's in-memory size with default and typed dtypes."""
+    approximate = "" if report["default_bytes_exact"] else "~"
+    ratio = report["default_bytes"] / report["typed_bytes"] if report["typed_bytes"] else float('nan')
+    line = (f"{name}: {report['rows']} rows, {approximate}{report['default_bytes'] / 2 ** 20:.1f} MiB with default dtypes "
+            f"-> {report['typed_bytes'] / 2 ** 20:.1f} MiB typed ({ratio:.1f}x smaller)")
+    if report["fallbacks"]:
+        line += f", kept Arrow's types for {', '.join(dict.fromkeys(column for column, _ in report['fallbacks']))}"
+    return line